@@ -21,6 +21,8 @@ if sys.platform.startswith('win'):
 
 # 모듈 검색 경로에 현재 디렉토리 추가
 sys.path.insert(0, os.path.abspath('.'))
+# 크롤러가 쓰는 core 패키지(core.category_matcher)를 검색 API와 같은 이름으로 임포트하기 위해 src 디렉토리도 추가
+sys.path.insert(1, os.path.abspath('src'))
 
 from src.data.utils import setup_logging, parse_cli_args, load_config
 from src.data.tag_scanner import run_tag_scanner
@@ -55,6 +57,10 @@ def main():
         
         # 태그 목록 준비
         tags = args.tags.split(',') if args.tags else config.get('target_hashtags', [])
+        if args.tags_file:
+            # 해시태그 인덱스에서 추천한 신규 태그 추가 (scripts/suggest_hashtags.py)
+            with open(args.tags_file, 'r', encoding='utf-8') as f:
+                tags = list(dict.fromkeys(tags + [line.strip().lstrip('#') for line in f if line.strip()]))
         if not tags:
             logging.error("스캔할 태그가 지정되지 않았습니다. --tags 옵션 또는 config.yaml 파일에 지정하세요.")
             sys.exit(1)
@@ -0,0 +1,66 @@
+"""
+백업 스냅샷 관리 스크립트
+
+크롤러(label=crawl)와 ETL(label=etl)이 data/backup에 남긴 중복 제거 스냅샷을 조회하고,
+특정 시점의 테이블을 복원하거나 보존 개수를 넘는 스냅샷을 정리합니다.
+
+사용 예:
+    python scripts/backup_snapshots.py list
+    python scripts/backup_snapshots.py restore --table posts --label crawl --as-of 2025-05-08T12:00:00 --output posts.parquet
+    python scripts/backup_snapshots.py prune --retention 5
+"""
+
+import sys
+import argparse
+from pathlib import Path
+
+# 스크립트 디렉토리 기준으로 상대 경로 설정
+script_dir = Path(__file__).parent
+root_dir = script_dir.parent
+
+# 프로젝트 루트를 경로에 추가하여 src.data 패키지 임포트
+# (core 패키지는 검색 API와 같은 이름으로 임포트하므로 src 디렉토리도 추가)
+sys.path.insert(0, str(root_dir))
+sys.path.insert(1, str(root_dir / "src"))
+from src.data.backup_store import BackupStore, BACKUP_DIR_NAME, BACKUP_RETENTION
+
+
+def main():
+    parser = argparse.ArgumentParser(description="백업 스냅샷 조회/복원/정리")
+    parser.add_argument("--backup-dir", default=str(root_dir / "data" / BACKUP_DIR_NAME), help="백업 디렉토리")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    list_parser = subparsers.add_parser("list", help="스냅샷 목록")
+    list_parser.add_argument("--label", help="스냅샷 종류 (crawl, etl)")
+
+    restore_parser = subparsers.add_parser("restore", help="스냅샷 시점의 테이블 복원")
+    restore_parser.add_argument("--table", required=True, help="복원할 테이블 (influencers, posts)")
+    restore_parser.add_argument("--snapshot", help="스냅샷 ID (생략하면 가장 최근)")
+    restore_parser.add_argument("--as-of", help="이 시각(ISO 형식) 이전의 가장 최근 스냅샷")
+    restore_parser.add_argument("--label", help="스냅샷 종류 (crawl, etl)")
+    restore_parser.add_argument("--output", required=True, help="출력 파일 (.parquet 또는 .csv)")
+
+    prune_parser = subparsers.add_parser("prune", help="보존 개수를 넘는 스냅샷 정리")
+    prune_parser.add_argument("--retention", type=int, default=BACKUP_RETENTION, help="레이블별 보존 개수")
+    args = parser.parse_args()
+
+    if args.command == "list":
+        store = BackupStore(args.backup_dir)
+        for manifest in store.list_snapshots(args.label):
+            tables = ", ".join(f"{name} {info['rows']}행" for name, info in manifest["tables"].items())
+            print(f"{manifest['id']}  {manifest['created_at']}  {tables}")
+    elif args.command == "restore":
+        store = BackupStore(args.backup_dir)
+        df = store.restore(args.table, snapshot_id=args.snapshot, as_of=args.as_of, label=args.label)
+        if args.output.endswith(".csv"):
+            df.to_csv(args.output, index=False, encoding="utf-8-sig")
+        else:
+            df.to_parquet(args.output, index=False)
+        print(f"{args.table} {len(df)}행 복원: {args.output}")
+    elif args.command == "prune":
+        store = BackupStore(args.backup_dir, retention=args.retention)
+        print(f"삭제한 스냅샷: {store.prune()}개")
+
+
+if __name__ == "__main__":
+    main()
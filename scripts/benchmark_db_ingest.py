@@ -0,0 +1,119 @@
+"""
+DuckDB 저장 방식 벤치마크 스크립트
+
+DatabaseManager의 행 단위 저장(save_influencer/save_post)과 일괄 저장
+(save_influencers_bulk/save_posts_bulk)의 처리량(rows/sec)을 합성 데이터로 비교합니다.
+행 단위 저장은 오래 걸리므로 --row-sample 건만 측정해 처리량을 계산합니다.
+
+사용 예:
+    python scripts/benchmark_db_ingest.py --posts 100000 --row-sample 5000
+"""
+
+import sys
+import time
+import random
+import shutil
+import argparse
+import tempfile
+from pathlib import Path
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+# 스크립트 디렉토리 기준으로 상대 경로 설정
+script_dir = Path(__file__).parent
+root_dir = script_dir.parent
+
+# 프로젝트 루트를 경로에 추가하여 src.data 패키지 임포트
+# (core 패키지는 검색 API와 같은 이름으로 임포트하므로 src 디렉토리도 추가)
+sys.path.insert(0, str(root_dir))
+sys.path.insert(1, str(root_dir / "src"))
+from src.data.db import DatabaseManager
+
+
+def make_records(n_posts: int, posts_per_user: int, seed: int = 42) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """크롤러 출력과 같은 형태의 합성 인플루언서/게시물 DataFrame 생성"""
+    rng = random.Random(seed)
+    n_users = max(1, n_posts // posts_per_user)
+    base_time = datetime(2025, 1, 1)
+
+    influencers = pd.DataFrame({
+        'username': [f"user_{i}" for i in range(n_users)],
+        'pk': [10_000_000 + i for i in range(n_users)],
+        'full_name': [f"사용자 {i}" for i in range(n_users)],
+        'follower_count': [rng.randint(100, 500_000) for _ in range(n_users)],
+        'following_count': [rng.randint(10, 3_000) for _ in range(n_users)],
+        'media_count': [rng.randint(10, 2_000) for _ in range(n_users)],
+        'biography': [f"렌즈 리뷰 {i} 📩 문의 DM" for i in range(n_users)],
+        'category': ['뷰티'] * n_users,
+        'external_url': [f"https://example.com/{i}" if i % 3 else None for i in range(n_users)],
+        'is_private': [False] * n_users,
+        'is_verified': [i % 50 == 0 for i in range(n_users)],
+    })
+    posts = pd.DataFrame({
+        'id': [f"{3_000_000_000 + i}_{10_000_000 + i // posts_per_user}" for i in range(n_posts)],
+        'user_pk': [10_000_000 + i // posts_per_user for i in range(n_posts)],
+        'username': [f"user_{i // posts_per_user}" for i in range(n_posts)],
+        'caption': [f"오늘의 렌즈 추천 #렌즈 #{i % 100}" for i in range(n_posts)],
+        'like_count': [rng.randint(0, 10_000) for _ in range(n_posts)],
+        'comment_count': [rng.randint(0, 500) for _ in range(n_posts)],
+        'taken_at': [(base_time + timedelta(minutes=i)).isoformat() for i in range(n_posts)],
+        'media_type': [rng.choice([1, 2, 8]) for _ in range(n_posts)],
+        'product_type': ['feed'] * n_posts,
+        'image_url': [f"https://example.com/img/{i}.jpg" for i in range(n_posts)],
+        'video_url': [None] * n_posts,
+    })
+    return influencers, posts
+
+
+def timed(label: str, n_rows: int, func) -> float:
+    """func 실행 시간을 재고 처리량 출력"""
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    rate = n_rows / max(elapsed, 1e-9)
+    print(f"  {label:<28} {n_rows:>8}건  {elapsed:8.2f}초  {rate:12,.0f} rows/sec")
+    return rate
+
+
+def main():
+    parser = argparse.ArgumentParser(description='DuckDB 행 단위 저장 vs 일괄 저장 벤치마크')
+    parser.add_argument('--posts', type=int, default=100_000, help='게시물 수')
+    parser.add_argument('--posts-per-user', type=int, default=12, help='사용자당 게시물 수')
+    parser.add_argument('--row-sample', type=int, default=5_000, help='행 단위 저장을 측정할 게시물 수')
+    args = parser.parse_args()
+
+    influencers, posts = make_records(args.posts, args.posts_per_user)
+    sample_posts = posts.head(args.row_sample)
+    sample_influencers = influencers[influencers['username'].isin(sample_posts['username'])]
+    print(f"합성 데이터: 인플루언서 {len(influencers)}명, 게시물 {len(posts)}건")
+
+    work_dir = tempfile.mkdtemp(prefix="db_ingest_bench_")
+    try:
+        print("행 단위 저장 (iterrows + INSERT OR REPLACE/IGNORE):")
+        db = DatabaseManager(data_dir=work_dir, db_name="row.db")
+        row_rate = timed("influencers", len(sample_influencers), lambda: [
+            db.save_influencer(row.to_dict()) for _, row in sample_influencers.iterrows()
+        ])
+        row_post_rate = timed("posts", len(sample_posts), lambda: [
+            db.save_post(row.to_dict()) for _, row in sample_posts.iterrows()
+        ])
+        db.close()
+
+        print("일괄 저장 (DataFrame 등록 + 바뀐 행만 INSERT ... ON CONFLICT):")
+        db = DatabaseManager(data_dir=work_dir, db_name="bulk.db")
+        bulk_rate = timed("influencers", len(influencers), lambda: db.save_influencers_bulk(influencers))
+        bulk_post_rate = timed("posts", len(posts), lambda: db.save_posts_bulk(posts))
+        # 같은 데이터를 다시 저장 (재수집했지만 바뀐 행이 없는 경우, 내용 해시 비교로 기록 생략)
+        timed("posts (재저장, 변경 없음)", len(posts), lambda: db.save_posts_bulk(posts))
+        stored = db.conn.execute("SELECT COUNT(*) FROM posts").fetchone()[0]
+        db.close()
+
+        print(f"저장된 게시물: {stored}건")
+        print(f"처리량 개선: 인플루언서 {bulk_rate / max(row_rate, 1e-9):.0f}배, 게시물 {bulk_post_rate / max(row_post_rate, 1e-9):.0f}배")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""
+검색 스냅샷 생성 스크립트
+
+SQLite(mvp.db)의 인플루언서/게시물 데이터를 읽어 임베딩 파싱과 인덱스 생성까지 마친 뒤
+검색 API가 파싱/인덱스 생성 없이 바로 로드할 수 있는 스냅샷 디렉토리로 저장합니다.
+ETL(src/data/etl.py) 실행 후 다시 생성해야 최신 데이터가 검색에 반영됩니다.
+
+사용 예:
+    python scripts/build_search_snapshot.py
+    python scripts/build_search_snapshot.py --db data/mvp.db --out data/search_snapshot
+"""
+
+import sys
+import time
+import logging
+import argparse
+from pathlib import Path
+
+# 스크립트 디렉토리 기준으로 상대 경로 설정
+script_dir = Path(__file__).parent
+root_dir = script_dir.parent
+
+# src 패키지(core.*)를 검색 API와 같은 방식으로 임포트하기 위해 경로 추가
+sys.path.insert(0, str(root_dir / "src"))
+from core.snapshot import SearchSnapshot, DEFAULT_DB_PATH, DEFAULT_SNAPSHOT_DIR
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='검색 스냅샷 생성')
+    parser.add_argument('--db', default=str(root_dir / DEFAULT_DB_PATH), help='원본 SQLite DB 경로')
+    parser.add_argument('--out', default=str(root_dir / DEFAULT_SNAPSHOT_DIR), help='스냅샷 디렉토리 경로')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    snapshot = SearchSnapshot.from_sqlite(args.db)
+    snapshot.save(args.out, source=args.db)
+    logger.info(f"스냅샷 생성 완료 ({time.perf_counter() - start:.1f}초)")
+
+    # 로드 시간 확인 (검색 API 시작 시 소요되는 데이터 로딩 시간)
+    start = time.perf_counter()
+    SearchSnapshot.load(args.out)
+    logger.info(f"스냅샷 로드 시간: {(time.perf_counter() - start) * 1000:.1f}ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,199 @@
+"""
+쿼리 로그 재생 부하 테스트 스크립트
+
+Flask 앱이 기록한 쿼리 로그(QUERY_LOG_PATH, JSONL)를 읽어
+로컬 Flask 서버 또는 프로세스 내부 WSGI 앱(test_client)에 같은 요청을
+설정한 동시성과 배속으로 다시 보내고, 처리량과 지연 시간 백분위를 보고합니다.
+커밋 간 성능을 실제 쿼리 분포로 비교할 때 사용합니다.
+
+사용 예:
+    python scripts/replay_load.py logs/query_log.jsonl* --target http://localhost:5000 --concurrency 8 --speedup 10
+    python scripts/replay_load.py logs/query_log.jsonl --in-process --speedup 0
+
+참고: 쿼리 로그에는 쿼리 파라미터만 기록되므로 GET 요청만 재생합니다.
+"""
+
+import os
+import sys
+import glob
+import time
+import json
+import argparse
+import threading
+from pathlib import Path
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+# 스크립트 디렉토리 기준으로 상대 경로 설정
+script_dir = Path(__file__).parent
+root_dir = script_dir.parent
+src_dir = root_dir / "src"
+
+# src 패키지(api.*, core.*)를 앱과 같은 방식으로 임포트하기 위해 경로 추가
+sys.path.insert(0, str(src_dir))
+from api.utils.query_log import read_query_log
+
+# 보고할 지연 시간 백분위
+PERCENTILES = (50, 90, 95, 99)
+
+
+def percentile(sorted_values, pct):
+    """정렬된 값 목록에서 최근접 순위(nearest-rank) 방식 백분위 계산"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, int(round(pct / 100 * len(sorted_values))))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def load_records(patterns, limit=None):
+    """로그 파일 패턴에서 재생 가능한(GET) 레코드 목록 로드"""
+    paths = sorted({path for pattern in patterns for path in glob.glob(pattern)})
+    if not paths:
+        print(f"오류: 쿼리 로그 파일을 찾을 수 없습니다: {', '.join(patterns)}")
+        return []
+
+    records = [r for r in read_query_log(paths) if r.get("method", "GET") == "GET"]
+    if limit:
+        records = records[:limit]
+    print(f"{len(paths)}개 파일에서 GET 요청 {len(records)}건 로드")
+    return records
+
+
+class HttpSender:
+    """실행 중인 Flask 서버로 HTTP 요청 전송"""
+
+    def __init__(self, target, timeout):
+        self.target = target.rstrip("/")
+        self.timeout = timeout
+        self.local = threading.local()
+
+    def send(self, record):
+        # 워커 스레드마다 세션을 재사용하여 연결 수립 비용 제거
+        session = getattr(self.local, "session", None)
+        if session is None:
+            session = self.local.session = requests.Session()
+        response = session.get(self.target + record["endpoint"], params=record.get("params"), timeout=self.timeout)
+        return response.status_code
+
+
+class InProcessSender:
+    """프로세스 내부 WSGI 앱(Flask test_client)으로 요청 전송 (네트워크 비용 제외)"""
+
+    def __init__(self):
+        # 앱 임포트 시 검색 데이터와 모델이 로드됨 (src/app.py와 같은 작업 디렉토리 기준)
+        from app import app
+        self.app = app
+        self.local = threading.local()
+
+    def send(self, record):
+        client = getattr(self.local, "client", None)
+        if client is None:
+            client = self.local.client = self.app.test_client()
+        response = client.get(record["endpoint"], query_string=record.get("params"))
+        return response.status_code
+
+
+def replay(records, sender, concurrency, speedup):
+    """
+    레코드를 원래 시간 간격(배속 적용)에 맞춰 재생
+
+    Args:
+        records: 시간순 레코드 목록
+        sender: send(record) -> status_code 를 제공하는 객체
+        concurrency: 동시 요청 워커 수
+        speedup: 재생 배속 (0이면 간격 무시하고 최대 속도로 재생)
+
+    Returns:
+        (지연 시간(ms) 목록, 상태 코드 Counter, 총 소요 시간(초))
+    """
+    latencies = []
+    statuses = Counter()
+    lock = threading.Lock()
+    first_ts = records[0].get("ts", 0)
+    start = time.perf_counter()
+
+    def run(record):
+        # 원래 도착 시각(배속 적용)까지 대기
+        if speedup > 0:
+            delay = (record.get("ts", first_ts) - first_ts) / speedup - (time.perf_counter() - start)
+            if delay > 0:
+                time.sleep(delay)
+
+        request_start = time.perf_counter()
+        try:
+            status = sender.send(record)
+        except Exception as e:
+            status = f"error:{type(e).__name__}"
+        elapsed_ms = (time.perf_counter() - request_start) * 1000
+
+        with lock:
+            latencies.append(elapsed_ms)
+            statuses[status] += 1
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(run, records))
+
+    return latencies, statuses, time.perf_counter() - start
+
+
+def build_report(latencies, statuses, duration, recorded):
+    """처리량, 지연 시간 백분위, 상태 코드 분포 보고서 생성"""
+    sorted_latencies = sorted(latencies)
+    report = {
+        "requests": len(latencies),
+        "duration_sec": round(duration, 3),
+        "throughput_rps": round(len(latencies) / duration, 2) if duration > 0 else 0.0,
+        "latency_ms": {f"p{pct}": round(percentile(sorted_latencies, pct), 2) for pct in PERCENTILES},
+        "status": {str(status): count for status, count in statuses.items()},
+    }
+    report["latency_ms"]["max"] = round(sorted_latencies[-1], 2) if sorted_latencies else 0.0
+
+    # 기록 당시(운영) 지연 시간과 비교할 수 있도록 함께 표시
+    recorded_latencies = sorted(r["latency_ms"] for r in recorded if "latency_ms" in r)
+    if recorded_latencies:
+        report["recorded_latency_ms"] = {
+            f"p{pct}": round(percentile(recorded_latencies, pct), 2) for pct in PERCENTILES
+        }
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description='쿼리 로그 재생 부하 테스트')
+    parser.add_argument('logs', nargs='+', help='쿼리 로그 파일 경로 또는 glob 패턴 (로테이션 파일 포함)')
+    parser.add_argument('--target', default='http://localhost:5000', help='요청을 보낼 Flask 서버 주소')
+    parser.add_argument('--in-process', action='store_true', help='서버 대신 프로세스 내부 WSGI 앱으로 재생')
+    parser.add_argument('--concurrency', type=int, default=4, help='동시 요청 워커 수')
+    parser.add_argument('--speedup', type=float, default=1.0, help='재생 배속 (0이면 최대 속도)')
+    parser.add_argument('--limit', type=int, help='재생할 최대 요청 수')
+    parser.add_argument('--timeout', type=float, default=30.0, help='HTTP 요청 타임아웃(초)')
+    parser.add_argument('--output', help='보고서를 JSON 파일로도 저장할 경로')
+    args = parser.parse_args()
+
+    records = load_records(args.logs, args.limit)
+    if not records:
+        return 1
+
+    if args.in_process:
+        os.chdir(root_dir)  # 앱이 data/mvp.db 를 상대 경로로 읽으므로 루트에서 실행
+        sender = InProcessSender()
+        print("프로세스 내부 WSGI 앱으로 재생합니다.")
+    else:
+        sender = HttpSender(args.target, args.timeout)
+        print(f"{args.target} 로 재생합니다.")
+
+    print(f"동시성: {args.concurrency}, 배속: {args.speedup or '최대'}")
+    latencies, statuses, duration = replay(records, sender, args.concurrency, args.speedup)
+    report = build_report(latencies, statuses, duration, records)
+
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"보고서 저장: {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
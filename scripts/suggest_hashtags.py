@@ -0,0 +1,81 @@
+"""
+태그 스캐너용 신규 해시태그 추천 스크립트
+
+ETL이 만든 post_hashtags 테이블(mvp.db)로 해시태그 인덱스를 만들고,
+config.yaml의 target_hashtags와 자주 함께 달리는 해시태그 중 아직 스캔 대상이 아닌 것을
+파일로 저장합니다. 저장한 파일은 태그 스캐너의 --tags-file 옵션으로 넘길 수 있습니다.
+
+사용 예:
+    python scripts/suggest_hashtags.py --min-count 5 --out data/suggested_hashtags.txt
+    python run_scraper.py --mode scan --tags-file data/suggested_hashtags.txt
+"""
+
+import sys
+import sqlite3
+import logging
+import argparse
+from collections import Counter
+from pathlib import Path
+
+import yaml
+import pandas as pd
+
+# 스크립트 디렉토리 기준으로 상대 경로 설정
+script_dir = Path(__file__).parent
+root_dir = script_dir.parent
+
+# src 패키지(core.*)를 검색 API와 같은 방식으로 임포트하기 위해 경로 추가
+sys.path.insert(0, str(root_dir / "src"))
+from core.hashtags import HashtagIndex, normalize_hashtag
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='태그 스캐너용 신규 해시태그 추천')
+    parser.add_argument('--db', default=str(root_dir / "data" / "mvp.db"), help='ETL 결과 SQLite DB 경로')
+    parser.add_argument('--config', default=str(root_dir / "config.yaml"), help='target_hashtags가 있는 설정 파일')
+    parser.add_argument('--min-count', type=int, default=3, help='기준 해시태그와 함께 달린 최소 게시물 수')
+    parser.add_argument('--limit', type=int, default=50, help='추천할 최대 해시태그 수')
+    parser.add_argument('--out', default=str(root_dir / "data" / "suggested_hashtags.txt"), help='추천 목록 저장 경로')
+    args = parser.parse_args()
+
+    with open(args.config, 'r', encoding='utf-8') as f:
+        targets = [normalize_hashtag(str(tag)) for tag in (yaml.safe_load(f) or {}).get('target_hashtags', [])]
+    if not targets:
+        logger.error("설정 파일에 target_hashtags가 없습니다.")
+        return 1
+
+    con = sqlite3.connect(args.db)
+    try:
+        pairs = pd.read_sql("SELECT post_pk, hashtag FROM post_hashtags", con)
+    except Exception as e:
+        logger.error(f"post_hashtags 테이블을 읽을 수 없습니다. ETL을 먼저 실행하세요: {e}")
+        return 1
+    finally:
+        con.close()
+
+    codes, _ = pd.factorize(pairs['post_pk'])
+    index = HashtagIndex.from_pairs(int(codes.max()) + 1 if len(codes) else 0, codes, pairs['hashtag'])
+
+    # 기준 해시태그 각각과의 동시 출현 수를 합산 (여러 기준과 함께 달릴수록 높은 점수)
+    scores = Counter()
+    for target in targets:
+        scores.update(index.cooccurrence([target], limit=len(index.tags)))
+    suggestions = [
+        (tag, count) for tag, count in scores.most_common()
+        if tag not in targets and count >= args.min_count
+    ][:args.limit]
+
+    with open(args.out, 'w', encoding='utf-8') as f:
+        for tag, _ in suggestions:
+            f.write(f"{tag}\n")
+    for tag, count in suggestions:
+        logger.info(f"  #{tag}: {count}")
+    logger.info(f"추천 해시태그 {len(suggestions)}개 저장: {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,13 +1,23 @@
 import numpy as np
 import pandas as pd
-import sqlite3
 from sentence_transformers import SentenceTransformer
 import logging
 import math
 from flask import Blueprint, request, jsonify
 
 # 코어 모듈 import 경로 수정
-from core.nlp import parse
+from core.nlp import parse_query, add_known_products, select_known_products
+from core.facets import FACET_FIELDS
+from core.hashtags import normalize_hashtag
+from core.sort_index import SORT_KEYS, DEFAULT_SORT
+from core.snapshot import SearchSnapshot
+from core.autocomplete import DEFAULT_LIMIT as AUTOCOMPLETE_DEFAULT_LIMIT, ENTRY_KINDS
+from api.utils.admission import AdmissionGate, admission_controlled
+from api.utils.config import (
+    SEARCH_MAX_CONCURRENCY, SEARCH_MAX_QUEUE,
+    SEARCH_QUEUE_TIMEOUT_MS, SEARCH_RETRY_AFTER_SEC,
+    SEARCH_DB_PATH, SEARCH_SNAPSHOT_DIR, SEARCH_FUZZY_MIN_SCORE
+)
 
 # Blueprint 생성
 search_bp = Blueprint('search', __name__)
@@ -17,48 +27,58 @@ search_bp = Blueprint('search', __name__)
 # 여기서는 메인 로거가 이미 설정되었다고 가정
 logger = logging.getLogger(__name__) # Blueprint 로거
 
+# 검색 파이프라인 승인 게이트 (과부하 시 대기열이 넘치면 빠르게 503 반환)
+search_gate = AdmissionGate(
+    max_concurrent=SEARCH_MAX_CONCURRENCY,
+    max_queue=SEARCH_MAX_QUEUE,
+    queue_timeout_ms=SEARCH_QUEUE_TIMEOUT_MS
+)
+
 # 데이터 및 모델 로드 (Blueprint 로딩 시 한 번만)
 # TODO: 앱 컨텍스트나 더 정교한 상태 관리 고려 (현재는 모듈 로딩 시 실행)
 try:
-    logger.info("데이터베이스 연결 중 (search_api)...")
-    con = sqlite3.connect('data/mvp.db', check_same_thread=False)
-
-    logger.info("인플루언서 데이터 로딩 중 (influencers 테이블) (search_api)...")
-    infl_df_all = pd.read_sql("SELECT * FROM influencers", con)
-    logger.info(f"{len(infl_df_all)}명의 인플루언서 데이터 로드 완료 (search_api).")
+    # 스냅샷이 현재 DB로 만들어졌으면 바로 로드하고, 없거나 오래되었거나 읽을 수 없으면 SQLite에서 빌드
+    logger.info(f"검색 데이터 로딩 중: {SEARCH_SNAPSHOT_DIR} / {SEARCH_DB_PATH} (search_api)...")
+    snapshot = SearchSnapshot.load_or_build(SEARCH_SNAPSHOT_DIR, SEARCH_DB_PATH)
 
-    logger.info("게시물 데이터 로딩 중 (posts 테이블) (search_api)...")
-    posts_df = pd.read_sql("SELECT * FROM posts", con)
-    logger.info(f"{len(posts_df)}개의 게시물 데이터 로드 완료 (search_api).")
+    infl_df_all = snapshot.infl_df
+    posts_df = snapshot.posts_df
+    logger.info(f"인플루언서 {len(infl_df_all)}명, 게시물 {len(posts_df)}개 로드 완료 (search_api).")
 
-    # 코사인 유사도 계산을 위한 임베딩 벡터 로드
-    logger.info("임베딩 벡터 추출 중 (posts 테이블) (search_api)...")
-    posts_with_emb = posts_df.dropna(subset=['semantic_emb']).copy()
-    
-    # 임베딩 벡터 추출 방식 수정 - 1차원 문자열에서 다차원 배열로 변환
-    semantic_embs = []
-    for emb_str in posts_with_emb['semantic_emb']:
-        if isinstance(emb_str, str) and emb_str.strip():
-            try:
-                # 대괄호 제거 후 공백으로 분리하여 배열로 변환
-                # 문자열이 1D 배열처럼 저장되어 있을 경우
-                if '[' in emb_str and ']' in emb_str:
-                    emb_str = emb_str.strip('[]')
-                    emb_array = np.fromstring(emb_str, sep=' ')
-                # 문자열이 다른 형식으로 저장되어 있을 경우 (예: CSV 형식)
-                else:
-                    emb_array = np.fromstring(emb_str, sep=',')
-                
-                semantic_embs.append(emb_array)
-            except Exception as e:
-                logger.warning(f"임베딩 벡터 파싱 오류: {e} - 원본 문자열: {emb_str[:30]}...")
-    
-    if semantic_embs:
-        semantic_embs = np.array(semantic_embs)
-        logger.info(f"{len(semantic_embs)}개의 유효한 임베딩 벡터 추출 완료 (차원: {semantic_embs.shape[1]}) (search_api).")
+    # 코사인 유사도 계산을 위한 임베딩 벡터 (semantic_embs[i]는 posts_with_emb의 i번째 행)
+    semantic_embs = snapshot.vectors
+    posts_with_emb = posts_df.iloc[np.asarray(snapshot.vector_rows)]
+    if len(semantic_embs) > 0:
+        logger.info(f"{len(semantic_embs)}개의 유효한 임베딩 벡터 로드 완료 (차원: {semantic_embs.shape[1]}) (search_api).")
     else:
         logger.warning("유효한 임베딩 벡터가 없습니다. semantic_emb 열을 확인하세요.")
-        semantic_embs = np.array([])
+
+    # 패싯 비트맵 및 보조 정렬 순열 (게시물 행 순서 기준)
+    facet_index = snapshot.facet_index
+    sort_index = snapshot.sort_index
+
+    # 자동완성 접두어 인덱스 (제품명, 해시태그, 사용자명)
+    autocomplete_index = snapshot.autocomplete
+    # 제품명 오타 허용 검색용 트라이그램 인덱스
+    fuzzy_index = snapshot.fuzzy_index
+    # 해시태그 -> 게시물 행 포스팅 리스트 (hashtag 필터, 해시태그 패싯/동시 출현 집계)
+    hashtag_index = snapshot.hashtag_index
+
+    # 쿼리 해석 필터를 벡터 점수 계산 전에 적용하기 위한 게시물 행 기준 배열
+    post_followers = pd.to_numeric(
+        infl_df_all.drop_duplicates(subset=['pk']).set_index('pk')['follower_count']
+        .reindex(posts_df['user_pk'].to_numpy()),
+        errors='coerce'
+    ).to_numpy(dtype=np.float64)
+    post_nlp_categories = posts_df['nlp_category'].to_numpy() if 'nlp_category' in posts_df.columns else None
+    # 근사 중복 캡션 그룹 (ETL의 dup_group_id가 없으면 접기를 지원하지 않음)
+    has_dup_groups = 'dup_group_id' in posts_df.columns
+
+    # 알려진 제품명을 쿼리 빠른 경로 사전에 등록 (짧은 제품 쿼리는 JVM 없이 해석)
+    # OCR 잡음이 사전 단어가 되지 않도록 정규화 후 여러 게시물에 나온 이름만 등록
+    for column in ('product_name', 'nlp_product'):
+        if column in posts_df.columns:
+            add_known_products(select_known_products(posts_df[column].dropna()))
     
     logger.info("Sentence Transformer 모델 로딩 중 (search_api)...")
     model = SentenceTransformer('snunlp/KR-SBERT-V40K-klueNLI-augSTS')
@@ -103,9 +123,16 @@ def cosine_similarity(query_vector, embedding_vectors):
 
 
 # 랭킹 점수 계산 함수
-def calculate_ranking_score(semantic_sim, follower_count):
-    """시맨틱 유사도와 팔로워 수를 결합한 랭킹 점수 계산
+# 팔로워 성장률 가산 (ETL이 팔로워 시계열로 계산한 follower_growth_30d 컬럼이 있을 때만)
+GROWTH_FEATURE = "follower_growth_30d"
+GROWTH_WEIGHT = 0.1       # 성장률 점수 가중치 (팔로워 점수 가중치에서 나눔)
+GROWTH_SATURATION = 0.2   # 이 성장률(30일 +20%) 이상이면 성장률 점수 1.0
+
+
+def calculate_ranking_score(semantic_sim, follower_count, follower_growth=None):
+    """시맨틱 유사도와 팔로워 수(+ 팔로워 성장률)를 결합한 랭킹 점수 계산
     score = 0.6*semantic_sim + 0.4*log10(follower_count)
+    성장률이 있으면 score = 0.6*semantic_sim + 0.3*log10(follower_count) + 0.1*growth
     """
     if follower_count <= 0:
         log_followers = 0
@@ -115,11 +142,148 @@ def calculate_ranking_score(semantic_sim, follower_count):
         # 1.0 이상으로 넘어가지 않도록 클리핑
         log_followers = min(log_followers, 1.0)
     
-    # 가중치 적용 (시맨틱 유사도 60%, 팔로워 수 40%)
-    return 0.6 * semantic_sim + 0.4 * log_followers
+    # 성장률 이력이 없으면 기존 가중치 (시맨틱 유사도 60%, 팔로워 수 40%)
+    if follower_growth is None or pd.isna(follower_growth):
+        return 0.6 * semantic_sim + 0.4 * log_followers
+
+    # 감소는 0, GROWTH_SATURATION 이상은 1.0으로 클리핑
+    growth_score = min(max(follower_growth / GROWTH_SATURATION, 0.0), 1.0)
+    return 0.6 * semantic_sim + (0.4 - GROWTH_WEIGHT) * log_followers + GROWTH_WEIGHT * growth_score
+
+
+# 패싯 비트맵이 아닌 해시태그 인덱스로 집계하는 패싯 필드
+HASHTAG_FACET = "hashtag"
+HASHTAG_FACET_LIMIT = 20
+# 근사 중복 접기(collapse) 시 보조 정렬에서 미리 더 가져올 배수 (접힌 만큼 결과가 모자라지 않도록)
+COLLAPSE_OVERFETCH = 5
+
+
+def parse_facet_fields(raw: str) -> list:
+    """facets 파라미터(쉼표 구분)를 지원하는 패싯 필드 목록으로 변환"""
+    fields = []
+    for field in raw.split(","):
+        field = field.strip()
+        if not field:
+            continue
+        if field not in FACET_FIELDS and field != HASHTAG_FACET:
+            logger.warning(f"지원하지 않는 패싯 필드 '{field}'는 무시합니다. (지원: {', '.join(FACET_FIELDS + (HASHTAG_FACET,))})")
+            continue
+        if field not in fields:
+            fields.append(field)
+    return fields
+
+
+def build_search_response(results, facet_fields, facet_counts=None, query=None):
+    """검색 응답 구성 (facets 미요청 시 기존과 같이 결과 리스트만 반환)"""
+    if not facet_fields:
+        return jsonify(results)
+    if facet_counts is None:
+        facet_counts = {field: {} for field in facet_fields}
+    response = {"results": results, "facets": facet_counts}
+    if query is not None:
+        response["query"] = query
+    return jsonify(response)
+
+
+def build_prefilter_mask(query: dict):
+    """
+    해석된 쿼리의 팔로워 범위/카테고리를 게시물 행 마스크로 변환
+
+    카테고리는 인플루언서 카테고리 또는 게시물 캡션 카테고리(nlp_category)가 일치하면 포함합니다.
+    카테고리 조건으로 후보가 하나도 남지 않으면 카테고리 조건은 적용하지 않습니다.
+
+    Returns:
+        게시물 행 길이의 불리언 마스크 (적용할 필터가 없으면 None)
+    """
+    mask = None
+    min_followers, max_followers = query.get("min_followers"), query.get("max_followers")
+    if min_followers is not None or max_followers is not None:
+        # 팔로워 수가 없는(NaN) 게시물은 비교 결과가 False이므로 제외됨
+        mask = np.ones(len(posts_df), dtype=bool)
+        if min_followers is not None:
+            mask &= post_followers >= min_followers
+        if max_followers is not None:
+            mask &= post_followers <= max_followers
+
+    category = query.get("category")
+    if category:
+        category_mask = np.zeros(len(posts_df), dtype=bool)
+        bitmap = facet_index.bitmaps.get("category", {}).get(category)
+        if bitmap is not None:
+            category_mask |= np.unpackbits(bitmap, count=len(posts_df)).astype(bool)
+        if post_nlp_categories is not None:
+            category_mask |= post_nlp_categories == category
+        combined = category_mask if mask is None else mask & category_mask
+        if combined.any():
+            mask = combined
+        else:
+            logger.info(f"카테고리 '{category}' 조건을 만족하는 게시물이 없어 카테고리 필터는 적용하지 않습니다.")
+    return mask
+
+
+@search_bp.route("/search/admission", methods=['GET'])
+def search_admission_stats():
+    """검색 승인 게이트 상태 (실행 중/대기 요청 수, 차단 횟수 등)"""
+    return jsonify(search_gate.stats())
+
+
+@search_bp.route("/autocomplete", methods=['GET'])
+def autocomplete():
+    """검색어 자동완성 API
+    쿼리 파라미터:
+    - prefix: 입력 중인 검색어 (required)
+    - limit: 최대 반환 항목 수 (int, default: 10, 최대 50)
+    - kinds: 포함할 항목 종류 (쉼표 구분, 'product'/'hashtag'/'username', default: 전체)
+    응답: [{"text": 표시 문자열, "kind": 항목 종류, "count": 게시물 수}, ...] (count 내림차순)
+    """
+    prefix = request.args.get("prefix", "")
+    try:
+        limit = int(request.args.get("limit", AUTOCOMPLETE_DEFAULT_LIMIT))
+    except ValueError:
+        limit = AUTOCOMPLETE_DEFAULT_LIMIT
+        logger.warning(f"limit 파라미터가 유효한 숫자가 아닙니다. 기본값 {AUTOCOMPLETE_DEFAULT_LIMIT}을 사용합니다.")
+
+    kinds = None
+    if request.args.get("kinds"):
+        kinds = {kind.strip() for kind in request.args["kinds"].split(",") if kind.strip() in ENTRY_KINDS} or None
+
+    if not prefix.strip() or autocomplete_index is None:
+        return jsonify([])
+    return jsonify(autocomplete_index.complete(prefix, limit, kinds))
+
+
+def parse_hashtags(raw: str) -> list:
+    """hashtag 파라미터(쉼표 구분, '#' 생략 가능)를 정규화된 해시태그 목록으로 변환"""
+    return list(dict.fromkeys(normalize_hashtag(tag) for tag in raw.split(",") if normalize_hashtag(tag)))
+
+
+@search_bp.route("/hashtags/related", methods=['GET'])
+def related_hashtags():
+    """해시태그 동시 출현 집계 API
+    쿼리 파라미터:
+    - tag: 기준 해시태그 (쉼표 구분 시 모두 달린 게시물 기준, required)
+    - limit: 최대 반환 해시태그 수 (int, default: 20, 최대 100)
+    응답: {"tags": [기준 해시태그], "posts": 기준 게시물 수, "related": {해시태그: 게시물 수}}
+    """
+    tags = parse_hashtags(request.args.get("tag", ""))
+    try:
+        limit = max(1, min(int(request.args.get("limit", 20)), 100))
+    except ValueError:
+        limit = 20
+        logger.warning("limit 파라미터가 유효한 숫자가 아닙니다. 기본값 20을 사용합니다.")
+
+    if not tags or hashtag_index is None:
+        return jsonify({"tags": tags, "posts": 0, "related": {}})
+    mask = hashtag_index.mask(tags)
+    return jsonify({
+        "tags": tags,
+        "posts": int(mask.sum()),
+        "related": hashtag_index.counts(mask, limit, exclude=tags),
+    })
 
 
 @search_bp.route("/search", methods=['GET'])
+@admission_controlled(search_gate, retry_after_sec=SEARCH_RETRY_AFTER_SEC)
 def search():
     """확장된 검색 API 엔드포인트
     쿼리 파라미터:
@@ -129,6 +293,18 @@ def search():
     - gender: 성별 필터 (str, 'male'/'female'/'all', default: 'all')
     - age_group: 연령대 필터 (str, '10s'/'20s'/'30s'/etc, default: None)
     - limit: 최대 반환 결과 수 (int, default: 20)
+    - facets: 패싯 카운트 필드 (쉼표 구분, 'category'/'follower_bucket'/'is_verified')
+      지정 시 응답이 {"results": [...], "facets": {필드: {값: 개수}}} 형태로 바뀜
+      'hashtag' 지정 시 결과 게시물에 함께 달린 해시태그 상위 20개를 집계
+    - sort: 정렬 기준 (str, 'score'/'recent'/'likes'/'followers', default: 'score')
+    - max_follow: 최대 팔로워 수 (int, default: 없음)
+    - fuzzy: 제품명 오타 허용 검색 여부 (str, '1'/'0', default: '0')
+      키워드 검색에 OCR 제품명 트라이그램 유사도 일치를 추가 (유사도 = 0.5 * 트라이그램 점수)
+    - hashtag: 해시태그 필터 (쉼표 구분 시 모두 달린 게시물만, '#' 생략 가능)
+    - nlp: 검색어 해석 여부 (str, '1'/'0', default: '1')
+      검색어의 팔로워 범위("1만~5만", "10만 이상")와 카테고리를 필터로 바꿔 벡터 점수 계산 전에 적용
+    - collapse: 근사 중복 캡션 접기 여부 (str, '1'/'0', default: '0')
+      같은 dup_group_id 게시물 중 정렬 순서상 첫 게시물만 반환 (패싯 카운트는 접기 전 기준)
     """
     # 필수 검색어 파라미터
     q = request.args.get("q", "")
@@ -146,6 +322,17 @@ def search():
         min_follow = 0
         logger.warning("min_follow 파라미터가 유효한 숫자가 아닙니다. 기본값 0을 사용합니다.")
     
+    try:
+        max_follow = int(request.args["max_follow"]) if request.args.get("max_follow") else None
+    except ValueError:
+        max_follow = None
+        logger.warning("max_follow 파라미터가 유효한 숫자가 아닙니다. 최대 팔로워 조건을 적용하지 않습니다.")
+
+    use_nlp = request.args.get("nlp", "1") != "0"
+    use_fuzzy = request.args.get("fuzzy", "0") == "1"
+    collapse = request.args.get("collapse", "0") == "1" and has_dup_groups
+    hashtags = parse_hashtags(request.args.get("hashtag", ""))
+
     gender = request.args.get("gender", "all").lower()
     age_group = request.args.get("age_group", None)
     
@@ -156,25 +343,55 @@ def search():
         limit = 20
         logger.warning("limit 파라미터가 유효한 숫자가 아닙니다. 기본값 20을 사용합니다.")
 
+    facet_fields = parse_facet_fields(request.args.get("facets", ""))
+    
+    sort_key = request.args.get("sort", DEFAULT_SORT).lower()
+    if sort_key != DEFAULT_SORT and not sort_index.supports(sort_key):
+        logger.warning(f"지원하지 않는 정렬 기준 '{sort_key}'입니다. 기본값 '{DEFAULT_SORT}'를 사용합니다. (지원: {', '.join(SORT_KEYS)})")
+        sort_key = DEFAULT_SORT
+
     if not q:
         logger.info("검색어가 비어 있어 빈 결과를 반환합니다.")
-        return jsonify([])
+        return build_search_response([], facet_fields)
 
-    logger.info(f"검색 요청: q='{q}', min_sim={min_sim}, min_follow={min_follow}, gender={gender}, age_group={age_group}, limit={limit}")
+    logger.info(f"검색 요청: q='{q}', min_sim={min_sim}, min_follow={min_follow}, max_follow={max_follow}, gender={gender}, age_group={age_group}, limit={limit}, sort={sort_key}")
 
     try:
-        # 1. 검색어 임베딩
+        # 0. 검색어 해석: 팔로워 범위와 카테고리를 구조화된 필터로 변환 (명시적 파라미터와 함께 적용)
+        query = parse_query(q) if use_nlp else {"text": q}
+        if query.get("min_followers") is not None:
+            min_follow = max(min_follow, query["min_followers"])
+        if max_follow is not None:
+            query["max_followers"] = min(max_follow, query.get("max_followers") or max_follow)
+        max_follow = query.get("max_followers")
+        query["min_followers"] = min_follow or None
+        search_text = query.get("text") or q
+        prefilter_mask = build_prefilter_mask(query)
+        if hashtags and hashtag_index is not None:
+            # 해시태그 포스팅 리스트 교집합으로 후보 제한
+            hashtag_mask = hashtag_index.mask(hashtags)
+            prefilter_mask = hashtag_mask if prefilter_mask is None else prefilter_mask & hashtag_mask
+        if prefilter_mask is not None:
+            logger.info(f"쿼리 해석 결과 {query}, 사전 필터 후 후보 게시물 {int(prefilter_mask.sum())}개")
+
+        # 1. 검색어 임베딩 (팔로워 범위 표현을 제거한 검색어 사용)
         logger.info("검색어 임베딩 생성 중...")
-        query_embedding = model.encode(q)
+        query_embedding = model.encode(search_text)
         logger.info(f"쿼리 임베딩 차원: {query_embedding.shape}")
         
-        # 2. 첫 번째 필터: 임베딩 기반 시맨틱 유사도 계산
+        # 2. 첫 번째 필터: 임베딩 기반 시맨틱 유사도 계산 (사전 필터를 통과한 임베딩만 점수 계산)
         if len(semantic_embs) > 0:
             try:
-                similarities = cosine_similarity(query_embedding, semantic_embs)
+                if prefilter_mask is None:
+                    emb_positions = np.arange(len(semantic_embs))
+                    candidate_embs = semantic_embs
+                else:
+                    emb_positions = np.flatnonzero(prefilter_mask[np.asarray(snapshot.vector_rows)])
+                    candidate_embs = semantic_embs[emb_positions]
+                similarities = cosine_similarity(query_embedding, candidate_embs)
                 # min_sim 이상인 게시물만 선택
                 semantic_match_indices = np.where(similarities >= min_sim)[0]
-                semantic_match_posts = posts_with_emb.iloc[semantic_match_indices].copy()
+                semantic_match_posts = posts_with_emb.iloc[emb_positions[semantic_match_indices]].copy()
                 semantic_match_posts['similarity'] = similarities[semantic_match_indices]
                 logger.info(f"시맨틱 유사도 {min_sim} 이상인 게시물 {len(semantic_match_posts)}개 발견")
             except Exception as sim_error:
@@ -185,14 +402,26 @@ def search():
             semantic_match_posts = pd.DataFrame()
             logger.warning("유효한 임베딩 벡터가 없어 시맨틱 검색을 건너뜁니다.")
         
-        # 3. 텍스트 키워드 검색 (OCR 및 캡션)
+        # 3. 텍스트 키워드 검색 (OCR 및 캡션, 사전 필터를 통과한 게시물만)
+        keyword_posts = posts_df if prefilter_mask is None else posts_df[prefilter_mask]
         keyword_condition = (
-            posts_df['caption_text'].str.contains(q, case=False, na=False) | 
-            posts_df['product_name'].str.contains(q, case=False, na=False)
+            keyword_posts['caption_text'].str.contains(search_text, case=False, na=False, regex=False) |
+            keyword_posts['product_name'].str.contains(search_text, case=False, na=False, regex=False)
         )
-        keyword_match_posts = posts_df[keyword_condition].copy()
+        keyword_match_posts = keyword_posts[keyword_condition].copy()
         keyword_match_posts['similarity'] = 0.5  # 텍스트 매치에 기본 유사도 할당
-        logger.info(f"키워드 '{q}'가 포함된 게시물 {len(keyword_match_posts)}개 발견")
+        logger.info(f"키워드 '{search_text}'가 포함된 게시물 {len(keyword_match_posts)}개 발견")
+
+        # 3-1. 제품명 오타 허용 일치 (정확히 포함된 게시물은 제외하고 점수에 비례한 유사도 할당)
+        if use_fuzzy and fuzzy_index is not None:
+            fuzzy_rows, fuzzy_scores = fuzzy_index.rows_for(search_text, SEARCH_FUZZY_MIN_SCORE)
+            keep = ~np.isin(fuzzy_rows, keyword_match_posts.index.to_numpy())
+            if prefilter_mask is not None:
+                keep &= prefilter_mask[fuzzy_rows]
+            fuzzy_match_posts = posts_df.iloc[fuzzy_rows[keep]].copy()
+            fuzzy_match_posts['similarity'] = 0.5 * fuzzy_scores[keep]
+            keyword_match_posts = pd.concat([keyword_match_posts, fuzzy_match_posts])
+            logger.info(f"제품명 유사 일치 게시물 {len(fuzzy_match_posts)}개 추가")
         
         # 4. 두 결과 병합 (중복 제거)
         if not semantic_match_posts.empty:
@@ -204,13 +433,15 @@ def search():
         
         if merged_posts.empty:
             logger.info("검색 조건에 맞는 게시물이 없습니다.")
-            return jsonify([])
+            return build_search_response([], facet_fields)
         
         logger.info(f"중복 제거 후 총 {len(merged_posts)}개 게시물 발견")
         
         # 5. 인플루언서 정보 병합
         # 인플루언서 필터링 (min_follow, gender, age_group)
         influencer_filter = (infl_df_all['follower_count'] >= min_follow)
+        if max_follow is not None:
+            influencer_filter &= (infl_df_all['follower_count'] <= max_follow)
         
         # 성별 필터 (선택 사항)
         if gender != "all" and 'gender' in infl_df_all.columns:
@@ -229,7 +460,25 @@ def search():
         
         if result_posts.empty:
             logger.info("필터링 후 결과가 없습니다.")
-            return jsonify([])
+            return build_search_response([], facet_fields)
+        
+        # 후보 게시물 마스크 (result_posts의 인덱스는 posts_df의 행 위치와 동일)
+        candidate_mask = np.zeros(len(posts_df), dtype=bool)
+        candidate_mask[result_posts.index.to_numpy()] = True
+        
+        # 패싯 카운트: 후보 게시물 비트맵과 패싯 값 비트맵의 AND + popcount
+        facet_counts = None
+        if facet_fields:
+            candidate = facet_index.candidate_bitmap(candidate_mask)
+            facet_counts = facet_index.counts(candidate, [field for field in facet_fields if field != HASHTAG_FACET])
+            if HASHTAG_FACET in facet_fields and hashtag_index is not None:
+                facet_counts[HASHTAG_FACET] = hashtag_index.counts(candidate_mask, HASHTAG_FACET_LIMIT, exclude=hashtags)
+        
+        # 보조 정렬: 미리 정렬된 순서를 따라 후보만 limit개 골라낸 뒤 그 행만 조인
+        if sort_key != DEFAULT_SORT:
+            top_positions = sort_index.top(sort_key, candidate_mask, limit * COLLAPSE_OVERFETCH if collapse else limit)
+            result_posts = result_posts.loc[top_positions]
+            logger.info(f"'{sort_key}' 정렬 순서로 상위 {len(result_posts)}개 게시물 선택")
         
         # 인플루언서 정보 조인
         result_with_user = pd.merge(
@@ -242,18 +491,26 @@ def search():
         
         # 6. 랭킹 점수 계산 및 정렬
         result_with_user['score'] = result_with_user.apply(
-            lambda row: calculate_ranking_score(row['similarity'], row['follower_count']), 
+            lambda row: calculate_ranking_score(row['similarity'], row['follower_count'], row.get(GROWTH_FEATURE)),
             axis=1
         )
         
-        # 점수 내림차순 정렬
-        sorted_results = result_with_user.sort_values('score', ascending=False)
-        
+        # 점수 내림차순 정렬 (보조 정렬 시에는 조인 결과가 이미 정렬 순서를 유지함)
+        if sort_key == DEFAULT_SORT:
+            sorted_results = result_with_user.sort_values('score', ascending=False)
+        else:
+            sorted_results = result_with_user
+
+        # 근사 중복 접기: 정렬된 결과에서 그룹별 첫 게시물만 유지
+        if collapse:
+            sorted_results = sorted_results.drop_duplicates(subset=['dup_group_id'])
+            logger.info(f"근사 중복 접기 후 {len(sorted_results)}개 게시물")
+
         # 최대 결과 수 제한
         final_results = sorted_results.head(limit).to_dict(orient="records")
         logger.info(f"최종 {len(final_results)}개 결과 반환")
         
-        return jsonify(final_results)
+        return build_search_response(final_results, facet_fields, facet_counts, query if use_nlp else None)
 
     except Exception as e:
         logger.error(f"검색 처리 중 오류 발생: {e}", exc_info=True)
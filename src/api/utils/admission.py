@@ -0,0 +1,137 @@
+"""
+검색 엔드포인트 승인 제어(admission control) 및 부하 차단(load shedding) 모듈
+
+요청이 몰리면 Flask 스레드가 model.encode와 NumPy 연산 안에 쌓이면서
+모든 요청의 지연 시간이 함께 늘어납니다. 동시 실행 수를 제한하는 게이트와
+짧은 대기열을 두고, 대기 시간 예산을 넘길 요청은 즉시 503(Retry-After)으로
+돌려보내 과부하 시에도 처리 중인 요청의 p99가 무너지지 않도록 합니다.
+"""
+
+import time
+import logging
+import functools
+import threading
+from flask import jsonify
+
+# 로거 설정
+logger = logging.getLogger(__name__)
+
+# 서비스 시간 이동 평균(EWMA) 가중치
+SERVICE_TIME_EWMA_ALPHA = 0.2
+
+
+class AdmissionGate:
+    """동시 실행 수 제한 + 제한된 대기열 + 대기 시간 예산 기반 승인 게이트"""
+
+    def __init__(self, max_concurrent=4, max_queue=16, queue_timeout_ms=500):
+        """
+        초기화
+
+        Args:
+            max_concurrent: 동시에 파이프라인을 실행할 수 있는 최대 요청 수
+            max_queue: 실행 슬롯을 기다릴 수 있는 최대 요청 수
+            queue_timeout_ms: 요청당 대기 시간 예산(ms)
+        """
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout_ms / 1000
+        self._slots = threading.BoundedSemaphore(max_concurrent)
+        self._lock = threading.Lock()
+
+        # 상태 및 통계
+        self.in_flight = 0
+        self.queue_depth = 0
+        self.peak_queue_depth = 0
+        self.admitted = 0
+        self.shed = {"queue_full": 0, "predicted_wait": 0, "timeout": 0}
+        self.service_time_ms = None  # 처리 시간 EWMA
+
+    def _estimated_wait(self) -> float:
+        """현재 대기열 길이와 평균 처리 시간으로 예상 대기 시간(초) 추정"""
+        if self.service_time_ms is None:
+            return 0.0
+        return (self.queue_depth + 1) * (self.service_time_ms / 1000) / self.max_concurrent
+
+    def _reject(self, reason: str) -> bool:
+        self.shed[reason] += 1
+        logger.warning(
+            f"검색 요청 차단 ({reason}): 실행 중 {self.in_flight}, 대기 {self.queue_depth}, "
+            f"누적 차단 {sum(self.shed.values())}"
+        )
+        return False
+
+    def try_acquire(self) -> bool:
+        """실행 슬롯 획득 시도 (예산 내에 획득하지 못하면 False)"""
+        with self._lock:
+            # 빈 슬롯이 있으면 대기 없이 바로 승인
+            if self._slots.acquire(blocking=False):
+                self.in_flight += 1
+                self.admitted += 1
+                return True
+            if self.queue_depth >= self.max_queue:
+                return self._reject("queue_full")
+            # 기다려도 예산 안에 차례가 오지 않을 것으로 보이면 즉시 차단
+            if self._estimated_wait() > self.queue_timeout:
+                return self._reject("predicted_wait")
+            self.queue_depth += 1
+            self.peak_queue_depth = max(self.peak_queue_depth, self.queue_depth)
+
+        acquired = self._slots.acquire(timeout=self.queue_timeout)
+
+        with self._lock:
+            self.queue_depth -= 1
+            if not acquired:
+                return self._reject("timeout")
+            self.in_flight += 1
+            self.admitted += 1
+            return True
+
+    def release(self, service_time_ms=None) -> None:
+        """실행 슬롯 반환 및 처리 시간 기록"""
+        with self._lock:
+            self.in_flight -= 1
+            if service_time_ms is not None:
+                if self.service_time_ms is None:
+                    self.service_time_ms = service_time_ms
+                else:
+                    self.service_time_ms += SERVICE_TIME_EWMA_ALPHA * (service_time_ms - self.service_time_ms)
+        self._slots.release()
+
+    def stats(self) -> dict:
+        """게이트 상태 및 누적 통계"""
+        with self._lock:
+            return {
+                "max_concurrent": self.max_concurrent,
+                "max_queue": self.max_queue,
+                "queue_timeout_ms": self.queue_timeout * 1000,
+                "in_flight": self.in_flight,
+                "queue_depth": self.queue_depth,
+                "peak_queue_depth": self.peak_queue_depth,
+                "admitted": self.admitted,
+                "shed": dict(self.shed),
+                "shed_total": sum(self.shed.values()),
+                "avg_service_ms": round(self.service_time_ms, 2) if self.service_time_ms is not None else None,
+            }
+
+
+def admission_controlled(gate: AdmissionGate, retry_after_sec: int = 1):
+    """뷰 함수를 승인 게이트로 감싸는 데코레이터 (차단 시 503 + Retry-After)"""
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            if not gate.try_acquire():
+                response = jsonify({
+                    "error": "요청이 많아 잠시 후 다시 시도해 주세요.",
+                    "retry_after": retry_after_sec
+                })
+                response.status_code = 503
+                response.headers["Retry-After"] = str(retry_after_sec)
+                return response
+
+            start = time.perf_counter()
+            try:
+                return view(*args, **kwargs)
+            finally:
+                gate.release((time.perf_counter() - start) * 1000)
+        return wrapper
+    return decorator
@@ -26,6 +26,25 @@ API_KEY = os.getenv("NAVER_PAPAGO_CLIENT_SECRET", os.getenv("X-NCP-APIGW-API-KEY
 OCR_SECRET_KEY = os.getenv("NAVER_OCR_SECRET_KEY")
 CLOVA_STUDIO_API_KEY = os.getenv("CLOVA_STUDIO_API_KEY")
 
+# 쿼리 로그 (요청 표본 기록, 부하 재현용) - 경로가 비어 있으면 비활성화
+QUERY_LOG_PATH = os.getenv("QUERY_LOG_PATH", "")
+QUERY_LOG_SAMPLE_RATE = float(os.getenv("QUERY_LOG_SAMPLE_RATE", "1.0"))
+QUERY_LOG_MAX_BYTES = int(os.getenv("QUERY_LOG_MAX_BYTES", str(50 * 1024 * 1024)))
+QUERY_LOG_BACKUP_COUNT = int(os.getenv("QUERY_LOG_BACKUP_COUNT", "5"))
+
+# 검색 승인 제어 (동시 실행 수, 대기열 길이, 대기 시간 예산, 차단 시 Retry-After)
+SEARCH_MAX_CONCURRENCY = int(os.getenv("SEARCH_MAX_CONCURRENCY", "4"))
+SEARCH_MAX_QUEUE = int(os.getenv("SEARCH_MAX_QUEUE", "16"))
+SEARCH_QUEUE_TIMEOUT_MS = int(os.getenv("SEARCH_QUEUE_TIMEOUT_MS", "500"))
+SEARCH_RETRY_AFTER_SEC = int(os.getenv("SEARCH_RETRY_AFTER_SEC", "1"))
+
+# 검색 데이터 경로 (스냅샷 디렉토리가 있으면 우선 사용, 없으면 SQLite에서 로드)
+SEARCH_DB_PATH = os.getenv("SEARCH_DB_PATH", os.path.join("data", "mvp.db"))
+SEARCH_SNAPSHOT_DIR = os.getenv("SEARCH_SNAPSHOT_DIR", os.path.join("data", "search_snapshot"))
+
+# 제품명 오타 허용 검색(fuzzy=1) 최소 점수 (쿼리 3-gram 중 제품명에 있어야 하는 비율)
+SEARCH_FUZZY_MIN_SCORE = float(os.getenv("SEARCH_FUZZY_MIN_SCORE", "0.6"))
+
 def log_config_status():
     """환경 변수 설정 상태를 로깅"""
     logger.info("API 환경 변수 로드 상태:")
@@ -98,7 +117,11 @@ def get_app_config():
         "PAPAGO_NMT_API_URL": PAPAGO_NMT_API_URL,
         "PAPAGO_HEADERS": headers["papago"],
         "CLOVA_STUDIO_EMBEDDING_URL": CLOVA_STUDIO_EMBEDDING_URL,
-        "CLOVA_STUDIO_HEADERS": headers["clova_studio"]
+        "CLOVA_STUDIO_HEADERS": headers["clova_studio"],
+        "QUERY_LOG_PATH": QUERY_LOG_PATH,
+        "QUERY_LOG_SAMPLE_RATE": QUERY_LOG_SAMPLE_RATE,
+        "QUERY_LOG_MAX_BYTES": QUERY_LOG_MAX_BYTES,
+        "QUERY_LOG_BACKUP_COUNT": QUERY_LOG_BACKUP_COUNT
     }
 
 # 설정 로깅
@@ -0,0 +1,125 @@
+"""
+API 요청 로그(쿼리 로그) 수집 모듈
+
+운영 트래픽을 배포 전에 재현할 수 있도록 요청을 표본 추출하여
+(endpoint, params, latency, status) 형태의 JSONL 파일로 기록합니다.
+요청 스레드에서는 큐에 넣기만 하고, 파일 쓰기와 로테이션은
+QueueListener 백그라운드 스레드가 담당하므로 응답 지연에 거의 영향을 주지 않습니다.
+
+기록된 로그는 scripts/replay_load.py로 재생하여 부하 테스트에 사용합니다.
+"""
+
+import os
+import json
+import time
+import queue
+import random
+import atexit
+import logging
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from flask import g, request
+
+# 로거 설정
+logger = logging.getLogger(__name__)
+
+# 쿼리 로그 전용 로거 이름 (애플리케이션 로그와 섞이지 않도록 propagate 비활성화)
+QUERY_LOG_LOGGER_NAME = "ma8.query_log"
+
+# 기본 설정값
+DEFAULT_SAMPLE_RATE = 1.0
+DEFAULT_MAX_BYTES = 50 * 1024 * 1024  # 50MB
+DEFAULT_BACKUP_COUNT = 5
+
+# 로그로 남기지 않을 경로 접두어 (정적 파일 등)
+EXCLUDED_PATH_PREFIXES = ("/static",)
+
+
+def init_query_log(app):
+    """
+    Flask 앱에 쿼리 로그 수집 훅 등록
+
+    app.config의 QUERY_LOG_PATH가 비어 있으면 아무것도 하지 않습니다.
+    관련 설정: QUERY_LOG_PATH, QUERY_LOG_SAMPLE_RATE, QUERY_LOG_MAX_BYTES, QUERY_LOG_BACKUP_COUNT
+
+    Returns:
+        백그라운드 QueueListener (비활성화 시 None)
+    """
+    log_path = app.config.get("QUERY_LOG_PATH")
+    if not log_path:
+        logger.info("QUERY_LOG_PATH가 설정되지 않아 쿼리 로그 수집을 비활성화합니다.")
+        return None
+
+    sample_rate = float(app.config.get("QUERY_LOG_SAMPLE_RATE", DEFAULT_SAMPLE_RATE))
+    max_bytes = int(app.config.get("QUERY_LOG_MAX_BYTES", DEFAULT_MAX_BYTES))
+    backup_count = int(app.config.get("QUERY_LOG_BACKUP_COUNT", DEFAULT_BACKUP_COUNT))
+
+    log_dir = os.path.dirname(log_path)
+    if log_dir:
+        os.makedirs(log_dir, exist_ok=True)
+
+    # 파일 핸들러는 리스너 스레드에서만 사용 (한 줄 = JSON 레코드 하나)
+    file_handler = RotatingFileHandler(
+        log_path, maxBytes=max_bytes, backupCount=backup_count, encoding='utf-8'
+    )
+    file_handler.setFormatter(logging.Formatter('%(message)s'))
+
+    log_queue = queue.SimpleQueue()
+    listener = QueueListener(log_queue, file_handler)
+    listener.start()
+    atexit.register(listener.stop)
+
+    query_logger = logging.getLogger(QUERY_LOG_LOGGER_NAME)
+    query_logger.setLevel(logging.INFO)
+    query_logger.propagate = False
+    query_logger.handlers = [QueueHandler(log_queue)]
+
+    @app.before_request
+    def _start_query_timer():
+        # 표본 추출 여부를 요청 시작 시점에 결정하여 미선택 요청의 비용을 최소화
+        if sample_rate >= 1.0 or random.random() < sample_rate:
+            g.query_log_start = time.perf_counter()
+
+    @app.after_request
+    def _record_query(response):
+        start = g.pop("query_log_start", None)
+        if start is None or request.path.startswith(EXCLUDED_PATH_PREFIXES):
+            return response
+
+        record = {
+            "ts": time.time(),
+            "method": request.method,
+            "endpoint": request.path,
+            "params": request.args.to_dict(),
+            "status": response.status_code,
+            "latency_ms": round((time.perf_counter() - start) * 1000, 3),
+        }
+        query_logger.info(json.dumps(record, ensure_ascii=False))
+        return response
+
+    logger.info(f"쿼리 로그 수집 활성화: {log_path} (표본 비율: {sample_rate})")
+    return listener
+
+
+def read_query_log(paths):
+    """
+    쿼리 로그 파일(로테이션된 파일 포함)을 읽어 시간순 레코드 목록 반환
+
+    Args:
+        paths: 로그 파일 경로 목록
+
+    Returns:
+        ts 기준으로 정렬된 레코드 딕셔너리 목록
+    """
+    records = []
+    for path in paths:
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    records.append(json.loads(line))
+                except json.JSONDecodeError:
+                    logger.warning(f"잘못된 쿼리 로그 라인을 건너뜁니다: {line[:50]}...")
+    records.sort(key=lambda record: record.get("ts", 0))
+    return records
@@ -11,6 +11,8 @@ from api.routes.embedding import embedding_bp
 
 # 중앙화된 API 설정 임포트
 from api.utils.config import get_app_config, log_config_status
+from api.utils.query_log import init_query_log
+from core.nlp import warmup as warmup_nlp
 
 # .env 파일 로드 (앱 시작 시)
 load_dotenv()
@@ -60,6 +62,12 @@ app.register_blueprint(ocr_bp)
 app.register_blueprint(translation_bp) # 번역 Blueprint 등록
 app.register_blueprint(embedding_bp) # 임베딩 Blueprint 등록
 
+# 쿼리 로그 수집 (QUERY_LOG_PATH 설정 시에만 활성화)
+init_query_log(app)
+
+# Okt(JVM)는 첫 요청 지연을 막기 위해 백그라운드에서 미리 초기화
+warmup_nlp(background=True)
+
 if __name__ == "__main__":
     # Flask 개발 서버 실행
     # Blueprint 로딩 시 데이터/모델이 로드됨
@@ -0,0 +1,158 @@
+# -*- coding: utf-8 -*-
+"""
+검색어 자동완성 모듈
+
+OCR 제품명(product_name), 캡션 해시태그, 사용자명을 정규화된 키로 정렬한 배열에 담아 두고,
+접두어 요청은 bisect로 키 범위를 찾은 뒤 빈도(게시물 수) 상위 k개를 돌려줍니다.
+짧은 접두어(PRECOMPUTED_PREFIX_LEN 글자 이하)는 범위가 넓으므로 상위 목록을 미리 계산해 둡니다.
+"""
+
+import bisect
+import logging
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+
+from core.hashtags import extract_hashtags
+
+logger = logging.getLogger(__name__)
+
+# --- 상수 정의 ---
+# 항목 종류
+KIND_PRODUCT = "product"
+KIND_HASHTAG = "hashtag"
+KIND_USERNAME = "username"
+ENTRY_KINDS = (KIND_PRODUCT, KIND_HASHTAG, KIND_USERNAME)
+
+DEFAULT_LIMIT = 10
+MAX_LIMIT = 50
+# 상위 목록을 미리 계산할 접두어 최대 길이
+PRECOMPUTED_PREFIX_LEN = 2
+
+
+def normalize_key(text: str) -> str:
+    """자동완성 키 정규화 (앞의 '#', '@' 제거, 대소문자 무시, 공백 정리)"""
+    return " ".join(str(text).lstrip("#@").casefold().split())
+
+
+class PrefixIndex:
+    """정규화된 키로 정렬된 자동완성 항목 배열"""
+
+    def __init__(self, entries: pd.DataFrame):
+        """
+        초기화
+
+        Args:
+            entries: key, text, kind, weight 컬럼을 가진 DataFrame (key 기준으로 정렬되어 있어야 함)
+        """
+        self.entries = entries.reset_index(drop=True)
+        self.keys = self.entries['key'].tolist()
+        self.texts = self.entries['text'].tolist()
+        self.kinds = self.entries['kind'].tolist()
+        self.weights = self.entries['weight'].to_numpy(dtype=np.int64)
+        self._top = self._precompute_top(MAX_LIMIT)
+
+    @classmethod
+    def build(cls, posts_df: pd.DataFrame, infl_df: pd.DataFrame) -> "PrefixIndex":
+        """
+        게시물/인플루언서 데이터로 항목 생성 (가중치는 해당 값이 등장한 게시물 수)
+
+        Args:
+            posts_df: 게시물 DataFrame (product_name, caption_text/caption, user_pk 컬럼 사용)
+            infl_df: 인플루언서 DataFrame (pk, username 컬럼 사용)
+        """
+        counts = {kind: Counter() for kind in ENTRY_KINDS}
+        display = {}
+
+        def add(kind, text, count=1):
+            key = normalize_key(text)
+            if not key:
+                return
+            counts[kind][key] += count
+            # 같은 키의 여러 표기 중 처음 본 표기를 표시용으로 사용
+            display.setdefault((kind, key), " ".join(str(text).split()))
+
+        if 'product_name' in posts_df.columns:
+            for name, count in posts_df['product_name'].dropna().astype(str).value_counts().items():
+                add(KIND_PRODUCT, name, count)
+
+        caption_col = next((col for col in ('caption_text', 'caption') if col in posts_df.columns), None)
+        if caption_col:
+            for caption in posts_df[caption_col].dropna():
+                for tag in extract_hashtags(caption):
+                    add(KIND_HASHTAG, tag)
+
+        if {'pk', 'username'} <= set(infl_df.columns) and 'user_pk' in posts_df.columns:
+            usernames = infl_df.drop_duplicates(subset=['pk']).set_index('pk')['username']
+            post_counts = posts_df['user_pk'].value_counts()
+            for pk, username in usernames.dropna().items():
+                add(KIND_USERNAME, username, int(post_counts.get(pk, 0)) or 1)
+
+        rows = [
+            (key, display[(kind, key)], kind, weight)
+            for kind, counter in counts.items() for key, weight in counter.items()
+        ]
+        entries = pd.DataFrame(rows, columns=['key', 'text', 'kind', 'weight'])
+        entries = entries.sort_values(['key', 'kind'], kind='stable')
+        logger.info(
+            f"자동완성 항목 생성 완료: {len(entries)}개 "
+            f"({', '.join(f'{kind} {len(counter)}' for kind, counter in counts.items())})"
+        )
+        return cls(entries)
+
+    def _precompute_top(self, k: int) -> dict:
+        """길이 PRECOMPUTED_PREFIX_LEN 이하 접두어별 상위 k개 항목 위치"""
+        candidates = {}
+        for position, key in enumerate(self.keys):
+            for length in range(1, min(PRECOMPUTED_PREFIX_LEN, len(key)) + 1):
+                candidates.setdefault(key[:length], []).append(position)
+        top = {}
+        for prefix, positions in candidates.items():
+            positions = np.asarray(positions, dtype=np.int64)
+            if len(positions) > k:
+                order = np.argsort(-self.weights[positions], kind='stable')[:k]
+                positions = positions[order]
+            else:
+                positions = positions[np.argsort(-self.weights[positions], kind='stable')]
+            top[prefix] = positions
+        return top
+
+    def _range(self, prefix: str) -> tuple[int, int]:
+        lo = bisect.bisect_left(self.keys, prefix)
+        hi = bisect.bisect_left(self.keys, prefix + "\U0010ffff", lo)
+        return lo, hi
+
+    def complete(self, prefix: str, limit: int = DEFAULT_LIMIT, kinds=None) -> list:
+        """
+        접두어로 시작하는 항목 중 가중치 상위 limit개
+
+        Args:
+            prefix: 입력 중인 검색어
+            limit: 반환할 최대 항목 수 (MAX_LIMIT 이하)
+            kinds: 포함할 항목 종류 (None이면 전체)
+
+        Returns:
+            {"text", "kind", "count"} 딕셔너리 목록
+        """
+        key = normalize_key(prefix)
+        if not key:
+            return []
+        limit = max(1, min(limit, MAX_LIMIT))
+
+        positions = self._top.get(key) if kinds is None else None
+        if positions is None:
+            lo, hi = self._range(key)
+            positions = np.arange(lo, hi, dtype=np.int64)
+            if kinds is not None:
+                positions = positions[[self.kinds[p] in kinds for p in positions]] if len(positions) else positions
+            if len(positions) > limit:
+                # 상위 limit개만 부분 정렬
+                top = np.argpartition(-self.weights[positions], limit - 1)[:limit]
+                positions = positions[top]
+            positions = positions[np.argsort(-self.weights[positions], kind='stable')]
+
+        return [
+            {"text": self.texts[p], "kind": self.kinds[p], "count": int(self.weights[p])}
+            for p in positions[:limit]
+        ]
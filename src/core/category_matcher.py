@@ -0,0 +1,302 @@
+# -*- coding: utf-8 -*-
+"""
+카테고리 키워드 매칭 모듈 (Aho-Corasick 다중 패턴 오토마톤)
+
+카테고리 판별 로직(core.nlp, data.utils, data.api)이 카테고리와 키워드를 하나씩 돌며
+`keyword in text`를 반복하던 방식을, 모든 키워드를 하나로 컴파일한 오토마톤으로 대체합니다.
+텍스트를 대소문자 무시(casefold)한 뒤 한 번만 훑어 모든 키워드 적중을 찾고,
+규칙 목록의 순서(앞에 있을수록 우선)로 대표 카테고리를 고릅니다.
+
+매처는 이름으로 등록되며 config.yaml(category_keywords, target_hashtags)이 바뀌면
+다음 조회 시 다시 빌드되어 교체됩니다. 재시작 없이 사전을 바꿀 수 있습니다.
+
+config.yaml 예:
+    category_keywords:
+      뷰티: ["립스틱", "쿠션"]     # 기존 카테고리에 키워드 추가
+      캠핑: ["캠핑", "텐트"]       # 새 카테고리 (가장 낮은 우선순위)
+"""
+
+import os
+import time
+import logging
+import threading
+from collections import deque
+
+import numpy as np
+import pandas as pd
+import yaml
+
+logger = logging.getLogger(__name__)
+
+# --- 상수 정의 ---
+# 카테고리 사전을 읽어올 설정 파일 (작업 디렉토리 기준)
+CATEGORY_CONFIG_PATH = os.getenv("CATEGORY_CONFIG_PATH", "config.yaml")
+# 설정 파일 변경 여부를 확인하는 최소 간격(초)
+CONFIG_CHECK_INTERVAL = 5.0
+
+
+class KeywordAutomaton:
+    """Aho-Corasick 오토마톤 (텍스트 한 번 순회로 모든 키워드 위치 탐색)"""
+
+    def __init__(self, keywords, casefold: bool = True):
+        """
+        초기화
+
+        Args:
+            keywords: 키워드 목록 (순서가 키워드 id)
+            casefold: 키워드와 텍스트를 대소문자 무시하여 비교할지 여부
+        """
+        self.casefold = casefold
+        self.keywords = [self.normalize(keyword) for keyword in keywords]
+
+        # 상태별 전이(goto), 실패 링크, 출력(해당 상태에서 끝나는 키워드 id)
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [()]
+
+        for keyword_id, keyword in enumerate(self.keywords):
+            if not keyword:
+                continue
+            state = 0
+            for ch in keyword:
+                next_state = self._goto[state].get(ch)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][ch] = next_state
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append(())
+                state = next_state
+            self._out[state] += (keyword_id,)
+
+        # 너비 우선으로 실패 링크를 계산하고 실패 상태의 출력을 합침
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[next_state] = self._goto[fail].get(ch, 0)
+                self._out[next_state] += self._out[self._fail[next_state]]
+
+    def normalize(self, text: str) -> str:
+        return text.casefold() if self.casefold else text
+
+    def iter_matches(self, text: str):
+        """(시작 위치, 끝 위치, 키워드 id)를 텍스트 순서대로 생성 (위치는 정규화된 텍스트 기준)"""
+        goto, fail, out = self._goto, self._fail, self._out
+        state = 0
+        for end, ch in enumerate(self.normalize(text), start=1):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for keyword_id in out[state]:
+                yield end - len(self.keywords[keyword_id]), end, keyword_id
+
+
+def _is_ascii_alpha(ch: str) -> bool:
+    return ch.isascii() and ch.isalpha()
+
+
+class CategoryMatcher:
+    """우선순위가 있는 (카테고리, 키워드 목록) 규칙을 하나의 오토마톤으로 컴파일한 매처"""
+
+    def __init__(self, rules, casefold: bool = True, ascii_word_boundary: bool = False):
+        """
+        초기화
+
+        Args:
+            rules: (카테고리, 키워드 목록) 목록. 앞에 있는 규칙이 우선
+            casefold: 대소문자 무시 여부
+            ascii_word_boundary: 영문 키워드가 영문 단어 중간에서 매칭되지 않도록 할지 여부
+                                 (예: "IT"가 "with"에 매칭되는 것 방지)
+        """
+        self.rules = [(category, list(keywords)) for category, keywords in rules]
+        self.categories = [category for category, _ in self.rules]
+        self.ascii_word_boundary = ascii_word_boundary
+
+        # 키워드 -> 가장 높은 우선순위(가장 작은 규칙 번호)
+        priority_of = {}
+        for priority, (_, keywords) in enumerate(self.rules):
+            for keyword in keywords:
+                key = keyword.casefold() if casefold else keyword
+                if key and key not in priority_of:
+                    priority_of[key] = priority
+        self.automaton = KeywordAutomaton(list(priority_of), casefold=casefold)
+        self._priorities = list(priority_of.values())
+        self._priority_of = priority_of
+
+    def _accept(self, text: str, start: int, end: int, keyword_id: int) -> bool:
+        if not self.ascii_word_boundary:
+            return True
+        keyword = self.automaton.keywords[keyword_id]
+        if _is_ascii_alpha(keyword[0]) and start > 0 and _is_ascii_alpha(text[start - 1]):
+            return False
+        if _is_ascii_alpha(keyword[-1]) and end < len(text) and _is_ascii_alpha(text[end]):
+            return False
+        return True
+
+    def hit_priorities(self, text: str, tokens=None) -> set:
+        """텍스트(와 추가 토큰)에서 적중한 규칙 번호 집합"""
+        hits = set()
+        if text:
+            # 경계 검사는 정규화된 텍스트 기준 (casefold로 길이가 바뀌는 문자 대비)
+            normalized = self.automaton.normalize(text)
+            for start, end, keyword_id in self.automaton.iter_matches(text):
+                if self._accept(normalized, start, end, keyword_id):
+                    hits.add(self._priorities[keyword_id])
+        for token in tokens or ():
+            priority = self._priority_of.get(self.automaton.normalize(token))
+            if priority is not None:
+                hits.add(priority)
+        return hits
+
+    def match(self, text: str, tokens=None) -> str | None:
+        """가장 우선순위가 높은 카테고리 (적중이 없으면 None)"""
+        hits = self.hit_priorities(text, tokens)
+        return self.categories[min(hits)] if hits else None
+
+    def match_all(self, text: str, tokens=None) -> list:
+        """적중한 모든 카테고리 (우선순위 순, 중복 제거)"""
+        hits = self.hit_priorities(text, tokens)
+        return list(dict.fromkeys(self.categories[priority] for priority in sorted(hits)))
+
+    def categorize_series(self, series: pd.Series, default=None) -> pd.Series:
+        """
+        pandas 컬럼 전체를 분류 (고유 값마다 한 번만 매칭한 뒤 코드로 펼침)
+
+        Args:
+            series: 텍스트 컬럼
+            default: 적중이 없거나 결측인 행의 값
+
+        Returns:
+            같은 인덱스의 카테고리 Series
+        """
+        codes, uniques = pd.factorize(series)
+        labels = [self.match(value) if isinstance(value, str) else None for value in uniques]
+        # 결측 코드(-1)가 마지막에 덧붙인 기본값을 가리키도록 배열 끝에 default 추가
+        labels = np.array([default if label is None else label for label in labels] + [default], dtype=object)
+        return pd.Series(labels[codes], index=series.index, dtype=object)
+
+
+def merge_rules(rules, overrides) -> list:
+    """
+    기본 규칙에 설정 파일의 키워드를 합침
+
+    기존 카테고리에는 키워드를 덧붙이고(우선순위 유지), 새 카테고리는 맨 뒤에 추가합니다.
+    """
+    merged = [(category, list(keywords)) for category, keywords in rules]
+    positions = {category: i for i, (category, _) in enumerate(merged)}
+    for category, keywords in (overrides or {}).items():
+        if isinstance(keywords, str):
+            keywords = [keywords]
+        keywords = [str(keyword) for keyword in keywords or []]
+        if category in positions:
+            merged[positions[category]][1].extend(keywords)
+        else:
+            positions[category] = len(merged)
+            merged.append((category, keywords))
+    return merged
+
+
+def load_category_config(config_path: str = CATEGORY_CONFIG_PATH) -> dict:
+    """설정 파일을 읽어 반환 (파일이 없거나 읽을 수 없으면 빈 딕셔너리)"""
+    if not os.path.exists(config_path):
+        return {}
+    try:
+        with open(config_path, 'r', encoding='utf-8') as f:
+            return yaml.safe_load(f) or {}
+    except (OSError, yaml.YAMLError) as e:
+        logger.warning(f"카테고리 설정 파일 로드 실패({config_path}): {e}")
+        return {}
+
+
+class CategoryRegistry:
+    """이름별 매처 빌더와 현재 매처를 보관하고, 설정 변경 시 매처를 교체"""
+
+    def __init__(self, config_path: str = CATEGORY_CONFIG_PATH):
+        self.config_path = config_path
+        self._builders = {}
+        self._matchers = {}
+        self._listeners = []
+        self._lock = threading.Lock()
+        self._config = None
+        self._config_mtime = None
+        self._last_check = 0.0
+
+    def register(self, name: str, builder) -> None:
+        """매처 빌더 등록 (builder(config) -> CategoryMatcher)"""
+        with self._lock:
+            self._builders[name] = builder
+            self._matchers.pop(name, None)
+
+    def add_listener(self, callback) -> None:
+        """매처가 교체될 때 호출할 콜백 등록 (예: 파싱 캐시 비우기)"""
+        self._listeners.append(callback)
+
+    def _config_changed(self) -> bool:
+        now = time.monotonic()
+        if self._config is not None and now - self._last_check < CONFIG_CHECK_INTERVAL:
+            return False
+        self._last_check = now
+        try:
+            mtime = os.path.getmtime(self.config_path)
+        except OSError:
+            mtime = None
+        if self._config is not None and mtime == self._config_mtime:
+            return False
+        self._config_mtime = mtime
+        self._config = load_category_config(self.config_path)
+        return True
+
+    def get(self, name: str) -> CategoryMatcher:
+        """현재 매처 반환 (설정 파일이 바뀌었으면 모든 매처를 다시 빌드)"""
+        with self._lock:
+            if self._config_changed() and self._matchers:
+                logger.info(f"카테고리 설정 변경 감지: {self.config_path}, 매처를 다시 빌드합니다.")
+                self._matchers.clear()
+                swapped = True
+            else:
+                swapped = False
+            matcher = self._matchers.get(name)
+            if matcher is None:
+                matcher = self._matchers[name] = self._builders[name](self._config)
+        if swapped:
+            self._notify()
+        return matcher
+
+    def swap(self, name: str, matcher: CategoryMatcher) -> None:
+        """매처를 직접 교체 (설정 파일을 거치지 않고 사전을 바꿀 때)"""
+        with self._lock:
+            self._matchers[name] = matcher
+        self._notify()
+
+    def reload(self) -> None:
+        """설정 파일을 즉시 다시 읽고 모든 매처를 다음 조회 시 다시 빌드"""
+        with self._lock:
+            self._config = None
+            self._matchers.clear()
+        self._notify()
+
+    def _notify(self) -> None:
+        for callback in self._listeners:
+            try:
+                callback()
+            except Exception as e:
+                logger.warning(f"카테고리 매처 교체 콜백 오류: {e}")
+
+
+# 프로세스 전역 레지스트리
+registry = CategoryRegistry()
+
+
+def get_matcher(name: str) -> CategoryMatcher:
+    """등록된 이름의 현재 매처"""
+    return registry.get(name)
+
+
+def reload_categories() -> None:
+    """카테고리 사전 다시 읽기 (재시작 없이 교체)"""
+    registry.reload()
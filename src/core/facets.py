@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+"""
+검색 결과 패싯(facet) 카운트 모듈
+
+게시물 행 순서에 맞춘 비트맵을 패싯 값마다 미리 만들어 두고,
+요청 시에는 후보 집합 비트맵과 AND 연산 후 popcount 하여 카운트를 계산합니다.
+결과 DataFrame에 groupby를 돌리는 것보다 훨씬 적은 비용으로 카운트를 얻을 수 있습니다.
+"""
+
+import logging
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# --- 상수 정의 ---
+# 지원하는 패싯 필드
+FACET_FIELDS = ("category", "follower_bucket", "is_verified")
+
+# 팔로워 구간 (하한 이상 ~ 다음 구간 하한 미만)
+FOLLOWER_BUCKETS = [
+    (0, "1천 미만"),
+    (1_000, "1천~1만"),
+    (10_000, "1만~10만"),
+    (100_000, "10만~100만"),
+    (1_000_000, "100만 이상"),
+]
+
+# 참/거짓으로 간주할 문자열 (CSV -> SQLite 적재 과정에서 문자열로 바뀌는 경우 대비)
+TRUE_VALUES = {"true", "1", "1.0", "yes"}
+
+
+def follower_bucket_labels(follower_counts) -> np.ndarray:
+    """팔로워 수 배열을 FOLLOWER_BUCKETS 구간 라벨 배열로 변환 (결측치는 None)"""
+    counts = pd.to_numeric(pd.Series(follower_counts), errors='coerce').to_numpy()
+    bounds = np.array([bound for bound, _ in FOLLOWER_BUCKETS[1:]])
+    labels = np.array([label for _, label in FOLLOWER_BUCKETS], dtype=object)
+
+    result = labels[np.digitize(np.nan_to_num(counts, nan=0), bounds)]
+    result[np.isnan(counts)] = None
+    return result
+
+
+def to_bool_labels(values) -> np.ndarray:
+    """불리언 성격의 컬럼을 'true'/'false' 라벨 배열로 정규화 (결측치는 None)"""
+    series = pd.Series(values)
+    labels = np.where(
+        series.astype(str).str.strip().str.lower().isin(TRUE_VALUES),
+        "true", "false"
+    ).astype(object)
+    labels[series.isna().to_numpy()] = None
+    return labels
+
+
+class FacetIndex:
+    """게시물 행 단위의 패싯 값별 비트맵 인덱스"""
+
+    def __init__(self, n_rows: int):
+        self.n_rows = n_rows
+        # {필드명: {값: packbits 비트맵(uint8 배열)}}
+        self.bitmaps = {}
+
+    @classmethod
+    def build(cls, posts_df: pd.DataFrame, infl_df: pd.DataFrame) -> "FacetIndex":
+        """
+        게시물 DataFrame 행 순서 기준으로 인플루언서 속성 패싯 비트맵 생성
+
+        Args:
+            posts_df: 게시물 DataFrame (user_pk 컬럼 필요)
+            infl_df: 인플루언서 DataFrame (pk 컬럼 필요)
+        """
+        index = cls(len(posts_df))
+        if posts_df.empty or infl_df.empty:
+            return index
+
+        # 게시물마다 작성자 속성을 붙임 (작성자 정보가 없는 게시물은 NaN)
+        user_attrs = infl_df.drop_duplicates(subset=['pk']).set_index('pk')
+        per_post = user_attrs.reindex(posts_df['user_pk'].to_numpy())
+
+        if 'category' in per_post.columns:
+            index.add_field("category", per_post['category'].to_numpy(dtype=object))
+        if 'follower_count' in per_post.columns:
+            index.add_field("follower_bucket", follower_bucket_labels(per_post['follower_count']))
+        if 'is_verified' in per_post.columns:
+            index.add_field("is_verified", to_bool_labels(per_post['is_verified']))
+
+        logger.info(
+            "패싯 비트맵 생성 완료: "
+            + ", ".join(f"{field}({len(values)}개 값)" for field, values in index.bitmaps.items())
+        )
+        return index
+
+    def add_field(self, field: str, values: np.ndarray) -> None:
+        """행별 값 배열로부터 값마다 비트맵을 생성하여 등록"""
+        codes, uniques = pd.factorize(pd.Series(values, dtype=object))
+        field_bitmaps = {}
+        for code, value in enumerate(uniques):
+            # 결측치(None/NaN)는 factorize에서 -1로 분리되므로 빈 문자열만 제외
+            if value == "":
+                continue
+            field_bitmaps[str(value)] = np.packbits(codes == code)
+        self.bitmaps[field] = field_bitmaps
+
+    def candidate_bitmap(self, candidate_mask: np.ndarray) -> np.ndarray:
+        """게시물 행 길이의 불리언 후보 마스크를 비트맵으로 변환"""
+        return np.packbits(np.asarray(candidate_mask, dtype=bool))
+
+    def counts(self, candidate: np.ndarray, fields) -> dict:
+        """
+        후보 비트맵과 각 패싯 값 비트맵의 교집합 크기 계산
+
+        Args:
+            candidate: candidate_bitmap()으로 만든 후보 비트맵
+            fields: 카운트할 패싯 필드 목록
+
+        Returns:
+            {필드명: {값: 개수}} (개수 내림차순, 0건 값은 제외)
+        """
+        result = {}
+        for field in fields:
+            field_counts = {}
+            for value, bitmap in self.bitmaps.get(field, {}).items():
+                count = int(np.bitwise_count(bitmap & candidate).sum())
+                if count > 0:
+                    field_counts[value] = count
+            result[field] = dict(sorted(field_counts.items(), key=lambda item: -item[1]))
+        return result
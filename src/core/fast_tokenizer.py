@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+"""
+JVM 없이 짧은 쿼리를 분석하는 빠른 경로(fast path) 토크나이저
+
+검색 쿼리는 대부분 1~3개 단어인데도 매번 Okt(JVM) 호출 비용을 냅니다.
+카테고리 키워드, 불용어, 알려진 제품명으로 만든 사전과 공백/문자 체계(한글, 영문, 숫자)
+경계만으로 쿼리를 Okt.pos와 같은 (단어, 품사) 목록으로 나눕니다.
+사전으로 설명되지 않는 한글 조각이 하나라도 있거나, 불용어로만 이루어진 구(phrase)가 생기면
+판단을 포기(None)하고 호출 측(core.nlp)이 Okt로 분석하도록 합니다.
+"""
+
+import re
+
+# 빠른 경로로 처리할 최대 어절(공백 단위) 수
+FAST_PATH_MAX_WORDS = 3
+
+# 사전 단어 뒤에 붙어도 판단할 수 있는 조사 (긴 것부터 검사)
+JOSA = sorted(
+    {"으로", "에서", "에게", "까지", "부터", "처럼", "이랑", "을", "를", "이", "가", "은", "는",
+     "의", "에", "로", "도", "만", "랑", "과", "와"},
+    key=len, reverse=True
+)
+
+# 구(phrase)를 이루는 품사 태그 (core.nlp.PHRASE_TAGS와 동일)
+PHRASE_TAGS = {"Noun", "Number", "Alpha"}
+
+# 문자 체계 경계로 나누는 패턴: 한글 / 영문 / 숫자 / 그 외 기호
+_SEGMENT_PATTERN = re.compile(r"[가-힣]+|[A-Za-z]+|\d+(?:\.\d+)?|[^\s가-힣A-Za-z\d]+")
+
+
+class FastTokenizer:
+    """사전 기반 쿼리 토크나이저 (판단할 수 없으면 None을 반환하여 Okt로 대체)"""
+
+    def __init__(self, nouns=(), verbs=(), stop_words=(), max_words: int = FAST_PATH_MAX_WORDS):
+        """
+        초기화
+
+        Args:
+            nouns: 명사로 취급할 단어 (카테고리 키워드, 명사형 불용어, 제품명)
+            verbs: 동사로 취급할 단어 (예: "알려줘", "주세요")
+            stop_words: 제품명 후보에서 빠지는 단어 (불용어, 카테고리 키워드)
+            max_words: 빠른 경로로 처리할 최대 어절 수
+        """
+        self.tags = {}
+        for word in nouns:
+            if word:
+                self.tags.setdefault(word, "Noun")
+        for word in verbs:
+            if word:
+                self.tags[word] = "Verb"
+        self.stop_words = frozenset(stop_words)
+        self.max_words = max_words
+        self.max_len = max((len(word) for word in self.tags), default=0)
+
+    def _split_hangul(self, segment: str) -> list | None:
+        """한글 조각을 사전 단어(+조사)로 완전히 덮을 수 있으면 (단어, 품사) 목록, 아니면 None"""
+        if segment in self.tags:
+            return [(segment, self.tags[segment])]
+        for josa in JOSA:
+            stem = segment[:-len(josa)]
+            if segment.endswith(josa) and stem in self.tags:
+                return [(stem, self.tags[stem]), (josa, "Josa")]
+
+        # 가장 긴 사전 단어부터 앞에서부터 나눔 (예: "제주도숙소" -> "제주도" + "숙소")
+        tokens = []
+        pos = 0
+        while pos < len(segment):
+            for end in range(min(len(segment), pos + self.max_len), pos, -1):
+                word = segment[pos:end]
+                if word in self.tags:
+                    tokens.append((word, self.tags[word]))
+                    pos = end
+                    break
+            else:
+                return None
+        return tokens
+
+    def _has_stop_word_phrase(self, tokens: list) -> bool:
+        """연속된 구 품사 토큰(2개 이상)이 모두 불용어인 구가 있는지 (Okt와 구 경계가 달라 결과가 어긋날 수 있음)"""
+        run = 0
+        for word, tag in tokens + [("", "")]:
+            if tag in PHRASE_TAGS and word in self.stop_words:
+                run += 1
+                continue
+            if run >= 2:
+                return True
+            run = 0
+        return False
+
+    def pos(self, text: str) -> list | None:
+        """
+        Okt.pos와 같은 형식의 (단어, 품사) 목록 반환
+
+        Returns:
+            어절 수가 max_words를 넘거나, 사전으로 설명되지 않는 한글 조각이 있거나,
+            불용어로만 이루어진 구가 있으면 None
+        """
+        if not text or len(text.split()) > self.max_words:
+            return None
+        result = []
+        for match in _SEGMENT_PATTERN.finditer(text):
+            segment = match.group()
+            if segment[0].isdigit():
+                result.append((segment, "Number"))
+            elif segment.isascii() and segment.isalpha():
+                result.append((segment, "Alpha"))
+            elif "가" <= segment[0] <= "힣":
+                tokens = self._split_hangul(segment)
+                if tokens is None:
+                    return None
+                result.extend(tokens)
+            else:
+                result.append((segment, "Punctuation"))
+        if self._has_stop_word_phrase(result):
+            return None
+        return result
@@ -0,0 +1,176 @@
+# -*- coding: utf-8 -*-
+"""
+OCR 제품명 오타 허용 검색(트라이그램 인덱스) 모듈
+
+OCR로 추출한 product_name은 글자가 빠지거나 바뀐 경우가 많아 부분 문자열 일치만으로는
+놓치는 게시물이 생깁니다. 정규화한 고유 제품명마다 글자 3-gram을 뽑아 역색인을 만들고,
+검색 시에는 쿼리 3-gram의 포스팅 리스트만 모아 제품명별 공통 3-gram 수를 셉니다.
+전체 제품명을 훑지 않으므로 제품명 수에 비해 준선형 시간에 후보를 찾습니다.
+
+점수는 쿼리 3-gram 중 제품명에 포함된 비율(pg_trgm의 word_similarity와 유사)이며,
+짧은 쿼리가 긴 제품명의 일부와 비슷한 경우도 찾을 수 있습니다.
+"""
+
+import re
+import logging
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+logger = logging.getLogger(__name__)
+
+# --- 상수 정의 ---
+NGRAM_SIZE = 3
+# 기본 최소 점수 (쿼리 3-gram 중 제품명에 있어야 하는 비율)
+DEFAULT_MIN_SCORE = 0.6
+# 한 번에 반환할 최대 제품명 후보 수
+DEFAULT_MAX_CANDIDATES = 200
+
+# 정규화 시 제거할 문자 (공백, 구두점 등 문자/숫자가 아닌 것)
+_NON_WORD_PATTERN = re.compile(r"[\W_]+")
+
+
+def normalize_name(text) -> str:
+    """제품명 정규화 (대소문자 무시, 공백/기호 제거)"""
+    if not isinstance(text, str):
+        return ""
+    return _NON_WORD_PATTERN.sub("", text.casefold())
+
+
+def ngrams(text: str, pad_end: bool = True) -> set:
+    """
+    정규화된 문자열의 3-gram 집합 (앞뒤에 경계 표시를 붙여 짧은 문자열도 처리)
+
+    쿼리는 입력 중인 제품명의 앞부분일 수 있으므로 pad_end=False로 끝 경계 3-gram을 만들지 않습니다.
+    """
+    if not text:
+        return set()
+    padded = f"\x02{text}\x03" if pad_end else f"\x02{text}"
+    if len(padded) <= NGRAM_SIZE:
+        return {padded}
+    return {padded[i:i + NGRAM_SIZE] for i in range(len(padded) - NGRAM_SIZE + 1)}
+
+
+class TrigramIndex:
+    """고유 제품명 3-gram 역색인 + 제품명 -> 게시물 행 매핑 (CSR 배열)"""
+
+    def __init__(self, names, name_offsets, name_rows, name_gram_counts, grams, gram_offsets, gram_postings):
+        """
+        초기화
+
+        Args:
+            names: 정규화된 고유 제품명 목록
+            name_offsets, name_rows: 제품명 i의 게시물 행 = name_rows[name_offsets[i]:name_offsets[i+1]]
+            name_gram_counts: 제품명별 3-gram 수
+            grams: 3-gram 목록
+            gram_offsets, gram_postings: 3-gram j를 가진 제품명 = gram_postings[gram_offsets[j]:gram_offsets[j+1]]
+        """
+        self.names = names
+        self.name_offsets = name_offsets
+        self.name_rows = name_rows
+        self.name_gram_counts = name_gram_counts
+        self.grams = grams
+        self.gram_offsets = gram_offsets
+        self.gram_postings = gram_postings
+        self._gram_ids = {gram: i for i, gram in enumerate(grams)}
+
+    @classmethod
+    def build(cls, posts_df: pd.DataFrame, column: str = 'product_name') -> "TrigramIndex":
+        """게시물 DataFrame의 제품명 컬럼으로 인덱스 생성"""
+        if column not in posts_df.columns or posts_df.empty:
+            normalized = pd.Series([], dtype=object)
+        else:
+            normalized = posts_df[column].map(normalize_name)
+
+        # 제품명별 게시물 행 (CSR)
+        codes, names = pd.factorize(normalized.where(normalized != ""))
+        rows = np.flatnonzero(codes >= 0).astype(np.int64)
+        order = np.argsort(codes[rows], kind='stable')
+        name_rows = rows[order]
+        name_offsets = np.concatenate([[0], np.cumsum(np.bincount(codes[rows], minlength=len(names)))]).astype(np.int64)
+
+        # 3-gram -> 제품명 포스팅 리스트
+        postings = {}
+        name_gram_counts = np.zeros(len(names), dtype=np.int32)
+        for name_id, name in enumerate(names):
+            name_grams = ngrams(name)
+            name_gram_counts[name_id] = len(name_grams)
+            for gram in name_grams:
+                postings.setdefault(gram, []).append(name_id)
+        grams = sorted(postings)
+        gram_offsets = np.zeros(len(grams) + 1, dtype=np.int64)
+        gram_offsets[1:] = np.cumsum([len(postings[gram]) for gram in grams])
+        gram_postings = np.fromiter(
+            (name_id for gram in grams for name_id in postings[gram]), dtype=np.int32, count=int(gram_offsets[-1])
+        )
+
+        logger.info(f"제품명 트라이그램 인덱스 생성 완료: 고유 제품명 {len(names)}개, 3-gram {len(grams)}개")
+        return cls(list(names), name_offsets, name_rows, name_gram_counts, grams, gram_offsets, gram_postings)
+
+    def to_tables(self) -> tuple[pa.Table, pa.Table]:
+        """스냅샷 저장용 Arrow 테이블 (리스트 컬럼의 offsets/values가 CSR 배열과 동일)"""
+        names_table = pa.table({
+            "name": pa.array(self.names, type=pa.string()),
+            "rows": pa.ListArray.from_arrays(pa.array(self.name_offsets, type=pa.int32()), pa.array(self.name_rows)),
+            "gram_count": pa.array(self.name_gram_counts),
+        })
+        grams_table = pa.table({
+            "gram": pa.array(self.grams, type=pa.string()),
+            "names": pa.ListArray.from_arrays(pa.array(self.gram_offsets, type=pa.int32()), pa.array(self.gram_postings)),
+        })
+        return names_table, grams_table
+
+    @classmethod
+    def from_tables(cls, names_table: pa.Table, grams_table: pa.Table) -> "TrigramIndex":
+        """to_tables로 저장한 테이블에서 복원 (리스트 컬럼의 버퍼를 복사 없이 사용)"""
+        def csr(table, column):
+            array = table.column(column).combine_chunks()
+            return array.offsets.to_numpy().astype(np.int64), array.values.to_numpy()
+
+        name_offsets, name_rows = csr(names_table, "rows")
+        gram_offsets, gram_postings = csr(grams_table, "names")
+        return cls(
+            names_table.column("name").to_pylist(), name_offsets, name_rows.astype(np.int64, copy=False),
+            names_table.column("gram_count").to_numpy(), grams_table.column("gram").to_pylist(),
+            gram_offsets, gram_postings
+        )
+
+    def search(self, query: str, min_score: float = DEFAULT_MIN_SCORE,
+               max_candidates: int = DEFAULT_MAX_CANDIDATES) -> list:
+        """
+        쿼리와 비슷한 제품명 후보
+
+        Returns:
+            (제품명 id, 점수) 목록 (점수 내림차순). 점수는 쿼리 3-gram 중 제품명에 있는 비율
+        """
+        query_grams = ngrams(normalize_name(query), pad_end=False)
+        gram_ids = [self._gram_ids[gram] for gram in query_grams if gram in self._gram_ids]
+        if not gram_ids:
+            return []
+
+        postings = np.concatenate([
+            self.gram_postings[self.gram_offsets[g]:self.gram_offsets[g + 1]] for g in gram_ids
+        ])
+        name_ids, overlaps = np.unique(postings, return_counts=True)
+        scores = overlaps / len(query_grams)
+        keep = scores >= min_score
+        name_ids, scores = name_ids[keep], scores[keep]
+        # 점수가 같으면 쿼리와 길이가 비슷한(3-gram 수 차이가 적은) 제품명을 앞에 둠
+        length_gap = np.abs(self.name_gram_counts[name_ids] - len(query_grams))
+        order = np.lexsort((length_gap, -scores))[:max_candidates]
+        return [(int(name_ids[i]), float(scores[i])) for i in order]
+
+    def rows_for(self, query: str, min_score: float = DEFAULT_MIN_SCORE) -> tuple[np.ndarray, np.ndarray]:
+        """
+        쿼리와 비슷한 제품명을 가진 게시물 행
+
+        Returns:
+            (게시물 행 위치 배열, 각 행의 점수 배열)
+        """
+        matches = self.search(query, min_score)
+        if not matches:
+            return np.array([], dtype=np.int64), np.array([], dtype=np.float64)
+        rows = [self.name_rows[self.name_offsets[i]:self.name_offsets[i + 1]] for i, _ in matches]
+        scores = [np.full(len(r), score) for r, (_, score) in zip(rows, matches)]
+        return np.concatenate(rows), np.concatenate(scores)
@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+"""
+캡션 해시태그 추출 및 해시태그 역색인 모듈
+
+해시태그 필터를 요청마다 모든 캡션에 정규식으로 검사하지 않도록,
+로딩 시점에 해시태그별 게시물 행 포스팅 리스트를 만들어 두고
+필터(포스팅 리스트 교집합)와 동시 출현 집계를 배열 연산으로 처리합니다.
+"""
+
+import re
+import logging
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+logger = logging.getLogger(__name__)
+
+# 인스타그램 해시태그: '#' 뒤의 문자/숫자/밑줄 (한글 포함)
+HASHTAG_PATTERN = re.compile(r"#(\w+)")
+
+
+def normalize_hashtag(tag: str) -> str:
+    """해시태그 정규화 ('#' 제거, 대소문자 무시)"""
+    return tag.lstrip("#").strip().casefold()
+
+
+def extract_hashtags(text) -> list:
+    """캡션에서 정규화된 해시태그 목록 추출 (등장 순서, 중복 제거)"""
+    if not isinstance(text, str) or "#" not in text:
+        return []
+    return list(dict.fromkeys(normalize_hashtag(tag) for tag in HASHTAG_PATTERN.findall(text)))
+
+
+class HashtagIndex:
+    """해시태그 -> 게시물 행 포스팅 리스트 (CSR 배열) + 게시물 행 -> 해시태그 역방향 목록"""
+
+    def __init__(self, n_rows: int, tags, tag_offsets, tag_rows):
+        """
+        초기화
+
+        Args:
+            n_rows: 게시물 행 수
+            tags: 정렬된 해시태그 목록
+            tag_offsets, tag_rows: 해시태그 i의 게시물 행 = tag_rows[tag_offsets[i]:tag_offsets[i+1]] (오름차순)
+        """
+        self.n_rows = n_rows
+        self.tags = tags
+        self.tag_offsets = tag_offsets
+        self.tag_rows = tag_rows
+        self._tag_ids = {tag: i for i, tag in enumerate(tags)}
+
+        # 동시 출현 계산용 역방향 목록: 게시물 행 순으로 정렬한 (행, 해시태그 id)
+        tag_ids = np.repeat(np.arange(len(tags), dtype=np.int32), np.diff(tag_offsets))
+        order = np.argsort(tag_rows, kind='stable')
+        self._row_tags = tag_ids[order]
+        self._row_offsets = np.searchsorted(tag_rows[order], np.arange(n_rows + 1))
+
+    @classmethod
+    def from_pairs(cls, n_rows: int, rows, tags) -> "HashtagIndex":
+        """(게시물 행, 정규화된 해시태그) 쌍으로 인덱스 생성"""
+        pairs = pd.DataFrame({"row": np.asarray(rows, dtype=np.int64), "tag": list(tags)})
+        pairs = pairs.drop_duplicates().sort_values(["tag", "row"], kind='stable')
+        codes, uniques = pd.factorize(pairs["tag"], sort=True)
+        tag_offsets = np.zeros(len(uniques) + 1, dtype=np.int64)
+        tag_offsets[1:] = np.cumsum(np.bincount(codes, minlength=len(uniques)))
+        return cls(n_rows, list(uniques), tag_offsets, pairs["row"].to_numpy(dtype=np.int64))
+
+    @classmethod
+    def build(cls, posts_df: pd.DataFrame) -> "HashtagIndex":
+        """게시물 캡션에서 해시태그를 추출하여 인덱스 생성"""
+        caption_col = next((col for col in ('caption_text', 'caption') if col in posts_df.columns), None)
+        rows, tags = [], []
+        if caption_col:
+            for row, caption in enumerate(posts_df[caption_col].to_numpy()):
+                for tag in extract_hashtags(caption):
+                    rows.append(row)
+                    tags.append(tag)
+        index = cls.from_pairs(len(posts_df), rows, tags)
+        logger.info(f"해시태그 인덱스 생성 완료: 해시태그 {len(index.tags)}개, 게시물-해시태그 {len(index.tag_rows)}쌍")
+        return index
+
+    def to_table(self) -> pa.Table:
+        """스냅샷 저장용 Arrow 테이블 (리스트 컬럼의 offsets/values가 CSR 배열과 동일)"""
+        return pa.table({
+            "tag": pa.array(self.tags, type=pa.string()),
+            "rows": pa.ListArray.from_arrays(pa.array(self.tag_offsets, type=pa.int32()), pa.array(self.tag_rows)),
+        })
+
+    @classmethod
+    def from_table(cls, n_rows: int, table: pa.Table) -> "HashtagIndex":
+        """to_table로 저장한 테이블에서 복원"""
+        rows = table.column("rows").combine_chunks()
+        return cls(
+            n_rows, table.column("tag").to_pylist(),
+            rows.offsets.to_numpy().astype(np.int64), rows.values.to_numpy().astype(np.int64, copy=False)
+        )
+
+    def rows(self, tag: str) -> np.ndarray:
+        """해시태그가 달린 게시물 행 (오름차순)"""
+        tag_id = self._tag_ids.get(normalize_hashtag(tag))
+        if tag_id is None:
+            return np.array([], dtype=np.int64)
+        return self.tag_rows[self.tag_offsets[tag_id]:self.tag_offsets[tag_id + 1]]
+
+    def mask(self, tags) -> np.ndarray:
+        """모든 해시태그가 달린 게시물 행 마스크 (포스팅 리스트 교집합)"""
+        mask = np.ones(self.n_rows, dtype=bool)
+        for tag in tags:
+            tag_mask = np.zeros(self.n_rows, dtype=bool)
+            tag_mask[self.rows(tag)] = True
+            mask &= tag_mask
+        return mask
+
+    def counts(self, candidate_mask=None, limit: int = 20, exclude=()) -> dict:
+        """
+        후보 게시물에 달린 해시태그별 게시물 수 (상위 limit개)
+
+        Args:
+            candidate_mask: 게시물 행 마스크 (None이면 전체)
+            limit: 반환할 최대 해시태그 수
+            exclude: 결과에서 뺄 해시태그 (예: 기준 해시태그 자신)
+        """
+        if candidate_mask is None:
+            tag_ids = self._row_tags
+        else:
+            rows = np.flatnonzero(candidate_mask)
+            starts, ends = self._row_offsets[rows], self._row_offsets[rows + 1]
+            lengths = ends - starts
+            # 후보 행들의 역방향 목록 구간을 한 번에 이어 붙임
+            positions = np.repeat(starts - np.cumsum(lengths) + lengths, lengths) + np.arange(lengths.sum())
+            tag_ids = self._row_tags[positions]
+        counts = np.bincount(tag_ids, minlength=len(self.tags))
+        for tag in exclude:
+            tag_id = self._tag_ids.get(normalize_hashtag(tag))
+            if tag_id is not None:
+                counts[tag_id] = 0
+        top = np.flatnonzero(counts)
+        top = top[np.argsort(-counts[top], kind='stable')][:limit]
+        return {self.tags[i]: int(counts[i]) for i in top}
+
+    def cooccurrence(self, tags, limit: int = 20) -> dict:
+        """주어진 해시태그가 모두 달린 게시물에 함께 달린 해시태그별 게시물 수"""
+        return self.counts(self.mask(tags), limit, exclude=tags)
@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+"""
+캡션 근사 중복 탐지 모듈 (MinHash + LSH)
+
+판매자가 같은 홍보 캡션을 여러 게시물에 반복해서 올리면 게시물마다 OCR과 임베딩 API를
+따로 호출하게 됩니다. 정규화한 캡션의 글자 n-gram 집합으로 MinHash 서명을 만들고,
+서명을 밴드로 나눠 같은 버킷에 들어간 게시물만 비교(LSH)하여 전체 쌍을 비교하지 않고
+거의 선형 시간에 근사 중복 그룹을 찾습니다.
+"""
+
+import re
+import zlib
+import logging
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# --- 상수 정의 ---
+SHINGLE_SIZE = 5           # 글자 n-gram 길이
+NUM_PERMUTATIONS = 128     # MinHash 서명 길이
+LSH_BANDS = 16             # 밴드 수 (밴드당 행 수 = NUM_PERMUTATIONS / LSH_BANDS)
+DEFAULT_THRESHOLD = 0.8    # 같은 그룹으로 묶을 최소 추정 자카드 유사도
+MIN_CAPTION_LENGTH = 20    # 이보다 짧은 캡션은 중복 판정에서 제외 (짧은 문구는 우연히 같기 쉬움)
+HASH_SEED = 42
+
+# 범용 해시 (a*x + b) mod p, x는 32비트 해시이므로 p는 2^32보다 큰 소수
+_MERSENNE_PRIME = np.uint64(4294967311)
+
+_WHITESPACE_PATTERN = re.compile(r"\s+")
+
+
+def normalize_caption(text) -> str:
+    """캡션 정규화 (대소문자 무시, 공백 제거)"""
+    if not isinstance(text, str):
+        return ""
+    return _WHITESPACE_PATTERN.sub("", text.casefold())
+
+
+def _permutations(num_perm: int, seed: int) -> tuple[np.ndarray, np.ndarray]:
+    rng = np.random.default_rng(seed)
+    # a*x가 uint64를 넘지 않도록 a < 2^31
+    a = rng.integers(1, 2**31, size=num_perm, dtype=np.uint64)
+    b = rng.integers(0, 2**32, size=num_perm, dtype=np.uint64)
+    return a, b
+
+
+def minhash_signatures(texts, num_perm: int = NUM_PERMUTATIONS, seed: int = HASH_SEED) -> tuple[np.ndarray, np.ndarray]:
+    """
+    텍스트별 MinHash 서명 계산
+
+    Returns:
+        (서명 행렬 (문서 수, num_perm) uint64, 서명이 유효한(충분히 긴) 문서 마스크)
+    """
+    a, b = _permutations(num_perm, seed)
+    signatures = np.full((len(texts), num_perm), np.iinfo(np.uint64).max, dtype=np.uint64)
+    valid = np.zeros(len(texts), dtype=bool)
+    for i, text in enumerate(texts):
+        text = normalize_caption(text)
+        if len(text) < MIN_CAPTION_LENGTH:
+            continue
+        # 프로세스마다 값이 달라지는 hash() 대신 crc32로 n-gram을 32비트 정수로 변환
+        shingles = np.fromiter(
+            {zlib.crc32(text[j:j + SHINGLE_SIZE].encode('utf-8')) for j in range(len(text) - SHINGLE_SIZE + 1)},
+            dtype=np.uint64
+        )
+        hashed = (np.outer(a, shingles) + b[:, None]) % _MERSENNE_PRIME
+        signatures[i] = hashed.min(axis=1)
+        valid[i] = True
+    return signatures, valid
+
+
+def lsh_groups(signatures: np.ndarray, valid: np.ndarray, bands: int = LSH_BANDS,
+               threshold: float = DEFAULT_THRESHOLD) -> np.ndarray:
+    """
+    LSH 밴딩으로 근사 중복 그룹 찾기
+
+    같은 밴드 버킷에 들어간 문서는 버킷의 첫 문서와 서명 일치율(추정 자카드 유사도)을 확인한 뒤
+    threshold 이상이면 합칩니다(union-find).
+
+    Returns:
+        문서별 그룹 대표(그룹에서 가장 앞선 문서 위치) 배열. 중복이 없는 문서는 자기 자신
+    """
+    n_docs, num_perm = signatures.shape
+    rows_per_band = num_perm // bands
+    parent = np.arange(n_docs)
+
+    def find(x):
+        root = x
+        while parent[root] != root:
+            root = parent[root]
+        while parent[x] != root:
+            parent[x], x = root, parent[x]
+        return root
+
+    doc_ids = np.flatnonzero(valid)
+    for band in range(bands):
+        band_slice = signatures[:, band * rows_per_band:(band + 1) * rows_per_band]
+        buckets = {}
+        for doc in doc_ids:
+            key = band_slice[doc].tobytes()
+            first = buckets.setdefault(key, doc)
+            if first == doc:
+                continue
+            root_first, root_doc = find(first), find(doc)
+            if root_first == root_doc:
+                continue
+            if np.mean(signatures[first] == signatures[doc]) >= threshold:
+                # 그룹 대표는 항상 더 앞선 문서
+                parent[max(root_first, root_doc)] = min(root_first, root_doc)
+
+    return np.array([find(doc) for doc in range(n_docs)], dtype=np.int64)
+
+
+def find_near_duplicates(texts, threshold: float = DEFAULT_THRESHOLD) -> np.ndarray:
+    """텍스트 목록의 근사 중복 그룹 대표 위치 배열 (minhash_signatures + lsh_groups)"""
+    texts = list(texts)
+    signatures, valid = minhash_signatures(texts)
+    representatives = lsh_groups(signatures, valid, threshold=threshold)
+    n_grouped = int(np.sum(representatives != np.arange(len(texts))))
+    logger.info(
+        f"근사 중복 탐지 완료: {len(texts)}건 중 {n_grouped}건이 다른 게시물과 중복 "
+        f"(그룹 {len(np.unique(representatives[representatives != np.arange(len(texts))]))}개)"
+    )
+    return representatives
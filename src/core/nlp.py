@@ -1,9 +1,77 @@
 # -*- coding: utf-8 -*-
 import re
-from konlpy.tag import Okt
+import time
+import logging
+import threading
+from collections import Counter, OrderedDict
 
-# --- Okt 형태소 분석기 초기화 ---
-okt = Okt()
+from core.category_matcher import CategoryMatcher, merge_rules, registry as category_registry
+from core.fast_tokenizer import FastTokenizer
+
+logger = logging.getLogger(__name__)
+
+# --- Okt 형태소 분석기 (지연 초기화) ---
+# Okt()는 JPype로 JVM을 기동하므로 수 초가 걸립니다. 모듈 임포트 시점이 아니라
+# 처음 사용할 때(또는 warmup() 호출 시) 한 번만 생성하여 프로세스 전체에서 공유합니다.
+_okt = None
+_okt_lock = threading.Lock()
+
+
+def _attach_current_thread() -> None:
+    """현재 스레드를 JVM에 연결 (Flask 워커 스레드 등 JVM을 만들지 않은 스레드 대비)"""
+    import jpype
+    if not jpype.isJVMStarted():
+        return
+    thread = jpype.java.lang.Thread
+    if not thread.isAttached():
+        thread.attach()
+
+
+def get_okt():
+    """공유 Okt 인스턴스 반환 (최초 호출 시 스레드 안전하게 생성)"""
+    global _okt
+    if _okt is None:
+        with _okt_lock:
+            # 락을 기다리는 동안 다른 스레드가 이미 생성했을 수 있음
+            if _okt is None:
+                start = time.perf_counter()
+                from konlpy.tag import Okt
+                _okt = Okt()
+                logger.info(f"Okt 형태소 분석기 초기화 완료 ({time.perf_counter() - start:.2f}초)")
+    _attach_current_thread()
+    return _okt
+
+
+def warmup(background: bool = False):
+    """
+    Okt(JVM) 사전 초기화 훅
+
+    Args:
+        background: True이면 데몬 스레드에서 초기화하고 스레드를 반환
+
+    Returns:
+        background=True이면 초기화 스레드, 아니면 None
+    """
+    def _warmup():
+        try:
+            # 첫 분석 호출의 클래스 로딩 비용까지 미리 지불
+            get_okt().nouns("워밍업")
+        except Exception as e:
+            logger.error(f"Okt 워밍업 실패: {e}", exc_info=True)
+
+    if not background:
+        _warmup()
+        return None
+    thread = threading.Thread(target=_warmup, name="okt-warmup", daemon=True)
+    thread.start()
+    return thread
+
+
+def __getattr__(name):
+    # 기존 `from core.nlp import okt` 사용처 호환 (접근 시점에 초기화)
+    if name == "okt":
+        return get_okt()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # --- 상수 정의 ---
 # 카테고리 사전 정의 (기존 유지)
@@ -29,38 +97,358 @@ BASE_STOP_WORDS = {
     "남자", "여자", "요즘", "게임", "정보", "후기", "가격"
 }
 
+# 불용어 중 동사로 취급할 단어 (빠른 경로 토크나이저용, 나머지 불용어는 명사로 취급)
+VERB_STOP_WORDS = {"주세요", "알려줘", "찾아줘"}
+
+# 짧은 쿼리를 사전만으로 분석하고 판단할 수 없을 때만 Okt를 호출할지 여부
+FAST_PATH_ENABLED = True
+
+# 구(phrase)를 이루는 품사 태그 (Okt.pos 기준)
+PHRASE_TAGS = {"Noun", "Number", "Alpha"}
+
+# 빠른 경로 사전에 넣을 제품명 조건 (OCR 잡음이 사전 단어가 되지 않도록)
+KNOWN_PRODUCT_MIN_COUNT = 2   # 게시물 전체에서 최소 등장 횟수
+KNOWN_PRODUCT_MIN_LENGTH = 2  # 최소 글자 수
+KNOWN_PRODUCT_PATTERN = re.compile(r"[가-힣A-Za-z0-9]+(?: [가-힣A-Za-z0-9]+)*")
+
+# parse() 결과 캐시 크기 (동일 쿼리 재분석 방지)
+PARSE_CACHE_SIZE = 4096
+
+# parse_many()에서 여러 텍스트를 한 번의 JVM 호출로 분석할 때 사용하는 구분 기호와 묶음 크기
+BATCH_SEPARATOR = "\u241e"  # ␞ (SYMBOL FOR RECORD SEPARATOR)
+# 구분 기호가 앞뒤 토큰과 붙어 하나로 분석되지 않도록 공백으로 감싸서 이어 붙임
+BATCH_JOINER = f" {BATCH_SEPARATOR} "
+BATCH_SIZE = 64
+BATCH_MAX_CHARS = 20000
+
+# 팔로워 수 범위 표현의 한국어 단위
+FOLLOWER_UNITS = {"천": 1_000, "만": 10_000, "십만": 100_000, "백만": 1_000_000, "천만": 10_000_000}
+
+# 숫자(세 자리 콤마 구분 또는 소수점 하나) + 선택적 단위. 긴 단위를 먼저 두어 "백만"이 "만"보다 우선 매칭되도록 함
+# "1.2.3", "1,2,3" 같은 잘못된 숫자는 중간부터 일부만 매칭되지 않도록 앞뒤를 숫자 경계로 제한
+_NUMBER = r"(?<![\d.])(?<!\d,)(\d{1,3}(?:,\d{3})+|\d+(?:\.\d+)?)(?![.,]?\d)\s*(천만|백만|십만|만|천)?"
+FOLLOWER_WORD_PATTERN = re.compile(r"(?:팔로워|팔로우|followers?)\s*(?:수)?", re.IGNORECASE)
+RANGE_PATTERN = re.compile(rf"{_NUMBER}\s*(명)?\s*(?:~|-|–|에서|부터)\s*{_NUMBER}\s*(명)?\s*(?:까지|사이)?")
+LOWER_BOUND_PATTERN = re.compile(rf"{_NUMBER}\s*(명)?\s*(이상|초과|넘는|넘게|부터)")
+UPPER_BOUND_PATTERN = re.compile(rf"{_NUMBER}\s*(명)?\s*(이하|미만|까지|아래)")
+
+# --- 카테고리 매처 ---
+QUERY_MATCHER = "query"
+
+def _build_query_matcher(config: dict) -> CategoryMatcher:
+    """CATEGORIES와 config.yaml의 category_keywords로 쿼리 카테고리 매처 생성"""
+    rules = merge_rules(CATEGORIES.items(), config.get("category_keywords"))
+    # 쿼리에는 영문이 섞여 있으므로 "IT"가 "with" 같은 단어 중간에 매칭되지 않도록 경계 검사
+    return CategoryMatcher(rules, ascii_word_boundary=True)
+
+def keywords_of_category(category: str) -> list:
+    """현재 매처 기준 카테고리의 키워드 목록 (설정 파일로 추가된 키워드 포함)"""
+    matcher = category_registry.get(QUERY_MATCHER)
+    return next((keywords for name, keywords in matcher.rules if name == category), [])
+
+category_registry.register(QUERY_MATCHER, _build_query_matcher)
+
+# --- 형태소 분석 (단일 pos 호출) ---
+def _analysis_from_pos(text: str, pos: list) -> tuple[list, list]:
+    """
+    Okt.pos 결과 하나로 명사 목록과 구(phrase) 목록을 함께 계산
+
+    명사는 Okt.nouns와 같이 'Noun' 태그 토큰이고, 구는 연속된 명사/숫자/영문 토큰을
+    원문 띄어쓰기를 살려 이어 붙인 것입니다. Okt.phrases와 같이 긴 구(앞에서부터 2개 토큰 이상)를
+    먼저 나열하고 단일 명사를 뒤에 둡니다.
+    """
+    nouns = [word for word, tag in pos if tag == "Noun"]
+    phrases = []
+    chunk = []  # (단어, 앞에 공백이 있었는지)
+
+    def flush():
+        if len(chunk) >= 2:
+            phrase = chunk[0][0]
+            for word, spaced in chunk[1:]:
+                phrase += (" " if spaced else "") + word
+                phrases.append(phrase)
+        chunk.clear()
+
+    cursor = 0
+    for word, tag in pos:
+        found = text.find(word, cursor)
+        if found < 0:
+            # 정규화 등으로 원문에서 찾을 수 없는 토큰은 구를 끊는 것으로 처리
+            flush()
+            continue
+        gap = text[cursor:found]
+        if gap.strip():
+            flush()
+        if tag in PHRASE_TAGS:
+            chunk.append((word, bool(gap)))
+        else:
+            flush()
+        cursor = found + len(word)
+    flush()
+
+    phrases.extend(nouns)
+    return nouns, list(dict.fromkeys(phrases))
+
+
+# --- 빠른 경로 토크나이저 (JVM 미사용) ---
+_fast_tokenizer = None
+_known_products = set()
+
+
+def _reset_fast_tokenizer() -> None:
+    global _fast_tokenizer
+    _fast_tokenizer = None
+
+
+def select_known_products(names, min_count: int = KNOWN_PRODUCT_MIN_COUNT,
+                          min_length: int = KNOWN_PRODUCT_MIN_LENGTH) -> list:
+    """
+    빠른 경로 사전에 넣을 제품명 선별 (OCR 결과 등 원본 값에서 잡음 제거)
+
+    공백을 정리하고 한글/영문/숫자만으로 된 이름 중 min_length자 이상이고
+    min_count번 이상 나온 이름만 중복 없이 반환합니다.
+    """
+    counts = Counter(
+        " ".join(name.split()) for name in names if isinstance(name, str)
+    )
+    return [
+        name for name, count in counts.items()
+        if count >= min_count and len(name) >= min_length and KNOWN_PRODUCT_PATTERN.fullmatch(name)
+    ]
+
+
+def add_known_products(names) -> None:
+    """빠른 경로 사전에 제품명 추가 (select_known_products로 선별한 이름 권장)"""
+    words = {
+        word for name in names if isinstance(name, str)
+        for word in name.split() if len(word) > 1
+    }
+    if not words - _known_products:
+        return
+    _known_products.update(words)
+    _reset_fast_tokenizer()
+
+
+def get_fast_tokenizer() -> FastTokenizer:
+    """카테고리 키워드, 불용어, 알려진 제품명으로 만든 토크나이저 (사전 변경 시 다시 생성)"""
+    global _fast_tokenizer
+    tokenizer = _fast_tokenizer
+    if tokenizer is None:
+        matcher = category_registry.get(QUERY_MATCHER)
+        nouns = {keyword for _, keywords in matcher.rules for keyword in keywords}
+        nouns.update(matcher.categories)
+        nouns.update(BASE_STOP_WORDS - VERB_STOP_WORDS)
+        nouns.update(_known_products)
+        # 불용어로만 이루어진 구는 빠른 경로에서 판단하지 않음 (제품명 후보 선택이 Okt 경로와 어긋나지 않도록)
+        stop_words = BASE_STOP_WORDS | {keyword for _, keywords in matcher.rules for keyword in keywords}
+        stop_words.update(matcher.categories)
+        tokenizer = _fast_tokenizer = FastTokenizer(nouns=nouns, verbs=VERB_STOP_WORDS, stop_words=stop_words)
+    return tokenizer
+
+
+def okt_analyze(text: str) -> tuple[list, list]:
+    """빠른 경로 없이 Okt.pos로만 분석"""
+    if not text:
+        return [], []
+    return _analysis_from_pos(text, get_okt().pos(text))
+
+
+def fast_analyze(text: str) -> tuple[list, list] | None:
+    """사전만으로 분석 (판단할 수 없으면 None)"""
+    pos = get_fast_tokenizer().pos(text)
+    return None if pos is None else _analysis_from_pos(text, pos)
+
+
+def analyze(text: str) -> tuple[list, list]:
+    """텍스트를 분석하여 (명사 목록, 구 목록) 반환 (짧은 쿼리는 빠른 경로, 나머지는 한 번의 Okt.pos 호출)"""
+    if not text:
+        return [], []
+    if FAST_PATH_ENABLED:
+        result = fast_analyze(text)
+        if result is not None:
+            return result
+    return okt_analyze(text)
+
+
+def _split_segments(pos: list) -> list:
+    """묶음 분석 결과를 구분 기호 기준으로 텍스트별 품사 목록으로 분리 (기호가 붙은 토큰도 분리)"""
+    segments = [[]]
+    for word, tag in pos:
+        if BATCH_SEPARATOR not in word:
+            segments[-1].append((word, tag))
+            continue
+        for j, part in enumerate(word.split(BATCH_SEPARATOR)):
+            if j > 0:
+                segments.append([])
+            if part:
+                segments[-1].append((part, tag))
+    return segments
+
+
+def _surface(text: str) -> str:
+    """공백을 제외한 표면 문자열 (Okt 토큰을 이어 붙인 결과와 비교용)"""
+    return re.sub(r"\s+", "", text)
+
+
+def _align_segments(batch: list, segments: list) -> list:
+    """
+    묶음의 각 텍스트에 대응하는 품사 목록 (대응을 확정할 수 없으면 None)
+
+    개수가 맞으면 순서대로 대응시키고, 맞지 않으면 앞과 뒤에서부터 표면 문자열이
+    같은 구간만 대응시켜 어긋난 가운데 텍스트만 개별 분석하도록 합니다.
+    """
+    if len(segments) == len(batch):
+        return segments
+
+    aligned = [None] * len(batch)
+    head = 0
+    while head < min(len(batch), len(segments)) and \
+            _surface("".join(w for w, _ in segments[head])) == _surface(batch[head][1]):
+        aligned[head] = segments[head]
+        head += 1
+    tail = 1
+    while tail <= min(len(batch), len(segments)) - head and \
+            _surface("".join(w for w, _ in segments[-tail])) == _surface(batch[-tail][1]):
+        aligned[-tail] = segments[-tail]
+        tail += 1
+    return aligned
+
+
+def analyze_many(texts: list) -> list:
+    """
+    여러 텍스트를 구분 기호로 이어 붙여 묶음마다 한 번씩만 Okt.pos를 호출
+
+    Returns:
+        입력 순서대로의 (명사 목록, 구 목록) 목록
+    """
+    results = [None] * len(texts)
+    batch = []  # (입력 위치, 텍스트)
+    batch_chars = 0
+    batched = 0
+    fallbacks = 0
+
+    def run_batch():
+        nonlocal batched, fallbacks
+        if not batch:
+            return
+        pos = get_okt().pos(BATCH_JOINER.join(text for _, text in batch))
+        segments = _split_segments(pos)
+        aligned = _align_segments(batch, segments)
+        misaligned = 0
+        for (i, text), segment in zip(batch, aligned):
+            if segment is None:
+                # 구분 기호 분리가 어긋난 텍스트만 개별 분석으로 대체
+                results[i] = analyze(text)
+                misaligned += 1
+            else:
+                results[i] = _analysis_from_pos(text, segment)
+        if misaligned:
+            logger.debug(f"묶음 분석 분리 실패 ({len(segments)}/{len(batch)}), {misaligned}개 개별 분석으로 대체")
+        batched += len(batch)
+        fallbacks += misaligned
+        batch.clear()
+
+    for i, text in enumerate(texts):
+        if not text:
+            results[i] = ([], [])
+        elif BATCH_SEPARATOR in text:
+            results[i] = analyze(text)
+        elif FAST_PATH_ENABLED and (fast := fast_analyze(text)) is not None:
+            results[i] = fast
+        else:
+            batch.append((i, text))
+            batch_chars += len(text)
+            if len(batch) >= BATCH_SIZE or batch_chars >= BATCH_MAX_CHARS:
+                run_batch()
+                batch_chars = 0
+    run_batch()
+    if batched:
+        logger.info(f"묶음 분석 개별 대체 비율: {fallbacks}/{batched} ({fallbacks / batched:.1%})")
+    return results
+
+
+class _ParseCache:
+    """스레드 안전한 크기 제한 LRU 캐시 (parse_many에서 일괄 채우기 위해 직접 구현)"""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+            return None
+
+    def put(self, key, value) -> None:
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = 0
+
+    def info(self) -> dict:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self._data), "maxsize": self.maxsize}
+
+
+_parse_cache = _ParseCache(PARSE_CACHE_SIZE)
+# 카테고리 사전이 교체되면 이전 사전으로 파싱한 결과와 빠른 경로 사전을 버림
+category_registry.add_listener(_parse_cache.clear)
+category_registry.add_listener(_reset_fast_tokenizer)
+
+
+def parse_cache_info() -> dict:
+    """parse() 캐시 적중/미적중 통계"""
+    return _parse_cache.info()
+
+
+def clear_parse_cache() -> None:
+    """parse() 캐시 비우기 (카테고리/불용어 사전 변경 시)"""
+    _parse_cache.clear()
+
 # --- 파싱 함수 ---
-def parse_category(text: str) -> str | None:
-    """텍스트에서 카테고리 키워드를 찾아 대표 카테고리명을 반환"""
+def parse_category(text: str, nouns=None) -> str | None:
+    """텍스트에서 카테고리 키워드를 찾아 대표 카테고리명을 반환 (nouns: 미리 추출한 명사 목록)"""
     if not text:
         return None
 
     # 형태소 분석을 통해 명사 추출
     # TODO: 명사 외 다른 품사(예: 형용사)도 고려하여 카테고리 매칭 정확도 향상 검토
-    nouns = set(okt.nouns(text))
+    if nouns is None:
+        nouns = analyze(text)[0]
 
-    # 카테고리 사전 순회하며 매칭되는 키워드 찾기
-    for category_name, keywords in CATEGORIES.items():
-        # 키워드 중 하나라도 텍스트에 직접 포함되거나, 추출된 명사 집합에 있는지 확인
-        if any(keyword in text for keyword in keywords) or not nouns.isdisjoint(keywords):
-            return category_name
-    return None # 매칭되는 카테고리 없음
+    # 키워드가 텍스트에 직접 포함되거나 추출된 명사와 일치하는 카테고리 중
+    # 사전 순서상 가장 앞선 카테고리 (매칭되지 않으면 None)
+    return category_registry.get(QUERY_MATCHER).match(text, tokens=nouns)
 
-def parse_product(text: str, category: str | None) -> str | None:
-    """텍스트에서 제품 관련 키워드를 추출 (카테고리 정보 활용)"""
+def parse_product(text: str, category: str | None, phrases=None) -> str | None:
+    """텍스트에서 제품 관련 키워드를 추출 (카테고리 정보 활용, phrases: 미리 추출한 구 목록)"""
     if not text:
         return None
 
-    # nouns = okt.nouns(text)
-    phrases = okt.phrases(text) # 명사 대신 구(phrase) 추출
+    # 명사 대신 구(phrase) 추출
+    if phrases is None:
+        phrases = analyze(text)[1]
     if not phrases:
         return None
 
     # 불용어 목록 준비
     stop_words = BASE_STOP_WORDS.copy()
     category_keywords = set()
-    if category and category in CATEGORIES:
-        category_keywords.update(CATEGORIES[category]) # 해당 카테고리의 키워드 추가
+    if category:
+        category_keywords.update(keywords_of_category(category)) # 해당 카테고리의 키워드 추가
         category_keywords.add(category) # 대표 카테고리명도 추가
 
     stop_words.update(category_keywords)
@@ -70,13 +458,13 @@ def parse_product(text: str, category: str | None) -> str | None:
     # potential_products = [noun for noun in nouns if noun not in stop_words and len(noun) > 1]
     potential_products = []
     for phrase in phrases:
-        # 구 전체가 불용어이거나, 구를 구성하는 단어가 모두 불용어인 경우 제외?
-        # 우선 간단하게 구 자체가 불용어인지 확인
-        if phrase not in stop_words and len(phrase) > 1:
-             # 구를 구성하는 단일 명사들도 불용어인지 체크 (선택적)
-             # nouns_in_phrase = okt.nouns(phrase)
-             # if not any(n in stop_words for n in nouns_in_phrase):
-             potential_products.append(phrase)
+        # 구 자체가 불용어이거나, 구를 구성하는 단어(띄어쓰기 단위)가 모두 불용어인 경우 제외
+        # (예: "남자 패션" -> "남자", "패션" 모두 불용어)
+        if phrase in stop_words or len(phrase) <= 1:
+            continue
+        if all(word in stop_words for word in phrase.split()):
+            continue
+        potential_products.append(phrase)
 
     if potential_products:
         # 현재는 가장 처음 나오는 후보 단어를 반환 (개선 필요)
@@ -87,19 +475,140 @@ def parse_product(text: str, category: str | None) -> str | None:
         # TODO: 대체 제품 키워드 추출 로직 추가 검토
         return None
 
-def parse(text: str) -> dict:
-    """입력 텍스트를 파싱하여 카테고리와 제품 키워드 딕셔너리 반환"""
-    if not text:
-        return {"product": None, "category": None}
-
-    category = parse_category(text)
-    product = parse_product(text, category)
+def _parse_from_analysis(text: str, nouns: list, phrases: list) -> dict:
+    category = parse_category(text, nouns)
+    product = parse_product(text, category, phrases)
 
     return {
         "product": product,
         "category": category
     }
 
+def parse(text: str) -> dict:
+    """입력 텍스트를 파싱하여 카테고리와 제품 키워드 딕셔너리 반환 (결과는 LRU 캐시)"""
+    if not text:
+        return {"product": None, "category": None}
+
+    cached = _parse_cache.get(text)
+    if cached is None:
+        cached = _parse_from_analysis(text, *analyze(text))
+        _parse_cache.put(text, cached)
+    # 호출자가 결과를 수정해도 캐시가 오염되지 않도록 복사본 반환
+    return dict(cached)
+
+def parse_many(texts) -> list:
+    """
+    여러 텍스트를 한꺼번에 파싱 (캡션 일괄 분류 등 대량 작업용)
+
+    캐시에 없는 고유 텍스트만 모아 묶음 단위로 JVM을 호출합니다.
+
+    Returns:
+        입력 순서대로의 parse() 결과 목록
+    """
+    texts = list(texts)
+    pending = {}
+    for text in texts:
+        if text and text not in pending and _parse_cache.get(text) is None:
+            pending[text] = None
+
+    pending_texts = list(pending)
+    for text, (nouns, phrases) in zip(pending_texts, analyze_many(pending_texts)):
+        pending[text] = _parse_from_analysis(text, nouns, phrases)
+        _parse_cache.put(text, pending[text])
+
+    results = []
+    for text in texts:
+        if not text:
+            results.append({"product": None, "category": None})
+        else:
+            results.append(dict(pending.get(text) or _parse_cache.get(text) or parse(text)))
+    return results
+
+# --- 구조화된 쿼리 해석 ---
+def _follower_number(digits: str, unit: str | None) -> int | None:
+    """"1.5" + "만" -> 15000, "1,000" -> 1000 (숫자로 해석할 수 없으면 None)"""
+    try:
+        value = float(digits.replace(",", ""))
+    except ValueError:
+        return None
+    return int(round(value * FOLLOWER_UNITS.get(unit, 1)))
+
+def parse_follower_range(text: str) -> tuple[int | None, int | None, str]:
+    """
+    텍스트에서 팔로워 수 범위("1만~5만", "10만 이상", "5천명 이하" 등) 추출
+
+    단위(천/만/백만 등)나 "명"이 붙은 숫자, 또는 "팔로워"가 언급된 쿼리의 숫자만 범위로 인식하여
+    "아이폰 15" 같은 제품명의 숫자를 범위로 오인하지 않습니다.
+
+    Returns:
+        (최소 팔로워 수, 최대 팔로워 수, 범위 표현을 제거한 나머지 텍스트). 없는 경계는 None
+    """
+    if not text:
+        return None, None, text
+    mentions_followers = bool(FOLLOWER_WORD_PATTERN.search(text))
+    min_followers = max_followers = None
+    spans = []
+
+    def accepted(units, counts) -> bool:
+        return mentions_followers or any(units) or any(counts)
+
+    for match in RANGE_PATTERN.finditer(text):
+        lo_digits, lo_unit, lo_count, hi_digits, hi_unit, hi_count = match.groups()
+        if not accepted((lo_unit, hi_unit), (lo_count, hi_count)):
+            continue
+        hi = _follower_number(hi_digits, hi_unit)
+        lo = _follower_number(lo_digits, lo_unit)
+        if lo is None or hi is None:
+            continue
+        # "1~5만"처럼 앞 숫자에 단위가 생략된 경우 뒤 숫자의 단위를 따름
+        if lo_unit is None and hi_unit is not None and _follower_number(lo_digits, hi_unit) <= hi:
+            lo = _follower_number(lo_digits, hi_unit)
+        min_followers, max_followers = min(lo, hi), max(lo, hi)
+        spans.append(match.span())
+
+    def outside_spans(match) -> bool:
+        return all(match.end() <= start or match.start() >= end for start, end in spans)
+
+    for match in LOWER_BOUND_PATTERN.finditer(text):
+        digits, unit, count, word = match.groups()
+        if outside_spans(match) and accepted((unit,), (count,)):
+            value = _follower_number(digits, unit)
+            if value is None:
+                continue
+            min_followers = value + 1 if word == "초과" else value
+            spans.append(match.span())
+
+    for match in UPPER_BOUND_PATTERN.finditer(text):
+        digits, unit, count, word = match.groups()
+        if outside_spans(match) and accepted((unit,), (count,)):
+            value = _follower_number(digits, unit)
+            if value is None:
+                continue
+            max_followers = value - 1 if word == "미만" else value
+            spans.append(match.span())
+
+    if not spans:
+        return None, None, text
+
+    rest = text
+    for start, end in sorted(spans, reverse=True):
+        rest = rest[:start] + " " + rest[end:]
+    rest = " ".join(FOLLOWER_WORD_PATTERN.sub(" ", rest).split())
+    return min_followers, max_followers, rest
+
+def parse_query(text: str) -> dict:
+    """
+    검색 쿼리를 구조화된 필터로 해석
+
+    Returns:
+        {"text": 범위 표현을 제거한 검색어, "category": 카테고리, "product": 제품 키워드,
+         "min_followers": 최소 팔로워 수, "max_followers": 최대 팔로워 수}
+    """
+    min_followers, max_followers, rest = parse_follower_range(text or "")
+    query = parse(rest)
+    query.update({"text": rest, "min_followers": min_followers, "max_followers": max_followers})
+    return query
+
 # --- 단위 테스트 케이스 --- #
 CASES = [
     ("선크림 추천해줘", {"product": "선크림", "category": None}),
@@ -113,8 +622,14 @@ CASES = [
 ]
 
 # --- 테스트 실행 코드 --- #
+# 실행: src 디렉토리에서 python -m core.nlp (core 패키지는 src 기준으로 임포트)
 if __name__ == "__main__":
     print("--- NLP Parser 경량화 버전 테스트 --- ")
+    # 모듈 임포트에는 JVM 기동이 포함되지 않으므로 초기화 비용을 따로 측정
+    # (임포트 시간 비교: python -X importtime -c "import core.nlp")
+    warmup_start = time.perf_counter()
+    warmup()
+    print(f"Okt 초기화(JVM 기동) 시간: {time.perf_counter() - warmup_start:.2f}초")
     pass_count = 0
     total_count = len(CASES)
 
@@ -132,6 +647,30 @@ if __name__ == "__main__":
         print(f"  Result: {result}")
         print(f"  Expected: {expected}")
 
+    # 일괄 파싱 결과가 개별 파싱과 같은지 확인 (캐시를 비워 실제 묶음 분석 경로를 사용)
+    texts = [text for text, _ in CASES]
+    clear_parse_cache()
+    batch_start = time.perf_counter()
+    batch_results = parse_many(texts)
+    print(f"parse_many {len(texts)}건: {(time.perf_counter() - batch_start) * 1000:.1f}ms, "
+          f"개별 결과와 일치: {batch_results == [parse(text) for text in texts]}")
+    print(f"캐시 통계: {parse_cache_info()}")
+
+    # 빠른 경로(사전)와 Okt 경로의 케이스별 분석 지연 시간 비교
+    print("분석 경로별 지연 시간 (ms):")
+    for text in texts:
+        fast_start = time.perf_counter()
+        fast_result = fast_analyze(text)
+        fast_ms = (time.perf_counter() - fast_start) * 1000
+        okt_start = time.perf_counter()
+        okt_result = okt_analyze(text)
+        okt_ms = (time.perf_counter() - okt_start) * 1000
+        if fast_result is None:
+            decision = "Okt로 대체"
+        else:
+            decision = "일치" if fast_result == okt_result else f"불일치 {fast_result} vs {okt_result}"
+        print(f"  '{text}': 빠른 경로 {fast_ms:.3f}ms, Okt {okt_ms:.3f}ms ({decision})")
+
     accuracy = (pass_count / total_count) * 100 if total_count > 0 else 0
     print(f"테스트 완료: {pass_count}/{total_count} 통과 ({accuracy:.2f}%)")
 
@@ -0,0 +1,393 @@
+# -*- coding: utf-8 -*-
+"""
+검색 스냅샷 모듈
+
+검색 API가 시작할 때마다 SQLite에서 DataFrame을 만들고, 임베딩 문자열을 파싱하고,
+인덱스를 다시 생성하는 비용을 없애기 위해 검색에 필요한 모든 데이터를
+하나의 자기 기술적(self-describing) 디렉토리로 직렬화합니다.
+
+스냅샷 디렉토리 구성:
+    manifest.json        버전, 생성 시각, 행 수, 원본 DB 정보, 파일 목록, 인덱스 메타데이터
+    influencers.feather  인플루언서 메타데이터 (Arrow, 비압축 -> 로드 시 DataFrame으로 복사)
+    posts.feather        게시물 메타데이터 (semantic_emb 문자열 컬럼 제외)
+    vectors.npy          float32 임베딩 행렬
+    vector_rows.npy      임베딩 행 -> 게시물 행 위치
+    facet_<필드>.npy     패싯 값별 비트맵 (행: manifest의 값 순서)
+    sort_<키>.npy        정렬 순열
+    autocomplete.feather 자동완성 항목 (정규화 키 순으로 정렬)
+    fuzzy_names.feather  제품명 트라이그램 인덱스: 고유 제품명과 게시물 행 목록
+    fuzzy_grams.feather  제품명 트라이그램 인덱스: 3-gram별 제품명 포스팅 리스트
+    hashtags.feather     해시태그별 게시물 행 포스팅 리스트
+
+.npy 파일(벡터, 패싯 비트맵, 정렬 순열)은 메모리 매핑으로 로드하지만, 인플루언서/게시물 메타데이터는
+검색 응답에서 pandas 연산을 쓰므로 로드 시 DataFrame으로 변환(전체 복사)됩니다.
+
+스냅샷 생성: python scripts/build_search_snapshot.py
+
+manifest에는 스냅샷을 만든 원본 DB의 수정 시각과 테이블 행 수가 기록되며, 검색 API는 시작 시
+현재 DB와 비교하여 다르면(ETL 이후 스냅샷을 다시 만들지 않은 경우) 스냅샷 대신 DB에서 로드합니다.
+"""
+
+import os
+import json
+import shutil
+import sqlite3
+import logging
+from collections import Counter
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+
+from core.facets import FacetIndex
+from core.sort_index import SortIndex
+from core.autocomplete import PrefixIndex
+from core.fuzzy_index import TrigramIndex
+from core.hashtags import HashtagIndex
+
+logger = logging.getLogger(__name__)
+
+# --- 상수 정의 ---
+# 스냅샷 형식 버전 (파일 구성이나 의미가 바뀌면 올림)
+SNAPSHOT_VERSION = 1
+DEFAULT_DB_PATH = os.path.join("data", "mvp.db")
+DEFAULT_SNAPSHOT_DIR = os.path.join("data", "search_snapshot")
+MANIFEST_FILE = "manifest.json"
+EMBEDDING_COLUMN = "semantic_emb"
+# 스냅샷과 원본 DB의 일치 여부를 확인할 때 행 수를 비교하는 테이블
+SOURCE_TABLES = ("influencers", "posts")
+
+
+def parse_embedding(emb_str) -> np.ndarray | None:
+    """임베딩 문자열("[0.1, 0.2]", "0.1 0.2", "0.1,0.2" 등)을 float32 배열로 변환"""
+    if not isinstance(emb_str, str) or not emb_str.strip():
+        return None
+    try:
+        values = emb_str.strip().strip('[]').replace(',', ' ').split()
+        return np.array(values, dtype=np.float32) if values else None
+    except ValueError as e:
+        logger.warning(f"임베딩 벡터 파싱 오류: {e} - 원본 문자열: {emb_str[:30]}...")
+        return None
+
+
+def parse_embeddings(emb_series: pd.Series) -> tuple[np.ndarray, np.ndarray]:
+    """
+    게시물 임베딩 컬럼을 float32 행렬로 변환
+
+    Returns:
+        (임베딩 행렬, 각 임베딩의 게시물 행 위치 배열)
+        가장 많은 차원과 다른 벡터는 제외합니다.
+    """
+    parsed = [(pos, parse_embedding(value)) for pos, value in enumerate(emb_series.to_numpy())]
+    parsed = [(pos, vec) for pos, vec in parsed if vec is not None and len(vec) > 0]
+    if not parsed:
+        return np.empty((0, 0), dtype=np.float32), np.empty(0, dtype=np.int64)
+
+    dim = Counter(len(vec) for _, vec in parsed).most_common(1)[0][0]
+    skipped = sum(1 for _, vec in parsed if len(vec) != dim)
+    if skipped:
+        logger.warning(f"차원이 {dim}이 아닌 임베딩 {skipped}개를 제외합니다.")
+    parsed = [(pos, vec) for pos, vec in parsed if len(vec) == dim]
+
+    vectors = np.vstack([vec for _, vec in parsed]).astype(np.float32, copy=False)
+    rows = np.array([pos for pos, _ in parsed], dtype=np.int64)
+    return vectors, rows
+
+
+def arrow_compatible(df: pd.DataFrame) -> pd.DataFrame:
+    """Arrow로 변환할 수 없는 혼합 타입 object 컬럼을 문자열로 정규화"""
+    df = df.reset_index(drop=True)
+    for column in df.columns[df.dtypes == object]:
+        try:
+            pa.array(df[column], from_pandas=True)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            logger.warning(f"'{column}' 컬럼에 혼합 타입이 있어 문자열로 변환하여 저장합니다.")
+            df[column] = df[column].where(df[column].isna(), df[column].astype(str))
+    return df
+
+
+def snapshot_exists(snapshot_dir: str) -> bool:
+    """스냅샷 디렉토리에 manifest가 있는지 여부"""
+    return os.path.exists(os.path.join(snapshot_dir, MANIFEST_FILE))
+
+
+def read_manifest(snapshot_dir: str) -> dict:
+    """스냅샷 manifest 읽기"""
+    with open(os.path.join(snapshot_dir, MANIFEST_FILE), 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def source_signature(db_path: str) -> dict:
+    """원본 SQLite DB의 수정 시각과 테이블별 행 수 (스냅샷이 만들어진 DB와 현재 DB 비교용)"""
+    mtime = os.path.getmtime(db_path)
+    con = sqlite3.connect(db_path)
+    try:
+        counts = {table: con.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0] for table in SOURCE_TABLES}
+    finally:
+        con.close()
+    return {"mtime": mtime, "counts": counts}
+
+
+def stale_reason(manifest: dict, db_path: str) -> str | None:
+    """
+    스냅샷이 현재 원본 DB와 다른 이유 (같으면 None)
+
+    DB 파일이 없으면 스냅샷이 유일한 데이터이므로 비교하지 않습니다.
+    """
+    if not os.path.exists(db_path):
+        return None
+    recorded = manifest.get("source_db")
+    if not recorded:
+        return "원본 DB 정보가 없는 스냅샷"
+    current = source_signature(db_path)
+    if current["counts"] != recorded.get("counts"):
+        return f"행 수 변경 {recorded.get('counts')} -> {current['counts']}"
+    if current["mtime"] != recorded.get("mtime"):
+        recorded_at = datetime.fromtimestamp(recorded["mtime"]).isoformat() if recorded.get("mtime") else None
+        return f"DB 수정 시각 변경 {recorded_at} -> {datetime.fromtimestamp(current['mtime']).isoformat()}"
+    return None
+
+
+class SearchSnapshot:
+    """검색에 필요한 데이터와 인덱스 묶음"""
+
+    def __init__(self, infl_df, posts_df, vectors, vector_rows, facet_index, sort_index, manifest=None,
+                 autocomplete=None, fuzzy_index=None, hashtag_index=None, source_db=None):
+        self.infl_df = infl_df
+        self.posts_df = posts_df
+        self.vectors = vectors
+        self.vector_rows = vector_rows
+        self.facet_index = facet_index
+        self.sort_index = sort_index
+        self.manifest = manifest or {}
+        self.autocomplete = autocomplete
+        self.fuzzy_index = fuzzy_index
+        self.hashtag_index = hashtag_index
+        # 데이터를 읽은 원본 DB의 수정 시각과 행 수 (save() 시 manifest에 기록)
+        self.source_db = source_db if source_db is not None else self.manifest.get("source_db")
+
+    @classmethod
+    def from_sqlite(cls, db_path: str = DEFAULT_DB_PATH) -> "SearchSnapshot":
+        """SQLite(mvp.db)에서 데이터를 읽어 임베딩 파싱과 인덱스 생성까지 수행"""
+        # 읽기 전에 기록하여 읽는 도중 DB가 바뀌면 다음 시작 시 스냅샷이 오래된 것으로 판정되도록 함
+        source_db = source_signature(db_path)
+        con = sqlite3.connect(db_path)
+        try:
+            infl_df = pd.read_sql("SELECT * FROM influencers", con)
+            posts_df = pd.read_sql("SELECT * FROM posts", con)
+            # ETL이 추출한 해시태그 테이블 (없으면 캡션에서 직접 추출)
+            has_hashtags = con.execute(
+                "SELECT 1 FROM sqlite_master WHERE type='table' AND name='post_hashtags'"
+            ).fetchone() is not None
+            hashtags_df = pd.read_sql("SELECT post_pk, hashtag FROM post_hashtags", con) if has_hashtags else None
+        finally:
+            con.close()
+        logger.info(f"SQLite 로드 완료: 인플루언서 {len(infl_df)}명, 게시물 {len(posts_df)}개 ({db_path})")
+
+        if EMBEDDING_COLUMN in posts_df.columns:
+            vectors, vector_rows = parse_embeddings(posts_df[EMBEDDING_COLUMN])
+            # 파싱이 끝난 임베딩 문자열은 검색 응답에 불필요하므로 제거
+            posts_df = posts_df.drop(columns=[EMBEDDING_COLUMN])
+        else:
+            vectors, vector_rows = parse_embeddings(pd.Series([], dtype=object))
+        logger.info(f"{len(vectors)}개의 유효한 임베딩 벡터 추출 완료 (차원: {vectors.shape[1]})")
+
+        facet_index = FacetIndex.build(posts_df, infl_df)
+        sort_index = SortIndex.build(posts_df, infl_df)
+        autocomplete = PrefixIndex.build(posts_df, infl_df)
+        fuzzy_index = TrigramIndex.build(posts_df)
+        if hashtags_df is not None and 'post_pk' in posts_df.columns:
+            row_of = pd.Series(np.arange(len(posts_df)), index=posts_df['post_pk'].to_numpy())
+            row_of = row_of[~row_of.index.duplicated()]
+            rows = row_of.reindex(hashtags_df['post_pk'].to_numpy())
+            valid = rows.notna().to_numpy()
+            hashtag_index = HashtagIndex.from_pairs(
+                len(posts_df), rows.to_numpy()[valid].astype(np.int64), hashtags_df['hashtag'].to_numpy()[valid]
+            )
+        else:
+            hashtag_index = HashtagIndex.build(posts_df)
+        return cls(
+            infl_df, posts_df, vectors, vector_rows, facet_index, sort_index,
+            autocomplete=autocomplete, fuzzy_index=fuzzy_index, hashtag_index=hashtag_index,
+            source_db=source_db
+        )
+
+    def save(self, snapshot_dir: str = DEFAULT_SNAPSHOT_DIR, source: str | None = None) -> str:
+        """
+        스냅샷 디렉토리로 저장 (임시 디렉토리에 쓴 뒤 교체하여 읽는 쪽이 깨진 스냅샷을 보지 않도록 함)
+
+        Returns:
+            저장된 스냅샷 디렉토리 경로
+        """
+        tmp_dir = f"{snapshot_dir}.tmp"
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        os.makedirs(tmp_dir)
+
+        files = {}
+
+        # 압축 해제 없이 바로 읽도록 비압축 Arrow(Feather v2)로 저장
+        for name, df in (("influencers", self.infl_df), ("posts", self.posts_df)):
+            files[name] = f"{name}.feather"
+            feather.write_feather(
+                arrow_compatible(df), os.path.join(tmp_dir, files[name]),
+                compression='uncompressed'
+            )
+
+        files["vectors"] = "vectors.npy"
+        np.save(os.path.join(tmp_dir, files["vectors"]), np.ascontiguousarray(self.vectors, dtype=np.float32))
+        files["vector_rows"] = "vector_rows.npy"
+        np.save(os.path.join(tmp_dir, files["vector_rows"]), self.vector_rows.astype(np.int64))
+
+        # 패싯 비트맵: 필드마다 (값 개수, 비트맵 바이트 수) 2차원 배열 하나로 저장
+        facet_values = {}
+        for field, bitmaps in self.facet_index.bitmaps.items():
+            values = list(bitmaps)
+            facet_values[field] = values
+            files[f"facet_{field}"] = f"facet_{field}.npy"
+            n_bytes = (self.facet_index.n_rows + 7) // 8
+            matrix = np.vstack([bitmaps[v] for v in values]) if values else np.empty((0, n_bytes), dtype=np.uint8)
+            np.save(os.path.join(tmp_dir, files[f"facet_{field}"]), matrix)
+
+        for sort_key, order in self.sort_index.orders.items():
+            files[f"sort_{sort_key}"] = f"sort_{sort_key}.npy"
+            np.save(os.path.join(tmp_dir, files[f"sort_{sort_key}"]), order)
+
+        if self.autocomplete is not None:
+            files["autocomplete"] = "autocomplete.feather"
+            feather.write_feather(
+                self.autocomplete.entries, os.path.join(tmp_dir, files["autocomplete"]),
+                compression='uncompressed'
+            )
+
+        if self.fuzzy_index is not None:
+            for name, table in zip(("fuzzy_names", "fuzzy_grams"), self.fuzzy_index.to_tables()):
+                files[name] = f"{name}.feather"
+                feather.write_feather(table, os.path.join(tmp_dir, files[name]), compression='uncompressed')
+
+        if self.hashtag_index is not None:
+            files["hashtags"] = "hashtags.feather"
+            feather.write_feather(
+                self.hashtag_index.to_table(), os.path.join(tmp_dir, files["hashtags"]), compression='uncompressed'
+            )
+
+        manifest = {
+            "version": SNAPSHOT_VERSION,
+            "created_at": datetime.now().isoformat(),
+            "source": source,
+            "source_db": self.source_db,
+            "counts": {
+                "influencers": len(self.infl_df),
+                "posts": len(self.posts_df),
+                "vectors": int(self.vectors.shape[0]),
+            },
+            "embedding_dim": int(self.vectors.shape[1]) if self.vectors.ndim == 2 else 0,
+            "files": files,
+            "indexes": {
+                "facets": facet_values,
+                "sort_keys": list(self.sort_index.orders),
+                "autocomplete_entries": len(self.autocomplete.entries) if self.autocomplete is not None else 0,
+                "fuzzy_product_names": len(self.fuzzy_index.names) if self.fuzzy_index is not None else 0,
+                "hashtags": len(self.hashtag_index.tags) if self.hashtag_index is not None else 0,
+            },
+        }
+        with open(os.path.join(tmp_dir, MANIFEST_FILE), 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+
+        # 기존 스냅샷 교체
+        old_dir = f"{snapshot_dir}.old"
+        shutil.rmtree(old_dir, ignore_errors=True)
+        if os.path.exists(snapshot_dir):
+            os.rename(snapshot_dir, old_dir)
+        os.rename(tmp_dir, snapshot_dir)
+        shutil.rmtree(old_dir, ignore_errors=True)
+
+        self.manifest = manifest
+        logger.info(f"검색 스냅샷 저장 완료: {snapshot_dir} (버전 {SNAPSHOT_VERSION})")
+        return snapshot_dir
+
+    @classmethod
+    def load(cls, snapshot_dir: str = DEFAULT_SNAPSHOT_DIR) -> "SearchSnapshot":
+        """
+        스냅샷 디렉토리 로드 (.npy 배열은 메모리 매핑, 메타데이터 테이블은 DataFrame으로 복사)
+
+        Raises:
+            ValueError: 스냅샷 버전이 현재 코드와 다른 경우
+        """
+        manifest = read_manifest(snapshot_dir)
+        if manifest.get("version") != SNAPSHOT_VERSION:
+            raise ValueError(
+                f"스냅샷 버전 불일치: {manifest.get('version')} (필요: {SNAPSHOT_VERSION}). "
+                "scripts/build_search_snapshot.py로 다시 생성하세요."
+            )
+
+        files = manifest["files"]
+
+        def path_of(key):
+            return os.path.join(snapshot_dir, files[key])
+
+        infl_df = feather.read_table(path_of("influencers"), memory_map=True).to_pandas()
+        posts_df = feather.read_table(path_of("posts"), memory_map=True).to_pandas()
+        vectors = np.load(path_of("vectors"), mmap_mode='r')
+        vector_rows = np.load(path_of("vector_rows"), mmap_mode='r')
+
+        facet_index = FacetIndex(len(posts_df))
+        for field, values in manifest["indexes"]["facets"].items():
+            matrix = np.load(path_of(f"facet_{field}"), mmap_mode='r')
+            facet_index.bitmaps[field] = {value: matrix[i] for i, value in enumerate(values)}
+
+        sort_index = SortIndex(len(posts_df))
+        for sort_key in manifest["indexes"]["sort_keys"]:
+            sort_index.orders[sort_key] = np.load(path_of(f"sort_{sort_key}"), mmap_mode='r')
+
+        # 자동완성 항목이 없는 이전 스냅샷은 로드한 데이터로 바로 생성
+        if "autocomplete" in files:
+            autocomplete = PrefixIndex(feather.read_table(path_of("autocomplete"), memory_map=True).to_pandas())
+        else:
+            autocomplete = PrefixIndex.build(posts_df, infl_df)
+
+        if "fuzzy_names" in files and "fuzzy_grams" in files:
+            fuzzy_index = TrigramIndex.from_tables(
+                feather.read_table(path_of("fuzzy_names"), memory_map=True),
+                feather.read_table(path_of("fuzzy_grams"), memory_map=True)
+            )
+        else:
+            fuzzy_index = TrigramIndex.build(posts_df)
+
+        if "hashtags" in files:
+            hashtag_index = HashtagIndex.from_table(len(posts_df), feather.read_table(path_of("hashtags"), memory_map=True))
+        else:
+            hashtag_index = HashtagIndex.build(posts_df)
+
+        logger.info(
+            f"검색 스냅샷 로드 완료: {snapshot_dir} (버전 {manifest['version']}, "
+            f"생성 {manifest.get('created_at')}, 게시물 {len(posts_df)}개, 벡터 {len(vectors)}개)"
+        )
+        return cls(
+            infl_df, posts_df, vectors, vector_rows, facet_index, sort_index, manifest,
+            autocomplete, fuzzy_index, hashtag_index
+        )
+
+    @classmethod
+    def load_or_build(cls, snapshot_dir: str = DEFAULT_SNAPSHOT_DIR, db_path: str = DEFAULT_DB_PATH) -> "SearchSnapshot":
+        """
+        스냅샷이 현재 원본 DB로 만들어졌으면 로드하고, 없거나 오래되었거나 읽을 수 없으면 DB에서 빌드
+
+        오래된 스냅샷은 덮어쓰지 않으므로 scripts/build_search_snapshot.py로 다시 생성해야 합니다.
+        """
+        if not snapshot_exists(snapshot_dir):
+            logger.info(f"검색 스냅샷이 없어 데이터베이스에서 로드합니다: {db_path}")
+            return cls.from_sqlite(db_path)
+
+        try:
+            reason = stale_reason(read_manifest(snapshot_dir), db_path)
+            if reason is None:
+                return cls.load(snapshot_dir)
+            logger.warning(
+                f"검색 스냅샷이 원본 DB와 달라 데이터베이스에서 로드합니다 ({reason}). "
+                "scripts/build_search_snapshot.py로 다시 생성하세요."
+            )
+        except (ValueError, KeyError, OSError, sqlite3.Error, pa.ArrowException) as e:
+            logger.warning(f"검색 스냅샷을 로드할 수 없어 데이터베이스에서 로드합니다: {e}")
+        return cls.from_sqlite(db_path)
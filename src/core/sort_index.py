@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+"""
+검색 결과 보조 정렬(최신순, 좋아요순, 팔로워순) 모듈
+
+게시물 행에 대한 정렬 순열(permutation)을 로딩 시점에 미리 계산해 두고,
+요청 시에는 정렬된 순서를 앞에서부터 훑으며 후보 마스크에 포함된 행만
+limit개가 모일 때까지 골라냅니다. 결과 DataFrame 전체를 매번 정렬하지 않습니다.
+"""
+
+import logging
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# --- 상수 정의 ---
+# 기본 정렬 (시맨틱 유사도 + 팔로워 랭킹 점수)
+DEFAULT_SORT = "score"
+
+# 정렬 키 -> 설명 (모두 내림차순)
+SORT_KEYS = {
+    "recent": "게시일 최신순 (taken_at)",
+    "likes": "좋아요 많은순 (like_count)",
+    "followers": "팔로워 많은순 (follower_count)",
+}
+
+# 정렬 순서를 훑을 때 한 번에 검사할 행 수
+WALK_CHUNK_SIZE = 1024
+
+
+def descending_order(values) -> np.ndarray:
+    """값 배열의 내림차순 순열 반환 (결측치는 맨 뒤, 동점은 원래 행 순서 유지)"""
+    keys = np.asarray(values, dtype=np.float64)
+    keys = np.where(np.isnan(keys), -np.inf, keys)
+    return np.argsort(-keys, kind='stable').astype(np.int64)
+
+
+class SortIndex:
+    """게시물 행에 대한 사전 정렬 순열 모음"""
+
+    def __init__(self, n_rows: int):
+        self.n_rows = n_rows
+        # {정렬 키: 게시물 행 위치 순열(int64 배열)}
+        self.orders = {}
+
+    @classmethod
+    def build(cls, posts_df: pd.DataFrame, infl_df: pd.DataFrame) -> "SortIndex":
+        """
+        게시물 DataFrame 행 순서 기준으로 정렬 순열 생성
+
+        Args:
+            posts_df: 게시물 DataFrame (taken_at, like_count, user_pk 컬럼 사용)
+            infl_df: 인플루언서 DataFrame (pk, follower_count 컬럼 사용)
+        """
+        index = cls(len(posts_df))
+        if posts_df.empty:
+            return index
+
+        if 'taken_at' in posts_df.columns:
+            taken_at = pd.to_datetime(posts_df['taken_at'], errors='coerce', utc=True)
+            # epoch 초 단위 실수로 변환 (NaT는 NaN으로 유지)
+            timestamps = (taken_at - pd.Timestamp(0, tz='UTC')).dt.total_seconds()
+            index.orders["recent"] = descending_order(timestamps)
+
+        if 'like_count' in posts_df.columns:
+            likes = pd.to_numeric(posts_df['like_count'], errors='coerce')
+            index.orders["likes"] = descending_order(likes)
+
+        if not infl_df.empty and {'pk', 'follower_count'} <= set(infl_df.columns):
+            followers_by_pk = infl_df.drop_duplicates(subset=['pk']).set_index('pk')['follower_count']
+            followers = pd.to_numeric(
+                followers_by_pk.reindex(posts_df['user_pk'].to_numpy()), errors='coerce'
+            )
+            index.orders["followers"] = descending_order(followers)
+
+        logger.info(f"정렬 순열 생성 완료: {', '.join(index.orders)} ({index.n_rows}행)")
+        return index
+
+    def supports(self, sort_key: str) -> bool:
+        """해당 정렬 키의 순열이 준비되어 있는지 여부"""
+        return sort_key in self.orders
+
+    def top(self, sort_key: str, candidate_mask: np.ndarray, limit: int) -> np.ndarray:
+        """
+        정렬 순서를 따라가며 후보 마스크에 포함된 행을 최대 limit개 반환
+
+        Args:
+            sort_key: SORT_KEYS 중 하나
+            candidate_mask: 게시물 행 길이의 불리언 후보 마스크
+            limit: 반환할 최대 행 수
+
+        Returns:
+            정렬 순서대로의 게시물 행 위치 배열
+        """
+        order = self.orders[sort_key]
+        hits = []
+        found = 0
+        for start in range(0, len(order), WALK_CHUNK_SIZE):
+            chunk = order[start:start + WALK_CHUNK_SIZE]
+            chunk_hits = chunk[candidate_mask[chunk]]
+            if len(chunk_hits):
+                hits.append(chunk_hits[:limit - found])
+                found += len(hits[-1])
+            # limit개를 채우면 나머지 순서는 훑지 않고 종료
+            if found >= limit:
+                break
+        if not hits:
+            return np.array([], dtype=np.int64)
+        return np.concatenate(hits)
@@ -1,8 +1,15 @@
-import pandas as pd
+import os
+import sys
 
-# 데이터 로드
-influencers = pd.read_csv('data/influencers.csv')
-posts = pd.read_csv('data/posts.csv')
+# 프로젝트 루트 디렉토리를 Python 경로에 추가
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+# core 패키지를 검색 API와 같은 이름으로 임포트하기 위해 src 디렉토리도 추가
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from src.data.columnar import read_crawl_table
+
+# 데이터 로드 (Parquet 데이터셋 우선, 없으면 CSV / 통계에 필요한 컬럼만 읽음)
+influencers = read_crawl_table('influencers', 'data', columns=['username', 'follower_count'])
+posts = read_crawl_table('posts', 'data', columns=['id', 'like_count', 'comment_count'])
 
 # 기본 통계 출력
 print("=== 인플루언서 통계 ===")
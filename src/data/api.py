@@ -15,6 +15,9 @@ from datetime import datetime
 from typing import List, Dict, Any, Tuple, Optional
 from statistics import mean
 
+from core.category_matcher import CategoryMatcher, merge_rules, registry as category_registry
+from .records import InfluencerRecord, PostRecord
+
 # 응답 시간 기반 동적 딜레이 조정
 class DynamicDelayAdapter:
     """응답 시간 기반 동적 딜레이 조정"""
@@ -360,20 +363,10 @@ def fetch_instagram_data(client, username):
             
         user_pk = user_info.pk
         
-        # 추가 정보 가공
-        user_details = {
-            'username': username,
-            'pk': user_pk,
-            'full_name': user_info.full_name,
-            'follower_count': user_info.follower_count,
-            'following_count': user_info.following_count,
-            'media_count': user_info.media_count,
-            'biography': user_info.biography,
-            'category': parse_category(user_info.biography),
-            'external_url': user_info.external_url,
-            'is_private': user_info.is_private,
-            'is_verified': user_info.is_verified
-        }
+        # 테이블 컬럼만 모델 속성에서 바로 추출
+        user_details = InfluencerRecord.from_user(
+            user_info, category=parse_category(user_info.biography), username=username
+        )
         
         # 비공개 계정이면 게시물을 가져오지 않음
         if user_info.is_private:
@@ -388,23 +381,7 @@ def fetch_instagram_data(client, username):
     try:
         medias = client.get_user_medias(user_pk, 10)  # NUM_POSTS_TO_FETCH
         
-        for media in medias:
-            # 기본 게시물 정보
-            post_info = {
-                'id': media.id,
-                'user_pk': user_pk,
-                'username': username,
-                'caption': media.caption_text if hasattr(media, 'caption_text') else '',
-                'like_count': media.like_count,
-                'comment_count': media.comment_count,
-                'taken_at': media.taken_at,
-                'media_type': media.media_type,
-                'product_type': getattr(media, 'product_type', None),
-                'image_url': getattr(media, 'thumbnail_url', None),
-                'video_url': getattr(media, 'video_url', None)
-            }
-            user_posts.append(post_info)
-            
+        user_posts = [PostRecord.from_media(media, user_pk, username) for media in medias]
         logging.info(f"[{username}] {len(user_posts)}개 게시물 수집 완료")
     except Exception as e:
         logging.error(f"[{username}] 게시물 수집 중 오류: {str(e)}")
@@ -413,36 +390,38 @@ def fetch_instagram_data(client, username):
         
     return user_details, user_posts
 
+# 바이오그래피 카테고리 키워드 매핑 (앞에 있는 키워드가 우선)
+BIOGRAPHY_KEYWORDS = {
+    '렌즈': 'contacts',
+    '콘택트': 'contacts',
+    '컬러렌즈': 'contacts',
+    '소프트렌즈': 'contacts',
+    '뷰티': 'beauty',
+    '메이크업': 'makeup',
+    '화장품': 'cosmetics',
+    '패션': 'fashion',
+    '모델': 'model',
+    '아이돌': 'idol',
+    '가수': 'singer',
+    '배우': 'actor',
+    '인플루언서': 'influencer',
+    '유튜버': 'youtuber',
+}
+BIOGRAPHY_MATCHER = "biography"
+
+def _build_biography_matcher(config):
+    """키워드마다 하나의 규칙으로 매처 생성 (config.yaml의 target_hashtags는 contacts로 분류)"""
+    rules = [(category, [keyword]) for keyword, category in BIOGRAPHY_KEYWORDS.items()]
+    return CategoryMatcher(merge_rules(rules, {'contacts': config.get('target_hashtags') or []}))
+
+category_registry.register(BIOGRAPHY_MATCHER, _build_biography_matcher)
+
 # 바이오그래피에서 카테고리 추출 함수
-@functools.lru_cache(maxsize=10000)
 def parse_category(biography):
-    """바이오그래피에서 카테고리 추출 (캐싱 적용)"""
+    """바이오그래피에서 카테고리 추출 (키워드 오토마톤으로 한 번에 매칭)"""
     if not biography:
         return None
-        
-    # 카테고리 키워드 매핑
-    keywords = {
-        '렌즈': 'contacts',
-        '콘택트': 'contacts',
-        '컬러렌즈': 'contacts',
-        '소프트렌즈': 'contacts',
-        '뷰티': 'beauty',
-        '메이크업': 'makeup',
-        '화장품': 'cosmetics',
-        '패션': 'fashion',
-        '모델': 'model',
-        '아이돌': 'idol',
-        '가수': 'singer',
-        '배우': 'actor',
-        '인플루언서': 'influencer',
-        '유튜버': 'youtuber',
-    }
-    
-    for keyword, category in keywords.items():
-        if keyword in biography:
-            return category
-            
-    return None
+    return category_registry.get(BIOGRAPHY_MATCHER).match(biography)
 
 # 알림 전송 함수
 def send_notification(title, message, webhook_url=None):
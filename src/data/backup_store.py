@@ -0,0 +1,347 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+백업 스냅샷 저장소 - 행 내용 해시로 중복 제거한 압축 세그먼트 + 스냅샷 매니페스트
+
+실행할 때마다 테이블 전체를 CSV로 복사하면 바뀌지 않은 행이 매번 다시 저장되어
+백업 디렉토리가 끝없이 커집니다. 이 저장소는 행마다 내용 해시(128비트)를 계산해
+처음 보는 행만 압축 세그먼트에 한 번 저장하고, 스냅샷은 행 해시 목록을 가리키는 작은 매니페스트로 남깁니다.
+
+    backup/
+        manifests/<스냅샷 ID>.json   테이블별 컬럼, 기본 키, 행 수, 청크 해시 목록
+        chunks/<청크 해시>.npy       기본 키 순서의 행 해시 목록 (청크 경계는 기본 키 해시로 결정)
+        rows/rows-<순번>.parquet     고유 행 세그먼트 (zstd, 행 해시 + 원본 컬럼)
+        rows/index-<순번>.parquet    세그먼트에 든 행 해시 목록
+
+청크 경계를 기본 키 해시로 정하므로 행 하나가 바뀌거나 추가되어도 그 행이 속한 청크만 새로 만들어집니다.
+보존 개수(retention)를 넘는 오래된 스냅샷은 레이블별로 삭제되고, 더 이상 참조되지 않는
+청크와 행은 정리됩니다. 한 번에 하나의 프로세스만 같은 저장소에 쓴다고 가정합니다.
+"""
+
+import os
+import glob
+import json
+import hashlib
+import logging
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from .columnar import PARQUET_COMPRESSION
+
+# --- 상수 정의 ---
+BACKUP_DIR_NAME = "backup"
+BACKUP_RETENTION = int(os.getenv("BACKUP_RETENTION", "10"))  # 레이블별로 보존할 스냅샷 수 (0이면 모두 보존)
+CHUNK_TARGET_ROWS = 4096       # 청크당 평균 행 수 (기본 키 해시가 이 값으로 나누어떨어지는 행에서 청크를 나눔)
+GC_REWRITE_RATIO = 0.5         # 살아 있는 행 비율이 이보다 낮은 세그먼트는 정리 시 다시 씀
+HASH_KEYS = ("mvp-backup-key-1", "mvp-backup-key-2")  # 행 해시 두 개(상위/하위 64비트)의 해시 키 (16자)
+HASH_COLUMNS = ["_h1", "_h2"]
+
+TableData = Union[pd.DataFrame, Iterable[pd.DataFrame]]
+
+
+def row_hashes(df: pd.DataFrame) -> np.ndarray:
+    """
+    행 내용 해시 (N x 2 uint64)
+
+    컬럼 이름도 해시에 섞으므로 값이 같아도 컬럼 구성이 다른 행은 다른 행으로 취급합니다.
+    """
+    salt = np.uint64(int.from_bytes(
+        hashlib.blake2b("\x1f".join(map(str, df.columns)).encode("utf-8"), digest_size=8).digest(), "little"
+    ))
+    return np.column_stack([
+        pd.util.hash_pandas_object(df, index=False, hash_key=hash_key).to_numpy() ^ salt
+        for hash_key in HASH_KEYS
+    ])
+
+
+class BackupStore:
+    """내용 해시 기반 중복 제거 백업 스냅샷 저장소"""
+
+    def __init__(self, backup_dir: str, retention: int = BACKUP_RETENTION):
+        """
+        초기화
+
+        Args:
+            backup_dir: 백업 디렉토리
+            retention: 레이블별로 보존할 스냅샷 수 (0이면 모두 보존)
+        """
+        self.backup_dir = backup_dir
+        self.retention = retention
+        self.manifest_dir = os.path.join(backup_dir, "manifests")
+        self.chunk_dir = os.path.join(backup_dir, "chunks")
+        self.row_dir = os.path.join(backup_dir, "rows")
+        for path in (self.manifest_dir, self.chunk_dir, self.row_dir):
+            os.makedirs(path, exist_ok=True)
+
+        # 행 해시 -> 세그먼트 번호 (처음 필요할 때 로드)
+        self._index: Optional[pd.DataFrame] = None
+
+    # --- 경로/파일 ---
+
+    def _segment_path(self, seq: int) -> str:
+        return os.path.join(self.row_dir, f"rows-{seq:06d}.parquet")
+
+    def _index_path(self, seq: int) -> str:
+        return os.path.join(self.row_dir, f"index-{seq:06d}.parquet")
+
+    def _chunk_path(self, digest: str) -> str:
+        return os.path.join(self.chunk_dir, f"{digest}.npy")
+
+    @staticmethod
+    def _write_parquet(table: pa.Table, path: str) -> None:
+        """임시 파일에 쓴 뒤 rename (부분 기록 방지)"""
+        pq.write_table(table, path + ".tmp", compression=PARQUET_COMPRESSION)
+        os.replace(path + ".tmp", path)
+
+    def _load_index(self) -> pd.DataFrame:
+        if self._index is None:
+            frames = []
+            for path in sorted(glob.glob(os.path.join(self.row_dir, "index-*.parquet"))):
+                df = pq.read_table(path).to_pandas()
+                df["segment"] = int(os.path.basename(path)[len("index-"):-len(".parquet")])
+                frames.append(df)
+            self._index = (
+                pd.concat(frames, ignore_index=True) if frames
+                else pd.DataFrame({"_h1": np.array([], dtype=np.uint64), "_h2": np.array([], dtype=np.uint64),
+                                   "segment": np.array([], dtype=np.int64)})
+            )
+        return self._index
+
+    def _next_segment_seq(self) -> int:
+        index = self._load_index()
+        return int(index["segment"].max()) + 1 if len(index) else 1
+
+    # --- 스냅샷 생성 ---
+
+    def _store_rows(self, df: pd.DataFrame, hashes: np.ndarray) -> int:
+        """처음 보는 행만 새 세그먼트로 저장 (저장한 행 수 반환)"""
+        probe = pd.DataFrame({"_h1": hashes[:, 0], "_h2": hashes[:, 1]})
+        index = self._load_index()
+        merged = probe.merge(index[HASH_COLUMNS], on=HASH_COLUMNS, how="left", indicator=True)
+        is_new = (merged["_merge"] == "left_only").to_numpy() & ~probe.duplicated().to_numpy()
+        if not is_new.any():
+            return 0
+
+        seq = self._next_segment_seq()
+        rows = df[is_new].reset_index(drop=True)
+        new_hashes = probe[is_new].reset_index(drop=True)
+        self._write_parquet(pa.Table.from_pandas(pd.concat([new_hashes, rows], axis=1), preserve_index=False),
+                            self._segment_path(seq))
+        # 세그먼트가 기록된 뒤 인덱스 기록 (인덱스에 있는 행은 항상 세그먼트에 있음)
+        self._write_parquet(pa.Table.from_pandas(new_hashes, preserve_index=False), self._index_path(seq))
+        self._index = pd.concat([index, new_hashes.assign(segment=seq)], ignore_index=True)
+        return len(rows)
+
+    def _write_chunk(self, hashes: np.ndarray) -> str:
+        """청크(행 해시 목록)를 내용 해시 이름으로 저장 (이미 있으면 재사용)"""
+        hashes = np.ascontiguousarray(hashes, dtype=np.uint64)
+        digest = hashlib.blake2b(hashes.tobytes(), digest_size=16).hexdigest()
+        path = self._chunk_path(digest)
+        if not os.path.exists(path):
+            with open(path + ".tmp", "wb") as f:
+                np.save(f, hashes)
+            os.replace(path + ".tmp", path)
+        return digest
+
+    def _store_table(self, data: TableData, key: Optional[str]) -> Dict[str, Any]:
+        """테이블 하나를 청크로 나눠 저장하고 매니페스트 항목 반환"""
+        if isinstance(data, pd.DataFrame):
+            if key and key in data.columns:
+                data = data.sort_values(key, kind="stable")
+            data = [data]
+
+        columns: Optional[List[str]] = None
+        chunks: List[str] = []
+        total_rows = new_rows = 0
+        carry = np.empty((0, 2), dtype=np.uint64)
+        # 여러 DataFrame으로 나눠 받으면 기본 키 순서로 정렬되어 있다고 가정
+        for df in data:
+            if df is None or df.empty:
+                continue
+            df = df.reset_index(drop=True)
+            if columns is None:
+                columns = [str(col) for col in df.columns]
+            df.columns = columns
+            hashes = row_hashes(df)
+            new_rows += self._store_rows(df, hashes)
+            total_rows += len(df)
+
+            # 기본 키 해시가 CHUNK_TARGET_ROWS로 나누어떨어지는 행 다음에서 청크를 나눔
+            boundary_hash = (
+                pd.util.hash_pandas_object(df[key], index=False).to_numpy()
+                if key and key in df.columns else hashes[:, 0]
+            )
+            ends = np.flatnonzero(boundary_hash % CHUNK_TARGET_ROWS == 0) + 1
+            pieces = np.split(hashes, ends)
+            pieces[0] = np.concatenate([carry, pieces[0]])
+            for piece in pieces[:-1]:
+                if len(piece):
+                    chunks.append(self._write_chunk(piece))
+            carry = pieces[-1]
+        if len(carry):
+            chunks.append(self._write_chunk(carry))
+
+        return {"columns": columns or [], "key": key, "rows": total_rows, "new_rows": new_rows, "chunks": chunks}
+
+    def create_snapshot(self, tables: Dict[str, Tuple[TableData, Optional[str]]], label: str = "snapshot") -> str:
+        """
+        스냅샷 생성 후 보존 개수를 넘는 같은 레이블의 오래된 스냅샷 정리
+
+        Args:
+            tables: 테이블명 -> (DataFrame 또는 기본 키 순으로 정렬된 DataFrame 묶음, 기본 키 컬럼)
+            label: 스냅샷 종류 (예: 'crawl', 'etl'). 보존 개수는 레이블별로 적용
+
+        Returns:
+            스냅샷 ID
+        """
+        created_at = datetime.now()
+        snapshot_id = f"{label}-{created_at.strftime('%Y%m%d_%H%M%S_%f')}"
+        manifest = {
+            "id": snapshot_id,
+            "label": label,
+            "created_at": created_at.isoformat(),
+            "tables": {name: self._store_table(data, key) for name, (data, key) in tables.items()},
+        }
+
+        path = os.path.join(self.manifest_dir, f"{snapshot_id}.json")
+        with open(path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+        os.replace(path + ".tmp", path)
+
+        summary = ", ".join(
+            f"{name} {info['rows']}행(새 행 {info['new_rows']})" for name, info in manifest["tables"].items()
+        )
+        logging.info(f"백업 스냅샷 생성: {snapshot_id} ({summary})")
+        self.prune(label)
+        return snapshot_id
+
+    # --- 조회/복원 ---
+
+    def list_snapshots(self, label: Optional[str] = None) -> List[Dict[str, Any]]:
+        """스냅샷 매니페스트 목록 (생성 시각 순)"""
+        manifests = []
+        for path in glob.glob(os.path.join(self.manifest_dir, "*.json")):
+            with open(path, "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+            if label is None or manifest.get("label") == label:
+                manifests.append(manifest)
+        return sorted(manifests, key=lambda m: m["created_at"])
+
+    def resolve(self, snapshot_id: Optional[str] = None, as_of: Optional[Union[str, datetime]] = None,
+                label: Optional[str] = None) -> Dict[str, Any]:
+        """
+        스냅샷 매니페스트 찾기
+
+        Args:
+            snapshot_id: 스냅샷 ID (지정하면 그대로 사용)
+            as_of: 이 시각 이전의 가장 최근 스냅샷 (시점 복원)
+            label: 스냅샷 종류 필터
+        """
+        if snapshot_id:
+            path = os.path.join(self.manifest_dir, f"{snapshot_id}.json")
+            if not os.path.exists(path):
+                raise FileNotFoundError(f"백업 스냅샷을 찾을 수 없습니다: {snapshot_id}")
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+
+        manifests = self.list_snapshots(label)
+        if as_of is not None:
+            as_of = as_of.isoformat() if isinstance(as_of, datetime) else datetime.fromisoformat(as_of).isoformat()
+            manifests = [m for m in manifests if m["created_at"] <= as_of]
+        if not manifests:
+            raise FileNotFoundError(f"조건에 맞는 백업 스냅샷이 없습니다 (label={label}, as_of={as_of})")
+        return manifests[-1]
+
+    def _chunk_hashes(self, chunks: List[str]) -> np.ndarray:
+        if not chunks:
+            return np.empty((0, 2), dtype=np.uint64)
+        return np.concatenate([np.load(self._chunk_path(digest)) for digest in chunks])
+
+    def restore(self, table: str, snapshot_id: Optional[str] = None, as_of: Optional[Union[str, datetime]] = None,
+                label: Optional[str] = None) -> pd.DataFrame:
+        """
+        스냅샷 시점의 테이블 복원 (기본 키 순서)
+
+        필요한 행이 든 세그먼트만 읽습니다.
+        """
+        manifest = self.resolve(snapshot_id, as_of, label)
+        if table not in manifest["tables"]:
+            raise KeyError(f"스냅샷 {manifest['id']}에 {table} 테이블이 없습니다.")
+        info = manifest["tables"][table]
+
+        hashes = self._chunk_hashes(info["chunks"])
+        probe = pd.DataFrame({"_h1": hashes[:, 0], "_h2": hashes[:, 1]})
+        located = probe.drop_duplicates().merge(self._load_index(), on=HASH_COLUMNS, how="left")
+        if located["segment"].isna().any():
+            raise ValueError(f"스냅샷 {manifest['id']}의 {table} 행 일부가 백업 세그먼트에 없습니다.")
+
+        frames = []
+        for seq, wanted in located.groupby("segment"):
+            rows = pq.read_table(self._segment_path(int(seq))).to_pandas()
+            frames.append(rows.merge(wanted[HASH_COLUMNS], on=HASH_COLUMNS, how="inner"))
+        rows = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=HASH_COLUMNS + info["columns"])
+
+        restored = probe.merge(rows, on=HASH_COLUMNS, how="left")
+        return restored[info["columns"]]
+
+    # --- 보존/정리 ---
+
+    def prune(self, label: Optional[str] = None) -> int:
+        """
+        레이블별로 최근 retention개를 넘는 스냅샷을 삭제하고 참조되지 않는 청크/행 정리
+
+        Returns:
+            삭제한 스냅샷 수
+        """
+        if self.retention <= 0:
+            return 0
+        by_label: Dict[str, List[Dict[str, Any]]] = {}
+        for manifest in self.list_snapshots(label):
+            by_label.setdefault(manifest["label"], []).append(manifest)
+
+        removed = 0
+        for manifests in by_label.values():
+            for manifest in manifests[:-self.retention]:
+                os.remove(os.path.join(self.manifest_dir, f"{manifest['id']}.json"))
+                removed += 1
+        if removed:
+            logging.info(f"오래된 백업 스냅샷 {removed}개 삭제")
+            self.collect_garbage()
+        return removed
+
+    def collect_garbage(self) -> None:
+        """남은 스냅샷이 참조하지 않는 청크를 삭제하고, 죽은 행이 많은 세그먼트는 다시 쓰거나 삭제"""
+        live_chunks = {digest for m in self.list_snapshots() for info in m["tables"].values() for digest in info["chunks"]}
+        for path in glob.glob(os.path.join(self.chunk_dir, "*.npy")):
+            if os.path.basename(path)[:-len(".npy")] not in live_chunks:
+                os.remove(path)
+
+        live = self._chunk_hashes(sorted(live_chunks))
+        live_df = pd.DataFrame({"_h1": live[:, 0], "_h2": live[:, 1]}).drop_duplicates()
+        index = self._load_index().merge(live_df.assign(_live=True), on=HASH_COLUMNS, how="left")
+        index["_live"] = index["_live"].notna()
+
+        kept = []
+        for seq, rows in index.groupby("segment"):
+            seq = int(seq)
+            live_rows = rows[rows["_live"]]
+            if live_rows.empty:
+                os.remove(self._index_path(seq))
+                os.remove(self._segment_path(seq))
+                continue
+            if len(live_rows) < GC_REWRITE_RATIO * len(rows):
+                segment = pq.read_table(self._segment_path(seq)).to_pandas()
+                segment = segment.merge(live_rows[HASH_COLUMNS], on=HASH_COLUMNS, how="inner")
+                self._write_parquet(pa.Table.from_pandas(segment, preserve_index=False), self._segment_path(seq))
+                self._write_parquet(pa.Table.from_pandas(segment[HASH_COLUMNS], preserve_index=False),
+                                    self._index_path(seq))
+            kept.append(live_rows[HASH_COLUMNS + ["segment"]])
+
+        self._index = pd.concat(kept, ignore_index=True) if kept else None
+        logging.info(f"백업 정리 완료: 청크 {len(live_chunks)}개, 행 {len(live_df)}개 유지")
@@ -0,0 +1,193 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+크롤링 체크포인트 저널 모듈
+
+처리한 사용자 전체를 DataFrame으로 만들어 체크포인트 CSV를 매번 다시 쓰면
+처리한 사용자가 늘수록 저장 비용도 커집니다. 저널은 사용자 한 명이 끝날 때마다
+`username<TAB>status<TAB>timestamp` 한 줄을 추가하고, fsync는 일정 건수/시간마다 묶어서 합니다.
+로드는 한 줄씩 읽어 집합을 만들고, 같은 사용자의 줄이 쌓이면 사용자당 한 줄로 압축합니다.
+"""
+
+import os
+import time
+import logging
+import threading
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+# --- 상수 정의 ---
+STATUS_DONE = "done"
+STATUS_FAILED = "failed"
+FSYNC_BATCH_SIZE = 50        # 이 건수만큼 기록하면 fsync
+FSYNC_INTERVAL = 5.0         # 마지막 fsync 후 이 시간(초)이 지나면 fsync
+COMPACT_MIN_LINES = 10000    # 압축을 고려할 최소 줄 수
+COMPACT_RATIO = 2.0          # 줄 수가 고유 사용자 수의 이 배수를 넘으면 압축
+FIELD_SEPARATOR = "\t"
+
+
+class CheckpointJournal:
+    """추가 전용 체크포인트 저널 (사용자명, 상태, 시각)"""
+
+    def __init__(self, path: str, legacy_csv_path: Optional[str] = None):
+        """
+        초기화
+
+        Args:
+            path: 저널 파일 경로
+            legacy_csv_path: 기존 체크포인트 CSV 경로 (저널이 없으면 한 번 가져옴)
+        """
+        self.path = path
+        self.legacy_csv_path = legacy_csv_path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+        self._lock = threading.RLock()
+        self._file = None
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+        # 압축 판단용 (load 또는 첫 기록 시 계산)
+        self._line_count = 0
+        # 사용자명 -> (상태, 시각)
+        self._statuses: Optional[Dict[str, Tuple[str, str]]] = None
+
+    def _open(self):
+        if self._file is None:
+            # 중단으로 마지막 줄이 잘렸으면 줄을 바꾼 뒤 이어 씀 (잘린 줄은 로드 시 건너뜀)
+            torn = False
+            if os.path.exists(self.path) and os.path.getsize(self.path) > 0:
+                with open(self.path, 'rb') as f:
+                    f.seek(-1, os.SEEK_END)
+                    torn = f.read(1) != b"\n"
+            self._file = open(self.path, 'a', encoding='utf-8')
+            if torn:
+                self._file.write("\n")
+        return self._file
+
+    def _import_legacy_csv(self) -> None:
+        """기존 체크포인트 CSV(username 컬럼)를 저널로 변환"""
+        if os.path.exists(self.path) or not self.legacy_csv_path or not os.path.exists(self.legacy_csv_path):
+            return
+        timestamp = datetime.now().isoformat(timespec='seconds')
+        with open(self.legacy_csv_path, 'r', encoding='utf-8') as src, open(self.path + ".tmp", 'w', encoding='utf-8') as dst:
+            header = src.readline().rstrip("\n").split(",")
+            column = header.index("username") if "username" in header else 0
+            for line in src:
+                fields = line.rstrip("\n").split(",")
+                if len(fields) > column and fields[column]:
+                    dst.write(f"{fields[column]}{FIELD_SEPARATOR}{STATUS_DONE}{FIELD_SEPARATOR}{timestamp}\n")
+            dst.flush()
+            os.fsync(dst.fileno())
+        os.replace(self.path + ".tmp", self.path)
+        logging.info(f"기존 체크포인트 CSV를 저널로 변환: {self.legacy_csv_path} -> {self.path}")
+
+    def entries(self) -> Iterator[Tuple[str, str, str]]:
+        """저널 항목을 한 줄씩 읽기 (중단으로 잘린 마지막 줄 등 형식이 맞지 않는 줄은 건너뜀)"""
+        self._import_legacy_csv()
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if not line.endswith("\n"):
+                    continue
+                fields = line.rstrip("\n").split(FIELD_SEPARATOR)
+                if len(fields) == 3 and fields[0]:
+                    yield fields[0], fields[1], fields[2]
+
+    def load_statuses(self) -> Dict[str, str]:
+        """사용자별 마지막 상태 (기록 순서 유지)"""
+        with self._lock:
+            # 아직 버퍼에 있는 기록도 읽히도록 먼저 flush
+            if self._file is not None:
+                self._file.flush()
+            statuses = {}
+            line_count = 0
+            for username, status, timestamp in self.entries():
+                statuses[username] = (status, timestamp)
+                line_count += 1
+            self._statuses = statuses
+            self._line_count = line_count
+            return {username: status for username, (status, _) in statuses.items()}
+
+    def load(self) -> Set[str]:
+        """처리 완료(done) 상태인 사용자명 집합"""
+        return {username for username, status in self.load_statuses().items() if status == STATUS_DONE}
+
+    def usernames(self) -> List[str]:
+        """저널에 기록된 모든 사용자명 (처음 기록된 순서)"""
+        return list(self.load_statuses())
+
+    def record(self, username: str, status: str = STATUS_DONE) -> None:
+        """사용자 처리 결과 한 줄 추가 (FSYNC_BATCH_SIZE건 또는 FSYNC_INTERVAL초마다 fsync)"""
+        with self._lock:
+            if self._statuses is None:
+                self.load_statuses()
+            timestamp = datetime.now().isoformat(timespec='seconds')
+            self._open().write(f"{username}{FIELD_SEPARATOR}{status}{FIELD_SEPARATOR}{timestamp}\n")
+            self._statuses[username] = (status, timestamp)
+            self._line_count += 1
+            self._unsynced += 1
+            if self._unsynced >= FSYNC_BATCH_SIZE or time.monotonic() - self._last_sync >= FSYNC_INTERVAL:
+                self._sync_locked()
+
+    def _sync_locked(self) -> None:
+        if self._file is not None and self._unsynced:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def sync(self) -> None:
+        """기록된 항목을 디스크에 반영 (fsync)"""
+        with self._lock:
+            self._sync_locked()
+
+    def needs_compaction(self) -> bool:
+        """같은 사용자의 줄이 많이 쌓였는지 여부"""
+        with self._lock:
+            return (
+                self._statuses is not None
+                and self._line_count >= COMPACT_MIN_LINES
+                and self._line_count > COMPACT_RATIO * max(len(self._statuses), 1)
+            )
+
+    def compact(self) -> int:
+        """
+        사용자당 마지막 상태 한 줄만 남기도록 저널 재작성 (임시 파일 -> rename)
+
+        Returns:
+            압축 후 줄 수
+        """
+        with self._lock:
+            if self._statuses is None:
+                self.load_statuses()
+            self._sync_locked()
+            statuses = self._statuses
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                for username, (status, timestamp) in statuses.items():
+                    f.write(f"{username}{FIELD_SEPARATOR}{status}{FIELD_SEPARATOR}{timestamp}\n")
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+
+            logging.info(f"체크포인트 저널 압축: {self._line_count}줄 -> {len(statuses)}줄 ({self.path})")
+            self._line_count = len(statuses)
+            return self._line_count
+
+    def maybe_compact(self) -> None:
+        """압축이 필요하면 압축"""
+        if self.needs_compaction():
+            self.compact()
+
+    def close(self) -> None:
+        """fsync 후 파일 닫기"""
+        with self._lock:
+            self._sync_locked()
+            if self._file is not None:
+                self._file.close()
+                self._file = None
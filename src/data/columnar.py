@@ -0,0 +1,196 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+컬럼 기반 저장 모듈 - 크롤링 결과 Parquet 데이터셋 읽기/쓰기
+
+CSV는 파싱이 느리고 타입(타임스탬프, BIGINT, BOOLEAN)을 잃으며 용량도 큽니다.
+크롤링 결과를 DB 테이블과 같은 스키마의 Parquet(zstd 압축)으로 저장하고,
+수집 날짜(crawl_date)별 디렉토리로 파티션합니다.
+
+    data/influencers/crawl_date=2025-05-08/part-20250508_153000_000000.parquet
+    data/posts/crawl_date=2025-05-08/part-20250508_153000_000000.parquet
+
+읽을 때는 필요한 컬럼만 읽고(컬럼 프로젝션), 데이터셋이 없으면 기존 CSV(data/<테이블>.csv)를 읽습니다.
+"""
+
+import os
+import logging
+from datetime import datetime
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+# --- 상수 정의 ---
+PARQUET_COMPRESSION = "zstd"
+PARTITION_COLUMN = "crawl_date"
+CRAWLED_AT_COLUMN = "crawled_at"
+# 행 내용 해시 (DB에 저장해 재수집 시 바뀐 행만 기록)
+CONTENT_HASH_COLUMN = "content_hash"
+CONTENT_HASH_KEY = "mvp-content-hash"  # hash_pandas_object 해시 키 (16자)
+
+# 테이블 컬럼 순서와 결측 시 기본값 (CREATE TABLE 정의와 동일한 순서)
+INFLUENCER_DEFAULTS = {
+    'username': '', 'pk': 0, 'full_name': '', 'follower_count': 0, 'following_count': 0,
+    'media_count': 0, 'biography': '', 'category': '', 'external_url': '',
+    'is_private': False, 'is_verified': False,
+}
+POST_DEFAULTS = {
+    'id': '', 'user_pk': 0, 'username': '', 'caption': '', 'like_count': 0, 'comment_count': 0,
+    'taken_at': None, 'media_type': 0, 'product_type': '', 'image_url': '', 'video_url': '',
+}
+INFLUENCER_COLUMNS = list(INFLUENCER_DEFAULTS)
+POST_COLUMNS = list(POST_DEFAULTS)
+# 문자열로 변환할 URL 컬럼 (HttpUrl 객체 등)
+URL_COLUMNS = ('external_url', 'image_url', 'video_url')
+
+# DB 테이블(CREATE TABLE)과 같은 타입 + 수집 시각
+INFLUENCER_SCHEMA = pa.schema([
+    ("username", pa.string()),
+    ("pk", pa.int64()),
+    ("full_name", pa.string()),
+    ("follower_count", pa.int32()),
+    ("following_count", pa.int32()),
+    ("media_count", pa.int32()),
+    ("biography", pa.string()),
+    ("category", pa.string()),
+    ("external_url", pa.string()),
+    ("is_private", pa.bool_()),
+    ("is_verified", pa.bool_()),
+    (CRAWLED_AT_COLUMN, pa.timestamp("us")),
+])
+POST_SCHEMA = pa.schema([
+    ("id", pa.string()),
+    ("user_pk", pa.int64()),
+    ("username", pa.string()),
+    ("caption", pa.string()),
+    ("like_count", pa.int32()),
+    ("comment_count", pa.int32()),
+    ("taken_at", pa.timestamp("us")),
+    ("media_type", pa.int32()),
+    ("product_type", pa.string()),
+    ("image_url", pa.string()),
+    ("video_url", pa.string()),
+    (CRAWLED_AT_COLUMN, pa.timestamp("us")),
+])
+
+# 테이블별 스키마, 기본값, 중복 제거 키 (인플루언서/게시물 모두 최신 수집 유지, DB upsert와 동일)
+TABLES = {
+    "influencers": (INFLUENCER_SCHEMA, INFLUENCER_DEFAULTS, "username", "last"),
+    "posts": (POST_SCHEMA, POST_DEFAULTS, "id", "last"),
+}
+
+
+def normalize_records(df, defaults):
+    """
+    DataFrame을 테이블 컬럼 순서와 타입에 맞게 정리 (save_influencer/save_post의 행 단위 변환을 컬럼 단위로 수행)
+
+    - 없는 컬럼과 결측값은 기본값으로 채움
+    - URL 컬럼은 값이 있으면 문자열로, 없으면 빈 문자열로 변환
+    - taken_at은 ISO 문자열/datetime을 TIMESTAMP로 변환하고, 없거나 변환할 수 없으면 NULL(NaT)로 둠
+      (현재 시각으로 채우면 같은 행도 저장할 때마다 내용 해시가 바뀌어 매번 변경으로 기록됨)
+    """
+    df = df.reindex(columns=list(defaults))
+    for column, default in defaults.items():
+        values = df[column]
+        if column in URL_COLUMNS:
+            valid = values.notna() & values.astype(bool)
+            df[column] = values.where(valid, '').astype(str)
+        elif column == 'taken_at':
+            df[column] = pd.to_datetime(values, errors='coerce', utc=True, format='ISO8601').dt.tz_convert(None)
+        elif isinstance(default, bool):
+            df[column] = values.fillna(default).astype(bool)
+        elif isinstance(default, int):
+            df[column] = pd.to_numeric(values, errors='coerce').fillna(default).astype('int64')
+        else:
+            df[column] = values.fillna(default).astype(str)
+    return df
+
+
+def content_hashes(df: pd.DataFrame) -> np.ndarray:
+    """
+    normalize_records로 정리한 레코드의 행 내용 해시 (uint64)
+
+    모든 컬럼 값이 같으면 해시도 같으므로, 저장된 해시와 비교해 바뀐 행만 골라낼 수 있습니다.
+    """
+    return pd.util.hash_pandas_object(df, index=False, hash_key=CONTENT_HASH_KEY).to_numpy()
+
+
+def to_arrow_table(df: pd.DataFrame, table: str, crawled_at: Optional[datetime] = None) -> pa.Table:
+    """크롤링 결과 DataFrame을 테이블 스키마의 Arrow 테이블로 변환 (스키마에 없는 컬럼은 제외)"""
+    schema, defaults, _, _ = TABLES[table]
+    df = normalize_records(df, defaults)
+    df[CRAWLED_AT_COLUMN] = pd.Timestamp(crawled_at or datetime.now())
+    return pa.Table.from_pandas(df, schema=schema, preserve_index=False)
+
+
+def write_crawl_dataset(df: pd.DataFrame, table: str, data_dir: str = "data",
+                        crawled_at: Optional[datetime] = None) -> Optional[str]:
+    """
+    크롤링 결과를 수집 날짜 파티션에 새 Parquet 파일로 추가 (기존 파일은 건드리지 않음)
+
+    Returns:
+        기록한 파티션 디렉토리 (데이터가 없으면 None)
+    """
+    if df is None or df.empty:
+        return None
+    crawled_at = crawled_at or datetime.now()
+    arrow_table = to_arrow_table(df, table, crawled_at)
+    crawl_date = crawled_at.strftime("%Y-%m-%d")
+    partition_dir = os.path.join(data_dir, table, f"{PARTITION_COLUMN}={crawl_date}")
+    os.makedirs(partition_dir, exist_ok=True)
+
+    path = os.path.join(partition_dir, f"part-{crawled_at.strftime('%Y%m%d_%H%M%S_%f')}.parquet")
+    pq.write_table(arrow_table, path, compression=PARQUET_COMPRESSION)
+    logging.info(f"{table} {arrow_table.num_rows}건을 Parquet로 저장했습니다: {path}")
+    return partition_dir
+
+
+def crawl_dataset_exists(table: str, data_dir: str = "data") -> bool:
+    """테이블의 Parquet 데이터셋 존재 여부"""
+    dataset_dir = os.path.join(data_dir, table)
+    return os.path.isdir(dataset_dir) and any(
+        name.endswith(".parquet") for _, _, files in os.walk(dataset_dir) for name in files
+    )
+
+
+def read_crawl_table(table: str, data_dir: str = "data", columns: Optional[List[str]] = None,
+                     since: Optional[str] = None, dedupe: bool = True) -> pd.DataFrame:
+    """
+    크롤링 결과 읽기 (Parquet 데이터셋 우선, 없으면 CSV)
+
+    Args:
+        table: 'influencers' 또는 'posts'
+        data_dir: 데이터 디렉토리
+        columns: 읽을 컬럼 (None이면 전체). 존재하지 않는 컬럼은 무시
+        since: 이 날짜(YYYY-MM-DD) 이후 파티션만 읽기 (Parquet만 해당)
+        dedupe: 여러 번 수집된 레코드의 중복 제거 여부 (키 컬럼이 결과에 있을 때만)
+    """
+    _, _, key, keep = TABLES[table]
+
+    if crawl_dataset_exists(table, data_dir):
+        dataset = ds.dataset(os.path.join(data_dir, table), format="parquet", partitioning="hive")
+        available = dataset.schema.names
+        selected = available if columns is None else [col for col in columns if col in available]
+        # 중복 제거 시 수집 순서를 알아야 하므로 수집 시각도 함께 읽음
+        read_columns = list(dict.fromkeys(
+            selected + ([CRAWLED_AT_COLUMN] if dedupe and key in selected and CRAWLED_AT_COLUMN in available else [])
+        ))
+        row_filter = (ds.field(PARTITION_COLUMN) >= since) if since else None
+        df = dataset.to_table(columns=read_columns, filter=row_filter).to_pandas()
+        if dedupe and key in df.columns and CRAWLED_AT_COLUMN in df.columns:
+            df = df.sort_values(CRAWLED_AT_COLUMN, kind='stable').drop_duplicates(subset=[key], keep=keep)
+        if PARTITION_COLUMN in df.columns:
+            df[PARTITION_COLUMN] = df[PARTITION_COLUMN].astype(str)
+        return df[selected].reset_index(drop=True)
+
+    csv_path = os.path.join(data_dir, f"{table}.csv")
+    usecols = None if columns is None else (lambda col: col in columns)
+    df = pd.read_csv(csv_path, encoding='utf-8-sig', usecols=usecols)
+    if columns is not None:
+        df = df[[col for col in columns if col in df.columns]]
+    return df
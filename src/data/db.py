@@ -4,17 +4,45 @@ import duckdb
 import pandas as pd
 from datetime import datetime
 
+from .columnar import (
+    INFLUENCER_COLUMNS, INFLUENCER_DEFAULTS, POST_COLUMNS, POST_DEFAULTS, CONTENT_HASH_COLUMN,
+    content_hashes, normalize_records, write_crawl_dataset
+)
+from .checkpoint import CheckpointJournal, STATUS_DONE
+from .backup_store import BackupStore, BACKUP_DIR_NAME
+
+# --- 상수 정의 ---
+# 한 번의 INSERT ... ON CONFLICT로 보낼 최대 행 수
+BULK_BATCH_SIZE = 50000
+# 체크포인트 저널 (기존 CSV 체크포인트는 저널이 없을 때 한 번 변환)
+CHECKPOINT_JOURNAL_NAME = "crawler_checkpoint.journal"
+LEGACY_CHECKPOINT_NAME = "crawler_checkpoint.csv"
+# 최종 결과 저장 형식 (쉼표 구분: parquet, csv)
+EXPORT_FORMATS = tuple(fmt.strip() for fmt in os.getenv("CRAWL_EXPORT_FORMATS", "parquet").split(",") if fmt.strip())
+
+
 class DatabaseManager:
     """데이터베이스 연결 및 데이터 저장/로드 관리"""
     
-    def __init__(self, data_dir="data", db_name="instagram.db"):
+    def __init__(self, data_dir="data", db_name="instagram.db", export_formats=None):
         self.data_dir = data_dir
         self.db_path = os.path.join(data_dir, db_name)
         self.conn = None
+        # 최종 결과 저장 형식 ('parquet': 수집 날짜 파티션 Parquet, 'csv': 기존 CSV 내보내기)
+        self.export_formats = tuple(export_formats or EXPORT_FORMATS)
         
         # 디렉토리가 없으면 생성
         os.makedirs(data_dir, exist_ok=True)
         
+        # 처리 완료 사용자 체크포인트 저널
+        self.checkpoint = CheckpointJournal(
+            os.path.join(data_dir, CHECKPOINT_JOURNAL_NAME),
+            legacy_csv_path=os.path.join(data_dir, LEGACY_CHECKPOINT_NAME)
+        )
+        
+        # 백업 스냅샷 저장소 (행 단위 중복 제거)
+        self.backup_store = BackupStore(os.path.join(data_dir, BACKUP_DIR_NAME))
+        
         # 연결 초기화
         self.init_database()
     
@@ -36,7 +64,8 @@ class DatabaseManager:
                     category VARCHAR,
                     external_url VARCHAR,
                     is_private BOOLEAN,
-                    is_verified BOOLEAN
+                    is_verified BOOLEAN,
+                    content_hash UBIGINT
                 )
             """)
             
@@ -53,10 +82,15 @@ class DatabaseManager:
                     media_type INT,
                     product_type VARCHAR,
                     image_url VARCHAR,
-                    video_url VARCHAR
+                    video_url VARCHAR,
+                    content_hash UBIGINT
                 )
             """)
             
+            # 내용 해시 컬럼이 없던 기존 DB는 컬럼 추가 (기존 행은 다음 저장 때 바뀐 행으로 취급되어 해시가 채워짐)
+            for table in ('influencers', 'posts'):
+                self.conn.execute(f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS {CONTENT_HASH_COLUMN} UBIGINT")
+            
             logging.info("데이터베이스 초기화 완료")
             return True
         except Exception as e:
@@ -72,8 +106,8 @@ class DatabaseManager:
             # HttpUrl 객체는 문자열로 변환
             external_url = str(influencer.get('external_url', '')) if influencer.get('external_url') else ''
             
-            self.conn.execute("""
-                INSERT OR REPLACE INTO influencers 
+            self.conn.execute(f"""
+                INSERT OR REPLACE INTO influencers ({", ".join(INFLUENCER_COLUMNS)})
                 VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
             """, (
                 influencer.get('username', ''),
@@ -111,8 +145,8 @@ class DatabaseManager:
                 except:
                     taken_at = datetime.now()
             
-            self.conn.execute("""
-                INSERT OR IGNORE INTO posts 
+            self.conn.execute(f"""
+                INSERT OR IGNORE INTO posts ({", ".join(POST_COLUMNS)})
                 VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
             """, (
                 post.get('id', ''),
@@ -132,93 +166,210 @@ class DatabaseManager:
             logging.error(f"게시물 DB 저장 오류: {str(e)}")
             return False
     
+    def _bulk_insert(self, table, df, key):
+        """
+        DataFrame을 DuckDB에 등록하고 배치마다 새 행/바뀐 행만 한 번의 INSERT ... ON CONFLICT DO UPDATE로 기록
+
+        행마다 내용 해시(content_hash)를 계산해 DB에 저장된 해시와 비교하므로,
+        재수집한 행이 그대로면 쓰지 않습니다.
+
+        Args:
+            table: 대상 테이블명
+            df: normalize_records로 정리한 DataFrame
+            key: 기본 키 컬럼
+
+        Returns:
+            변경 집합 DataFrame (실제로 기록한 행 + change_type: 'insert' 또는 'update')
+        """
+        # 같은 명령 안에서 한 행을 두 번 갱신할 수 없으므로 배치 내 중복 키를 먼저 제거 (마지막 수집 유지)
+        df = df.drop_duplicates(subset=[key], keep='last').reset_index(drop=True)
+        df[CONTENT_HASH_COLUMN] = content_hashes(df)
+        columns = ", ".join(df.columns)
+        batch_columns = ", ".join(f"b.{col}" for col in df.columns)
+        assignments = ", ".join(f"{col} = excluded.{col}" for col in df.columns if col != key)
+        view_name = f"{table}_batch"
+        # 새 키이거나 저장된 해시와 다른 행
+        changed_rows = f"""
+            FROM {view_name} b LEFT JOIN {table} t ON t.{key} = b.{key}
+            WHERE t.{key} IS NULL OR t.{CONTENT_HASH_COLUMN} IS DISTINCT FROM b.{CONTENT_HASH_COLUMN}
+        """
+
+        changes = []
+        for start in range(0, len(df), BULK_BATCH_SIZE):
+            batch = df.iloc[start:start + BULK_BATCH_SIZE]
+            self.conn.register(view_name, batch)
+            try:
+                changed = self.conn.execute(f"""
+                    SELECT b.{key}, CASE WHEN t.{key} IS NULL THEN 'insert' ELSE 'update' END AS change_type
+                    {changed_rows}
+                """).df()
+                if changed.empty:
+                    continue
+                self.conn.execute(f"""
+                    INSERT INTO {table} ({columns})
+                    SELECT {batch_columns} {changed_rows}
+                    ON CONFLICT ({key}) DO UPDATE SET {assignments}
+                """)
+                changes.append(batch.merge(changed, on=key))
+            finally:
+                self.conn.unregister(view_name)
+
+        if not changes:
+            return df.iloc[0:0].assign(change_type=pd.Series(dtype=str))
+        return pd.concat(changes, ignore_index=True)
+
+    def save_influencers_bulk(self, influencers_df, raise_errors=False):
+        """
+        인플루언서 DataFrame 일괄 저장 (username 기준, 바뀐 행만 upsert). 변경 집합 반환
+
+        raise_errors가 True이면 저장 오류(DB 연결 없음 포함)를 기록만 하지 않고 그대로 발생시킵니다
+        (세그먼트 저장 경로처럼 저장 실패를 호출 측이 알아야 하는 경우).
+        """
+        if influencers_df is None or influencers_df.empty:
+            return pd.DataFrame()
+        if not self.conn:
+            if raise_errors:
+                raise RuntimeError("DB 연결이 없어 인플루언서 데이터를 저장할 수 없습니다.")
+            return pd.DataFrame()
+
+        try:
+            return self._bulk_insert('influencers', normalize_records(influencers_df, INFLUENCER_DEFAULTS), 'username')
+        except Exception as e:
+            logging.error(f"인플루언서 DB 일괄 저장 오류: {str(e)}")
+            if raise_errors:
+                raise
+            return pd.DataFrame()
+
+    def save_posts_bulk(self, posts_df, raise_errors=False):
+        """
+        게시물 DataFrame 일괄 저장 (id 기준, 바뀐 행만 upsert). 변경 집합 반환
+
+        raise_errors가 True이면 저장 오류(DB 연결 없음 포함)를 기록만 하지 않고 그대로 발생시킵니다
+        (세그먼트 저장 경로처럼 저장 실패를 호출 측이 알아야 하는 경우).
+        """
+        if posts_df is None or posts_df.empty:
+            return pd.DataFrame()
+        if not self.conn:
+            if raise_errors:
+                raise RuntimeError("DB 연결이 없어 게시물 데이터를 저장할 수 없습니다.")
+            return pd.DataFrame()
+
+        try:
+            return self._bulk_insert('posts', normalize_records(posts_df, POST_DEFAULTS), 'id')
+        except Exception as e:
+            logging.error(f"게시물 DB 일괄 저장 오류: {str(e)}")
+            if raise_errors:
+                raise
+            return pd.DataFrame()
+
     def save_data_to_csv(self, influencers, posts, is_temp=False):
         """수집된 데이터를 CSV 파일로 저장"""
+        influencers_df = pd.DataFrame(list(influencers.values())) if influencers else None
+        posts_df = pd.DataFrame(posts) if posts else None
+        self.export_csv(influencers_df, posts_df, is_temp=is_temp)
+
+        # DB에도 저장 (바뀐 행만 일괄 upsert)
+        self.save_influencers_bulk(influencers_df)
+        self.save_posts_bulk(posts_df)
+        if not is_temp:
+            self.backup_snapshot()
+
+    def export(self, influencers_df, posts_df, append=False):
+        """
+        최종 결과를 설정된 형식(export_formats)으로 저장 (DB 저장 없음)
+
+        append가 True이면 CSV를 덮어쓰지 않고 이어서 씁니다 (Parquet는 항상 새 파일로 추가).
+        """
+        if 'parquet' in self.export_formats:
+            write_crawl_dataset(influencers_df, 'influencers', self.data_dir)
+            write_crawl_dataset(posts_df, 'posts', self.data_dir)
+        if 'csv' in self.export_formats:
+            self.export_csv(influencers_df, posts_df, append=append)
+
+    def backup_snapshot(self, label="crawl"):
+        """
+        DB의 인플루언서/게시물 테이블 전체를 백업 스냅샷으로 저장 (기본 키 순으로 BULK_BATCH_SIZE행씩 읽음)
+
+        바뀌지 않은 행은 이전 스냅샷의 행을 재사용하므로 새로 저장되는 양은 변경분뿐입니다.
+
+        Returns:
+            스냅샷 ID (실패 시 None)
+        """
+        def batches(table, key):
+            reader = self.conn.execute(f"SELECT * FROM {table} ORDER BY {key}").fetch_record_batch(BULK_BATCH_SIZE)
+            for batch in reader:
+                yield batch.to_pandas()
+
+        try:
+            return self.backup_store.create_snapshot({
+                'influencers': (batches('influencers', 'username'), 'username'),
+                'posts': (batches('posts', 'id'), 'id'),
+            }, label=label)
+        except Exception as e:
+            logging.warning(f"백업 스냅샷 생성 실패: {str(e)}")
+            return None
+
+    def export_csv(self, influencers_df, posts_df, is_temp=False, append=False):
+        """인플루언서/게시물 DataFrame을 CSV 파일로 저장 (DB 저장 없음, append이면 기존 파일에 이어서 저장)"""
         # 디렉토리가 없으면 생성
         os.makedirs(self.data_dir, exist_ok=True)
         
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M")
-        
         # 파일명 설정 (임시 파일은 접두어 추가)
         prefix = "temp_" if is_temp else ""
         influencers_file = os.path.join(self.data_dir, f"{prefix}influencers.csv")
         posts_file = os.path.join(self.data_dir, f"{prefix}posts.csv")
+        has_influencers = influencers_df is not None and not influencers_df.empty
+        has_posts = posts_df is not None and not posts_df.empty
         
-        # 인플루언서 정보를 DataFrame으로 변환하여 저장
-        if influencers:
-            influencers_df = pd.DataFrame(list(influencers.values()))
+        def write_csv(df, path):
+            # 이어서 저장할 때 파일이 이미 있으면 헤더 생략
+            exists = append and os.path.exists(path)
+            df.to_csv(path, index=False, mode='a' if exists else 'w', header=not exists)
+        
+        # 인플루언서 정보 저장
+        if has_influencers:
             # HttpUrl 객체는 문자열로 변환
             if 'external_url' in influencers_df.columns:
                 influencers_df['external_url'] = influencers_df['external_url'].astype(str)
                 
-            influencers_df.to_csv(influencers_file, index=False)
-            logging.info(f"인플루언서 데이터 {len(influencers)}건을 {influencers_file}에 저장했습니다.")
-            
-            # DB에도 저장
-            for _, row in influencers_df.iterrows():
-                self.save_influencer(row.to_dict())
+            write_csv(influencers_df, influencers_file)
+            logging.info(f"인플루언서 데이터 {len(influencers_df)}건을 {influencers_file}에 저장했습니다.")
         
-        # 게시물 정보를 DataFrame으로 변환하여 저장
-        if posts:
-            posts_df = pd.DataFrame(posts)
+        # 게시물 정보 저장
+        if has_posts:
             # HttpUrl 객체는 문자열로 변환
             if 'image_url' in posts_df.columns:
                 posts_df['image_url'] = posts_df['image_url'].astype(str)
             if 'video_url' in posts_df.columns:
                 posts_df['video_url'] = posts_df['video_url'].astype(str)
                 
-            posts_df.to_csv(posts_file, index=False)
-            logging.info(f"게시물 데이터 {len(posts)}건을 {posts_file}에 저장했습니다.")
-            
-            # DB에도 저장
-            for _, row in posts_df.iterrows():
-                self.save_post(row.to_dict())
-        
-        # 백업 파일 생성 (3시간마다)
-        if not is_temp and (int(timestamp.split("_")[1]) % 300 == 0):
-            backup_dir = os.path.join(self.data_dir, "backup")
-            os.makedirs(backup_dir, exist_ok=True)
-            
-            if influencers:
-                backup_influencers = os.path.join(backup_dir, f"influencers_{timestamp}.csv")
-                influencers_df.to_csv(backup_influencers, index=False)
-                
-            if posts:
-                backup_posts = os.path.join(backup_dir, f"posts_{timestamp}.csv")
-                posts_df.to_csv(backup_posts, index=False)
-                
-            logging.info(f"백업 파일 생성 완료: {timestamp}")
+            write_csv(posts_df, posts_file)
+            logging.info(f"게시물 데이터 {len(posts_df)}건을 {posts_file}에 저장했습니다.")
+
     
     def load_checkpoint(self):
-        """체크포인트 파일에서 이미 처리된 사용자 목록 로드"""
-        checkpoint_file = os.path.join(self.data_dir, "crawler_checkpoint.csv")
+        """체크포인트 저널에서 이미 처리된 사용자 목록 로드"""
         processed_users = set()
         
-        if os.path.exists(checkpoint_file):
-            try:
-                df = pd.read_csv(checkpoint_file)
-                if 'username' in df.columns:
-                    processed_users = set(df['username'].values)
-                logging.info(f"체크포인트 파일에서 {len(processed_users)}명의 처리된 사용자 로드")
-            except Exception as e:
-                logging.error(f"체크포인트 로드 오류: {str(e)}")
+        try:
+            processed_users = self.checkpoint.load()
+            logging.info(f"체크포인트 저널에서 {len(processed_users)}명의 처리된 사용자 로드")
+        except Exception as e:
+            logging.error(f"체크포인트 로드 오류: {str(e)}")
                     
         return processed_users
     
-    def save_checkpoint(self, processed, force_save=False):
-        """체크포인트 파일에 처리된 사용자 목록 저장"""
-        if not processed:
-            return
-                
-        checkpoint_file = os.path.join(self.data_dir, "crawler_checkpoint.csv")
-        
-        # 디렉토리가 없으면 생성
-        os.makedirs(os.path.dirname(checkpoint_file), exist_ok=True)
-        
-        # 체크포인트 저장
-        df = pd.DataFrame({'username': list(processed)})
-        df.to_csv(checkpoint_file, index=False)
-        logging.info(f"체크포인트 업데이트: 현재까지 {len(processed)}명 저장 ({checkpoint_file})")
+    def record_checkpoint(self, username, status=STATUS_DONE):
+        """사용자 처리 결과를 체크포인트 저널에 추가 (처리한 사용자 수와 무관하게 한 줄 기록)"""
+        self.checkpoint.record(username, status)
+    
+    def save_checkpoint(self, force_save=False):
+        """체크포인트 저널을 디스크에 반영하고, 줄이 많이 쌓였거나 force_save이면 압축"""
+        self.checkpoint.sync()
+        if force_save:
+            self.checkpoint.compact()
+        else:
+            self.checkpoint.maybe_compact()
     
     def load_target_usernames(self, specific_users=None):
         """파일에서 대상 사용자명 목록 로드"""
@@ -228,16 +379,13 @@ class DatabaseManager:
             return usernames
         
         # 체크포인트에서 모든 사용자 로드
-        checkpoint_file = os.path.join(self.data_dir, "crawler_checkpoint.csv")
-        if os.path.exists(checkpoint_file):
-            try:
-                df = pd.read_csv(checkpoint_file)
-                if 'username' in df.columns:
-                    usernames = df['username'].values.tolist()
-                    logging.info(f"체크포인트에서 {len(usernames)}명의 대상 사용자 로드")
-                    return usernames
-            except Exception as e:
-                logging.error(f"체크포인트에서 대상 로드 오류: {str(e)}")
+        try:
+            usernames = self.checkpoint.usernames()
+            if usernames:
+                logging.info(f"체크포인트에서 {len(usernames)}명의 대상 사용자 로드")
+                return usernames
+        except Exception as e:
+            logging.error(f"체크포인트에서 대상 로드 오류: {str(e)}")
         
         # 데이터 디렉토리에서 인플루언서 목록 파일 찾기 시도
         influencers_file = os.path.join(self.data_dir, "lens_influencers.txt")
@@ -285,7 +433,8 @@ class DatabaseManager:
         return influencers, posts
     
     def close(self):
-        """데이터베이스 연결 종료"""
+        """데이터베이스 연결 및 체크포인트 저널 종료"""
+        self.checkpoint.close()
         if self.conn:
             self.conn.close()
             logging.info("데이터베이스 연결 종료") 
\ No newline at end of file
@@ -0,0 +1,163 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+단일 쓰기 스레드 모듈 - 크롤링 결과 저장 전담
+
+크롤러 결과 수집 루프가 저장(세그먼트 기록, DB upsert)을 직접 하면 디스크 I/O 동안
+결과 수집이 멈추고, 여러 스레드가 DuckDB 연결 하나를 잠금 없이 공유하게 됩니다.
+DBWriter는 크기 제한이 있는 큐로 사용자별 수집 결과를 받아, 전용 스레드 하나에서
+일정 건수 또는 일정 시간마다 묶어 증분 저장소(SegmentStore)로 기록합니다.
+DB 연결은 쓰기 스레드만 사용하고, 기록이 끝난 사용자만 체크포인트 저널에 추가하므로
+체크포인트에 있는 사용자의 데이터는 항상 세그먼트/DB에 있습니다.
+"""
+
+import time
+import queue
+import logging
+import threading
+from typing import List, NamedTuple, Optional
+
+from .checkpoint import CheckpointJournal
+from .records import InfluencerRecord, PostRecord
+from .segment_store import SegmentStore
+
+# --- 상수 정의 ---
+WRITER_QUEUE_SIZE = 1000      # 큐에 쌓일 수 있는 최대 사용자 수 (가득 차면 submit이 대기)
+WRITER_BATCH_SIZE = 10        # 이 수만큼 사용자가 모이면 기록
+WRITER_FLUSH_INTERVAL = 5.0   # 첫 대기 레코드 이후 이 시간(초)이 지나면 기록
+
+
+class UserRecord(NamedTuple):
+    """사용자 한 명의 수집 결과"""
+    username: str
+    influencer: Optional[InfluencerRecord]
+    posts: List[PostRecord]
+
+
+class _Command(NamedTuple):
+    """쓰기 스레드 제어 명령 (flush/close 완료 시 done 이벤트 설정)"""
+    name: str
+    done: threading.Event
+
+
+class DBWriter:
+    """크롤링 결과를 전용 스레드에서 묶어 기록하는 단일 쓰기 큐"""
+
+    def __init__(
+        self,
+        segment_store: SegmentStore,
+        checkpoint: Optional[CheckpointJournal] = None,
+        max_queue: int = WRITER_QUEUE_SIZE,
+        batch_size: int = WRITER_BATCH_SIZE,
+        flush_interval: float = WRITER_FLUSH_INTERVAL
+    ):
+        """
+        초기화 (쓰기 스레드 시작)
+
+        Args:
+            segment_store: 세그먼트/DB 증분 저장소 (쓰기 스레드에서만 사용)
+            checkpoint: 기록이 끝난 사용자를 추가할 체크포인트 저널 (옵션)
+            max_queue: 큐 최대 크기
+            batch_size: 기록 단위 사용자 수
+            flush_interval: 기록 최대 대기 시간(초)
+        """
+        self.segment_store = segment_store
+        self.checkpoint = checkpoint
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_queue)
+        self._closed = False
+
+        # 통계
+        self.written_users = 0
+        self.write_errors = 0
+
+        self._thread = threading.Thread(target=self._run, name="db-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, username: str, influencer: Optional[InfluencerRecord], posts: List[PostRecord]) -> None:
+        """사용자 수집 결과를 큐에 추가 (큐가 가득 찬 경우에만 대기)"""
+        if self._closed:
+            raise RuntimeError("이미 닫힌 DBWriter입니다.")
+        if not self._thread.is_alive():
+            # 쓰기 스레드가 없으면 큐에 넣어도 기록되지 않고, 큐가 차면 영원히 대기하게 됨
+            raise RuntimeError("DB 쓰기 스레드가 종료되어 결과를 기록할 수 없습니다.")
+        self._queue.put(UserRecord(username, influencer, posts))
+
+    def _command(self, name: str, timeout: Optional[float]) -> bool:
+        if not self._thread.is_alive():
+            return True
+        done = threading.Event()
+        self._queue.put(_Command(name, done))
+        return done.wait(timeout)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """큐에 있는 결과를 모두 기록할 때까지 대기 (timeout 내에 끝나면 True)"""
+        return self._command("flush", timeout)
+
+    def close(self, timeout: Optional[float] = None) -> bool:
+        """남은 결과를 기록하고 쓰기 스레드 종료"""
+        if self._closed:
+            return True
+        self._closed = True
+        finished = self._command("close", timeout)
+        self._thread.join(timeout)
+        logging.info(f"DB 쓰기 스레드 종료: 사용자 {self.written_users}명 기록, 오류 {self.write_errors}회")
+        return finished
+
+    def _write(self, batch: List[UserRecord]) -> None:
+        """모인 결과를 한 번에 기록하고, 기록된 사용자를 체크포인트에 추가"""
+        if not batch:
+            return
+        try:
+            for record in batch:
+                self.segment_store.add(record.influencer, record.posts)
+            self.segment_store.flush()
+        except Exception as e:
+            self.write_errors += 1
+            logging.error(f"DB 쓰기 스레드 기록 오류 ({len(batch)}명): {str(e)}")
+            return
+
+        if self.checkpoint:
+            for record in batch:
+                self.checkpoint.record(record.username)
+        self.written_users += len(batch)
+
+    def _run(self) -> None:
+        """쓰기 스레드 본체: 크기(batch_size) 또는 시간(flush_interval) 조건으로 묶어 기록"""
+        batch: List[UserRecord] = []
+        deadline = None
+        while True:
+            item = None
+            try:
+                timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+                try:
+                    item = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    item = None
+
+                if isinstance(item, UserRecord):
+                    batch.append(item)
+                    if deadline is None:
+                        deadline = time.monotonic() + self.flush_interval
+
+                flush_now = isinstance(item, _Command) or len(batch) >= self.batch_size or (
+                    deadline is not None and time.monotonic() >= deadline
+                )
+                if flush_now:
+                    self._write(batch)
+                    batch, deadline = [], None
+                    if self.checkpoint and isinstance(item, _Command):
+                        self.checkpoint.sync()
+            except Exception as e:
+                # 예외로 스레드가 끝나면 이후 submit/flush가 멈추므로 기록하고 계속 소비
+                # (체크포인트에 기록되지 못한 사용자는 다음 실행에서 다시 수집됨)
+                self.write_errors += 1
+                logging.error(f"DB 쓰기 스레드 처리 오류: {str(e)}", exc_info=True)
+                batch, deadline = [], None
+
+            if isinstance(item, _Command):
+                item.done.set()
+                if item.name == "close":
+                    return
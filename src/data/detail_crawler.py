@@ -16,8 +16,7 @@ import random
 import json
 import pandas as pd
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import List, Dict, Set, Any, Optional, Tuple
-from datetime import datetime
+from typing import List, Set, Optional, Tuple
 from pathlib import Path
 
 from instagrapi import Client
@@ -28,6 +27,10 @@ from instagrapi.exceptions import (
 )
 
 from .db import DatabaseManager
+from .segment_store import SegmentStore
+from .checkpoint import CheckpointJournal
+from .db_writer import DBWriter
+from .records import InfluencerRecord, PostRecord
 from .proxy_manager import ProxyManager
 from .rate_control import DynamicDelayAdapter
 from .utils import setup_logging, with_retry, parse_category
@@ -48,7 +51,7 @@ class DetailCrawler:
         self,
         data_dir: str = "data",
         input_file: str = "usernames.txt",
-        checkpoint_file: str = "checkpoint_crawl.csv",
+        checkpoint_file: str = "checkpoint_crawl.journal",
         save_interval: int = 10,
         db_name: str = "instagram.db"
     ):
@@ -58,56 +61,66 @@ class DetailCrawler:
         Args:
             data_dir: 데이터 저장 디렉토리
             input_file: 수집할 사용자명 목록 파일
-            checkpoint_file: 처리 완료된 사용자명을 기록할 체크포인트 파일
-            save_interval: 중간 저장 간격 (사용자 수)
+            checkpoint_file: 처리 완료된 사용자명을 기록할 체크포인트 저널 파일
+                (같은 이름의 기존 .csv 체크포인트가 있으면 처음 한 번 저널로 변환)
+            save_interval: 중간 저장 간격 (사용자 수, 쓰기 스레드의 기록 단위)
             db_name: DuckDB 데이터베이스 파일명
         """
         self.data_dir = data_dir
         self.input_file_path = os.path.join(data_dir, input_file)
         self.checkpoint_file_path = os.path.join(data_dir, checkpoint_file)
+        self.checkpoint = CheckpointJournal(
+            self.checkpoint_file_path,
+            legacy_csv_path=os.path.splitext(self.checkpoint_file_path)[0] + ".csv"
+        )
         self.save_interval = save_interval
         
         # 데이터베이스 매니저 초기화
         self.db_manager = DatabaseManager(data_dir=data_dir, db_name=db_name)
+        # 증분 저장소 (중간 저장 시 새로 수집한 레코드만 세그먼트 + DB에 기록)
+        self.segment_store = SegmentStore(self.db_manager, data_dir=data_dir)
         
-        # 수집 데이터 저장소
-        self.influencers_info = {}
-        self.post_details = []
+        # 수집 개수 (레코드는 쓰기 스레드로 바로 넘기고 메모리에 쌓지 않음)
+        self.collected_users = 0
+        self.collected_posts = 0
         
-        # 처리된 사용자 집합
+        # 처리된 사용자 집합 (이전 실행에서 세그먼트까지 기록된 사용자 포함)
         self.processed_users = self._load_checkpoint()
+        for username in self.segment_store.replay() - self.processed_users:
+            self.processed_users.add(username)
+            self.checkpoint.record(username)
+        
+        # 단일 쓰기 스레드 (이후 세그먼트/DB 기록과 체크포인트 추가는 쓰기 스레드만 수행)
+        self.writer = DBWriter(self.segment_store, checkpoint=self.checkpoint, batch_size=save_interval)
         
         # 저장 디렉토리가 없으면 생성
         os.makedirs(data_dir, exist_ok=True)
     
     def _load_checkpoint(self) -> Set[str]:
-        """체크포인트 파일에서 이미 처리된 사용자 목록 로드"""
+        """체크포인트 저널에서 이미 처리된 사용자 목록 로드"""
         processed_users = set()
         
-        if os.path.exists(self.checkpoint_file_path):
-            try:
-                df = pd.read_csv(self.checkpoint_file_path)
-                if 'username' in df.columns:
-                    processed_users = set(df['username'].values)
-                logging.info(f"체크포인트 파일에서 {len(processed_users)}명의 처리된 사용자 로드")
-            except Exception as e:
-                logging.error(f"체크포인트 로드 오류: {str(e)}")
+        try:
+            processed_users = self.checkpoint.load()
+            logging.info(f"체크포인트 저널에서 {len(processed_users)}명의 처리된 사용자 로드")
+        except Exception as e:
+            logging.error(f"체크포인트 로드 오류: {str(e)}")
         
         return processed_users
     
     def _save_checkpoint(self) -> None:
-        """체크포인트 파일에 처리된 사용자 목록 저장"""
-        if not self.processed_users:
-            return
-        
-        # 디렉토리가 없으면 생성
-        os.makedirs(os.path.dirname(self.checkpoint_file_path), exist_ok=True)
-        
-        # 체크포인트 저장
-        df = pd.DataFrame({'username': list(self.processed_users)})
-        df.to_csv(self.checkpoint_file_path, index=False)
+        """체크포인트 저널을 디스크에 반영 (사용자별 기록은 처리 완료 시 이미 추가됨)"""
+        self.checkpoint.sync()
+        self.checkpoint.maybe_compact()
         logging.info(f"체크포인트 업데이트: 현재까지 {len(self.processed_users)}명 처리")
     
+    def _compact_segments(self) -> None:
+        """세그먼트를 최종 결과로 압축 (DB 반영에 실패하면 세그먼트를 남겨 다음 실행의 복구에 맡김)"""
+        try:
+            self.segment_store.compact()
+        except Exception as e:
+            logging.error(f"세그먼트 압축 실패 (세그먼트는 남겨 두고 다음 실행에서 DB에 다시 반영): {str(e)}")
+    
     def _load_target_usernames(self, specific_users: Optional[str] = None) -> List[str]:
         """
         처리할 사용자명 목록 로드
@@ -143,26 +156,8 @@ class DetailCrawler:
         
         return []
     
-    def _save_data(self, is_temp: bool = False) -> None:
-        """
-        수집된 데이터 저장
-        
-        Args:
-            is_temp: 임시 저장 여부
-        """
-        # 데이터베이스에 저장
-        self.db_manager.save_data_to_csv(
-            self.influencers_info,
-            self.post_details,
-            is_temp=is_temp
-        )
-        
-        # 체크포인트 저장
-        if not is_temp:
-            self._save_checkpoint()
-    
     @with_retry(max_retries=3)
-    def _fetch_user_info(self, cl: Client, username: str) -> Optional[Dict[str, Any]]:
+    def _fetch_user_info(self, cl: Client, username: str) -> Optional[InfluencerRecord]:
         """
         사용자 정보 조회
         
@@ -171,19 +166,13 @@ class DetailCrawler:
             username: 사용자명
         
         Returns:
-            사용자 정보 딕셔너리 또는 None
+            인플루언서 레코드 또는 None
         """
         try:
             user_info = cl.user_info_by_username(username)
             
-            # 딕셔너리로 변환
-            user_dict = user_info.dict()
-            
-            # 카테고리 파싱
-            if "biography" in user_dict:
-                user_dict["category"] = parse_category(user_dict.get("biography", ""))
-            
-            return user_dict
+            # 테이블 컬럼만 모델 속성에서 바로 추출 (카테고리는 바이오에서 파싱)
+            return InfluencerRecord.from_user(user_info, category=parse_category(user_info.biography or ""))
         except UserNotFound:
             logging.warning(f"사용자를 찾을 수 없음: {username}")
             return None
@@ -191,76 +180,34 @@ class DetailCrawler:
             logging.warning(f"비공개 계정: {username}")
             
             # 비공개 계정은 기본 정보만 저장
-            return {
-                "username": username,
-                "is_private": True,
-                "pk": 0,
-                "follower_count": 0,
-                "following_count": 0,
-                "media_count": 0
-            }
+            return InfluencerRecord.private_account(username)
         except Exception as e:
             logging.error(f"사용자 정보 조회 오류: {username} - {str(e)}")
             raise
     
     @with_retry(max_retries=3)
-    def _fetch_user_medias(self, cl: Client, user_info: Dict[str, Any], amount: int = 10) -> List[Dict[str, Any]]:
+    def _fetch_user_medias(self, cl: Client, user_info: InfluencerRecord, amount: int = 10) -> List[PostRecord]:
         """
         사용자 게시물 목록 조회
         
         Args:
             cl: 인스타그램 클라이언트
-            user_info: 사용자 정보
+            user_info: 인플루언서 레코드
             amount: 가져올 게시물 수
         
         Returns:
-            게시물 정보 목록
+            게시물 레코드 목록
         """
-        posts = []
-        
-        # 비공개 계정이면 스킵
-        if user_info.get("is_private", False):
-            return posts
+        # 비공개 계정이거나 게시물 수가 0이면 스킵
+        if user_info.is_private or user_info.media_count == 0:
+            return []
             
         try:
-            username = user_info.get("username")
-            pk = user_info.get("pk")
-            
-            # 게시물 수가 0이면 스킵
-            if user_info.get("media_count", 0) == 0:
-                return posts
-                
-            # 게시물 조회
-            medias = cl.user_medias(pk, amount=amount)
-            
-            for media in medias:
-                # 딕셔너리로 변환
-                media_dict = media.dict()
-                
-                # 추가 필드
-                media_dict["user_pk"] = pk
-                media_dict["username"] = username
-                
-                # 필요한 필드만 추출
-                post = {
-                    "id": media_dict.get("id", ""),
-                    "user_pk": pk,
-                    "username": username,
-                    "caption": media_dict.get("caption_text", ""),
-                    "like_count": media_dict.get("like_count", 0),
-                    "comment_count": media_dict.get("comment_count", 0),
-                    "taken_at": media_dict.get("taken_at", datetime.now()),
-                    "media_type": media_dict.get("media_type", 0),
-                    "product_type": media_dict.get("product_type", ""),
-                    "image_url": str(media_dict.get("thumbnail_url", "")),
-                    "video_url": str(media_dict.get("video_url", ""))
-                }
-                
-                posts.append(post)
-            
-            return posts
+            # 게시물 조회 후 테이블 컬럼만 모델 속성에서 바로 추출
+            medias = cl.user_medias(user_info.pk, amount=amount)
+            return [PostRecord.from_media(media, user_info.pk, user_info.username) for media in medias]
         except Exception as e:
-            logging.error(f"게시물 조회 오류: {user_info.get('username')} - {str(e)}")
+            logging.error(f"게시물 조회 오류: {user_info.username} - {str(e)}")
             raise
     
     def _fetch_user_detail(
@@ -268,7 +215,7 @@ class DetailCrawler:
         username: str, 
         proxy_manager: Optional[ProxyManager] = None,
         amount: int = 10
-    ) -> Tuple[Optional[Dict[str, Any]], List[Dict[str, Any]]]:
+    ) -> Tuple[Optional[InfluencerRecord], List[PostRecord]]:
         """
         사용자 세부 정보 및 게시물 수집
         
@@ -306,7 +253,7 @@ class DetailCrawler:
                 
             # 게시물 조회
             posts = []
-            if not user_info.get("is_private", False):
+            if not user_info.is_private:
                 posts = self._fetch_user_medias(cl, user_info, amount)
                 
             return user_info, posts
@@ -325,9 +272,9 @@ class DetailCrawler:
         posts_per_user: int = 10,
         max_users: Optional[int] = None,
         dry_run: bool = False
-    ) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    ) -> Tuple[int, int]:
         """
-        사용자 크롤링 실행
+        사용자 크롤링 실행 (사용자별 결과는 쓰기 스레드를 거쳐 세그먼트/DB에 바로 기록)
         
         Args:
             specific_users: 쉼표로 구분된 특정 사용자명 (옵션)
@@ -338,14 +285,17 @@ class DetailCrawler:
             dry_run: 테스트 실행 여부 (소량만 처리)
         
         Returns:
-            (인플루언서 정보, 게시물 목록) 튜플
+            (수집한 인플루언서 수, 수집한 게시물 수) 튜플
         """
         # 처리할 사용자 목록 로드
         usernames = self._load_target_usernames(specific_users)
         
         if not usernames:
             logging.warning("처리할 사용자가 없습니다.")
-            return self.influencers_info, self.post_details
+            # 이전 실행에서 남은 세그먼트가 있으면 압축
+            self.writer.close()
+            self._compact_segments()
+            return self.collected_users, self.collected_posts
         
         # 최대 사용자 수 적용
         if max_users and len(usernames) > max_users:
@@ -375,16 +325,18 @@ class DetailCrawler:
             }
             
             for future in as_completed(future_to_username):
-                username = future_to_username[future]
+                # 완료된 Future는 사전에서 제거 (결과를 쥔 채 남아 있지 않도록)
+                username = future_to_username.pop(future)
                 try:
                     user_info, posts = future.result()
                     
                     # 사용자 정보가 있으면 저장
                     if user_info:
-                        self.influencers_info[username] = user_info
-                        self.post_details.extend(posts)
+                        self.collected_users += 1
+                        self.collected_posts += len(posts)
+                        # 저장은 쓰기 스레드에 넘김 (기록이 끝나면 쓰기 스레드가 체크포인트 저널에 추가)
+                        self.writer.submit(username, user_info, posts)
                         
-                        # 처리 완료 표시
                         self.processed_users.add(username)
                         processed_count += 1
                         
@@ -400,26 +352,26 @@ class DetailCrawler:
                             f"경과: {elapsed:.1f}초, "
                             f"남은 시간: {eta:.1f}초)"
                         )
-                        
-                        # 중간 저장
-                        if processed_count % self.save_interval == 0:
-                            self._save_data()
                     
                 except Exception as e:
                     logging.error(f"사용자 {username} 처리 중 오류: {str(e)}")
         
-        # 최종 저장
-        self._save_data()
+        # 남은 레코드를 기록하고 쓰기 스레드 종료 후 세그먼트를 최종 결과로 압축
+        self.writer.close()
+        self._save_checkpoint()
+        self._compact_segments()
+        self.checkpoint.compact()
+        self.checkpoint.close()
         
         # 완료 로깅
         total_time = time.time() - start_time
         logging.info(
             f"크롤링 완료: {processed_count}명 처리됨, "
-            f"게시물 {len(self.post_details)}개 수집, "
+            f"게시물 {self.collected_posts}개 수집, "
             f"총 소요 시간: {total_time:.1f}초"
         )
         
-        return self.influencers_info, self.post_details
+        return self.collected_users, self.collected_posts
 
 
 def run_detail_crawler(
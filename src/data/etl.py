@@ -7,11 +7,19 @@ import time
 import random
 import functools
 from datetime import datetime
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
 
 # 프로젝트 루트 디렉토리를 Python 경로에 추가
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+# core 패키지(core.nlp)를 검색 API와 같은 이름으로 임포트하기 위해 src 디렉토리도 추가
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 from src.api.utils.api_utils import ocr_test, embed_image, retry_api_call
+from src.data.columnar import INFLUENCER_COLUMNS, POST_COLUMNS, read_crawl_table
+from src.data.backup_store import BackupStore, BACKUP_DIR_NAME
+from src.data.follower_series import FollowerSeries, FOLLOWER_SERIES_DIR_NAME, GROWTH_WINDOWS, growth_column
+from core.nlp import warmup as warmup_nlp, analyze_many, parse_category, parse_product
+from core.hashtags import extract_hashtags
+from core.near_duplicates import find_near_duplicates
 
 # 로깅 설정
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -23,6 +31,21 @@ RETRY_DELAY = 3  # 5초에서 3초로 단축
 MAX_BACKOFF_TIME = 30  # 60초에서 30초로 단축
 MAX_WORKERS = 5  # 병렬 처리 워커 수
 
+# NLP 주석(형태소 분석) 관련 상수
+# Okt는 CPU 연산이라 스레드로는 빨라지지 않으므로 프로세스마다 JVM을 하나씩 둠
+NLP_WORKERS = int(os.getenv("ETL_NLP_WORKERS", str(max(1, min(4, (os.cpu_count() or 2) - 1)))))
+NLP_CHUNK_SIZE = 256  # 워커에 한 번에 보낼 캡션 수
+NLP_COLUMNS = ['nlp_nouns', 'nlp_phrases', 'nlp_category', 'nlp_product']
+NLP_TOKEN_SEPARATOR = '|'  # 명사/구 목록을 한 컬럼에 저장할 때 구분자
+
+# 크롤링 결과에서 읽을 컬럼 (테이블 스키마 + 이전 ETL/수동 보강 컬럼, 없는 컬럼은 무시)
+ETL_INFLUENCER_COLUMNS = INFLUENCER_COLUMNS + ['gender', 'age_group']
+ETL_POST_COLUMNS = POST_COLUMNS + ['thumbnail_url', 'product_name', 'semantic_emb', 'dup_group_id'] + NLP_COLUMNS
+# 이전 ETL 결과에서 재사용할 컬럼 (게시물 미디어는 바뀌지 않으므로 이미지 기반 값은 id만 같으면,
+# 캡션 기반 값은 캡션까지 같으면 재사용)
+IMAGE_DERIVED_COLUMNS = ['product_name', 'semantic_emb']
+CAPTION_DERIVED_COLUMNS = NLP_COLUMNS
+
 # API 호출 함수 (api_utils.py의 함수 직접 사용)
 def safe_ocr_test(image_url):
     return ocr_test(image_url)
@@ -51,6 +74,201 @@ def process_embedding(idx, image_url):
         logger.error(f"[{idx}] 임베딩 처리 오류: {e}")
         return idx, None
 
+def init_nlp_worker():
+    """NLP 워커 프로세스 초기화 (프로세스마다 자체 JVM과 Okt 생성)"""
+    warmup_nlp()
+
+def annotate_chunk(texts):
+    """
+    캡션 묶음에 대한 NLP 주석 처리 (워커 프로세스에서 실행)
+
+    Returns:
+        (명사, 구, 카테고리, 제품 후보) 컬럼별 목록. 명사/구는 NLP_TOKEN_SEPARATOR로 연결한 문자열
+    """
+    nouns_col, phrases_col, category_col, product_col = [], [], [], []
+    for text, (nouns, phrases) in zip(texts, analyze_many(texts)):
+        category = parse_category(text, nouns) if text else None
+        nouns_col.append(NLP_TOKEN_SEPARATOR.join(dict.fromkeys(nouns)))
+        phrases_col.append(NLP_TOKEN_SEPARATOR.join(phrases))
+        category_col.append(category)
+        product_col.append(parse_product(text, category, phrases) if text else None)
+    return nouns_col, phrases_col, category_col, product_col
+
+def annotate_posts(df_posts, caption_col):
+    """
+    게시물 캡션에 명사, 핵심 구, 카테고리, 제품 후보 컬럼을 추가 (주석이 없는 행만 처리)
+
+    캡션을 NLP_CHUNK_SIZE개씩 나눠 프로세스 풀로 보내고, 결과는 컬럼 단위 목록으로 받아
+    한 번에 DataFrame에 기록합니다. 검색 시점에는 형태소 분석을 하지 않아도 됩니다.
+    """
+    for col in NLP_COLUMNS:
+        if col not in df_posts.columns:
+            df_posts[col] = None
+
+    pending = df_posts.index[df_posts['nlp_nouns'].isna()]
+    logger.info(f"NLP 주석 처리할 데이터 건수: {len(pending)} (워커 {NLP_WORKERS}개)")
+    if len(pending) == 0:
+        return df_posts
+
+    texts = df_posts.loc[pending, caption_col].fillna('').astype(str).tolist()
+    chunks = [texts[i:i + NLP_CHUNK_SIZE] for i in range(0, len(texts), NLP_CHUNK_SIZE)]
+
+    start = time.time()
+    columns = [[] for _ in NLP_COLUMNS]
+    if NLP_WORKERS > 1 and len(chunks) > 1:
+        # 부모 프로세스는 JVM을 띄우지 않으므로 워커 생성(fork) 시 JVM 상태를 물려주지 않음
+        with ProcessPoolExecutor(max_workers=NLP_WORKERS, initializer=init_nlp_worker) as executor:
+            results = executor.map(annotate_chunk, chunks)
+            for i, result in enumerate(results, start=1):
+                for column, values in zip(columns, result):
+                    column.extend(values)
+                if i % 10 == 0 or i == len(chunks):
+                    logger.info(f"NLP 주석 진행: {i}/{len(chunks)} 묶음")
+    else:
+        for chunk in chunks:
+            for column, values in zip(columns, annotate_chunk(chunk)):
+                column.extend(values)
+
+    for col, values in zip(NLP_COLUMNS, columns):
+        df_posts.loc[pending, col] = values
+
+    elapsed = time.time() - start
+    logger.info(f"NLP 주석 처리 완료: {len(pending)}건, {elapsed:.1f}초 ({len(pending) / max(elapsed, 1e-6):.1f}건/초)")
+    return df_posts
+
+def assign_dup_groups(df_posts, caption_col):
+    """
+    근사 중복 캡션 그룹 id(dup_group_id) 부여
+
+    MinHash/LSH로 캡션이 거의 같은 게시물을 묶고, 그룹에서 가장 앞선 게시물의 키(post_pk/id)를
+    그룹 id로 사용합니다. 중복이 없는 게시물은 자기 자신의 키가 그룹 id입니다.
+    """
+    key_col = next((col for col in ('post_pk', 'id') if col in df_posts.columns), None)
+    representatives = find_near_duplicates(df_posts[caption_col].tolist())
+    keys = df_posts[key_col].to_numpy() if key_col else df_posts.index.to_numpy()
+    df_posts['dup_group_id'] = keys[representatives]
+    return df_posts
+
+def select_group_tasks(df_posts, column, url_col):
+    """
+    column 값이 비어 있는 게시물 중 API를 호출할 (인덱스, 이미지 URL) 목록
+
+    dup_group_id가 있으면 그룹마다 한 건만 호출하고, 그룹에 이미 값이 있는 게시물이 있으면
+    호출하지 않습니다 (fill_from_group으로 그룹 내 다른 게시물에 복사).
+    """
+    pending = df_posts[column].isna() & df_posts[url_col].notna() & (df_posts[url_col] != '')
+    if 'dup_group_id' in df_posts.columns:
+        done_groups = df_posts.loc[df_posts[column].notna(), 'dup_group_id']
+        pending &= ~df_posts['dup_group_id'].isin(done_groups)
+        candidates = df_posts.loc[pending].drop_duplicates(subset=['dup_group_id'])
+    else:
+        candidates = df_posts.loc[pending]
+    return list(zip(candidates.index, candidates[url_col]))
+
+def fill_from_group(df_posts, column):
+    """같은 dup_group_id 그룹에서 처리된 값을 값이 비어 있는 게시물에 복사"""
+    if 'dup_group_id' not in df_posts.columns:
+        return 0
+    missing = df_posts[column].isna()
+    group_values = df_posts.groupby('dup_group_id')[column].transform('first')
+    df_posts[column] = df_posts[column].where(~missing, group_values)
+    filled = int((missing & df_posts[column].notna()).sum())
+    if filled:
+        logger.info(f"'{column}' 근사 중복 그룹 재사용: {filled}건 (API 호출 생략)")
+    return filled
+
+def carry_over_enrichment(df_posts, db_path, caption_col):
+    """
+    이전 ETL 결과(mvp.db)에서 바뀌지 않은 게시물의 OCR/임베딩/NLP 결과를 가져옴
+
+    값이 채워진 게시물은 이후 단계(select_group_tasks, annotate_posts)에서 건너뛰므로
+    새 게시물과 캡션이 바뀐 게시물만 다시 처리합니다.
+    """
+    key_col = next((col for col in ('post_pk', 'id') if col in df_posts.columns), None)
+    if not key_col or not os.path.exists(db_path):
+        return df_posts
+
+    con = sqlite3.connect(db_path)
+    try:
+        prev_columns = {row[1] for row in con.execute("PRAGMA table_info(posts)")}
+        reuse_columns = [col for col in IMAGE_DERIVED_COLUMNS + CAPTION_DERIVED_COLUMNS if col in prev_columns]
+        if key_col not in prev_columns or not reuse_columns:
+            return df_posts
+        select_columns = [key_col] + reuse_columns + ([caption_col] if caption_col in prev_columns else [])
+        prev = pd.read_sql_query(
+            "SELECT " + ", ".join('"%s"' % col for col in select_columns) + " FROM posts", con
+        )
+    finally:
+        con.close()
+
+    prev = prev.drop_duplicates(subset=[key_col]).set_index(key_col)
+    keys = df_posts[key_col]
+    caption_same = None
+    if caption_col and caption_col in prev.columns:
+        prev_caption = keys.map(prev[caption_col])
+        caption_same = prev_caption.notna() & (prev_caption == df_posts[caption_col])
+
+    reused = {}
+    for col in reuse_columns:
+        prev_values = keys.map(prev[col])
+        if col in CAPTION_DERIVED_COLUMNS:
+            if caption_same is None:
+                continue
+            prev_values = prev_values.where(caption_same)
+        if col not in df_posts.columns:
+            df_posts[col] = None
+        missing = df_posts[col].isna()
+        df_posts[col] = df_posts[col].where(~missing, prev_values)
+        reused[col] = int((missing & df_posts[col].notna()).sum())
+
+    logger.info(
+        "이전 ETL 결과 재사용 (바뀌지 않은 게시물): "
+        + ", ".join(f"{col} {count}건" for col, count in reused.items())
+    )
+    return df_posts
+
+def add_growth_features(df_influencers, data_dir):
+    """
+    팔로워 시계열에서 계산한 기간별 성장률을 인플루언서 컬럼으로 추가 (follower_growth_7d 등)
+
+    관측이 하나뿐이거나 시계열에 없는 인플루언서는 NaN입니다.
+    """
+    series = FollowerSeries(os.path.join(data_dir, FOLLOWER_SERIES_DIR_NAME))
+    features = series.growth_features(GROWTH_WINDOWS)
+    feature_columns = [growth_column(days) for days in GROWTH_WINDOWS]
+    pks = pd.to_numeric(df_influencers['pk'], errors='coerce')
+    features = features.set_index('pk')
+    for col in feature_columns:
+        df_influencers[col] = pks.map(features[col]) if col in features.columns else float('nan')
+
+    observed = int(df_influencers[feature_columns[-1]].notna().sum())
+    logger.info(f"팔로워 성장률 피처 추가: {observed}/{len(df_influencers)}명 ({', '.join(feature_columns)})")
+    return df_influencers
+
+def extract_post_hashtags(df_posts, caption_col):
+    """
+    캡션에서 해시태그를 추출하여 정규화된 post_hashtags 테이블 생성
+
+    Returns:
+        post_pk, hashtag, position(캡션 내 등장 순서) 컬럼의 DataFrame
+    """
+    key_col = next((col for col in ('post_pk', 'id') if col in df_posts.columns), None)
+    if key_col is None:
+        logger.warning("게시물 키 컬럼(post_pk/id)이 없어 해시태그 추출을 건너뜁니다.")
+        return pd.DataFrame(columns=['post_pk', 'hashtag', 'position'])
+
+    records = [
+        (post_pk, tag, position)
+        for post_pk, caption in zip(df_posts[key_col].to_numpy(), df_posts[caption_col].to_numpy())
+        for position, tag in enumerate(extract_hashtags(caption))
+    ]
+    df_hashtags = pd.DataFrame(records, columns=['post_pk', 'hashtag', 'position'])
+    logger.info(
+        f"해시태그 추출 완료: {df_hashtags['post_pk'].nunique()}개 게시물, "
+        f"고유 해시태그 {df_hashtags['hashtag'].nunique()}개, 총 {len(df_hashtags)}건"
+    )
+    return df_hashtags
+
 def main():
     """ETL 메인 함수"""
     logger.info("ETL 프로세스 시작...")
@@ -62,19 +280,16 @@ def main():
         os.makedirs(data_dir)
         logger.info(f"'{data_dir}' 디렉토리 생성 완료")
     
-    # 1. CSV 파일에서 데이터 로드
-    logger.info("CSV 파일에서 데이터 로드 중...")
+    # 1. 크롤링 결과 로드 (Parquet 데이터셋 우선, 없으면 CSV / 필요한 컬럼만 읽음)
+    logger.info("크롤링 결과 데이터 로드 중...")
     try:
-        influencers_file = os.path.join(data_dir, "influencers.csv")
-        posts_file = os.path.join(data_dir, "posts.csv")
-        
-        df_influencers = pd.read_csv(influencers_file, encoding='utf-8-sig')
-        df_posts = pd.read_csv(posts_file, encoding='utf-8-sig')
+        df_influencers = read_crawl_table('influencers', data_dir, columns=ETL_INFLUENCER_COLUMNS)
+        df_posts = read_crawl_table('posts', data_dir, columns=ETL_POST_COLUMNS)
         
         logger.info(f"인플루언서 데이터 {len(df_influencers)}건 로드 완료")
         logger.info(f"게시물 데이터 {len(df_posts)}건 로드 완료")
     except Exception as e:
-        logger.error(f"CSV 파일 로드 실패: {e}")
+        logger.error(f"크롤링 결과 로드 실패: {e}")
         return
     
     # 'translated_caption' 컬럼이 있으면 제거 (스프린트2에서 Papago 제거)
@@ -83,20 +298,34 @@ def main():
         df_posts = df_posts.drop('translated_caption', axis=1)
         logger.info("번역 컬럼 제거 완료")
     
+    # 팔로워 시계열 기반 성장률 (검색 랭킹에서 급성장 인플루언서 가산)
+    try:
+        df_influencers = add_growth_features(df_influencers, data_dir)
+    except Exception as e:
+        logger.warning(f"팔로워 성장률 피처 계산 실패 (성장률 없이 진행): {e}")
+
     # 2. 데이터 변환 및 API 호출
-    
+
+    caption_col = next((col for col in ('caption_text', 'caption') if col in df_posts.columns), None)
+
+    # 이전 실행에서 처리한 게시물의 결과 재사용 (새 게시물/바뀐 게시물만 처리)
+    try:
+        df_posts = carry_over_enrichment(df_posts, os.path.join(data_dir, "mvp.db"), caption_col)
+    except Exception as e:
+        logger.warning(f"이전 ETL 결과 재사용 실패 (전체 다시 처리): {e}")
+
+    # 근사 중복 캡션 그룹 (같은 홍보 캡션을 재게시한 게시물은 OCR/임베딩 결과를 공유)
+    if caption_col:
+        logger.info("근사 중복 캡션 그룹 계산 중...")
+        df_posts = assign_dup_groups(df_posts, caption_col)
+
     # 1. OCR을 통한 제품명 추출 (병렬 처리)
     if 'product_name' not in df_posts.columns:
         logger.info("제품명 추출 (OCR) 처리 시작...")
         df_posts['product_name'] = None
     
-    # 처리해야 할 항목 선별
-    ocr_tasks = []
-    for idx, row in df_posts.iterrows():
-        if pd.isna(df_posts.loc[idx, 'product_name']):  # 이미 값이 있는 경우 스킵
-            image_url = row['thumbnail_url']
-            if not pd.isna(image_url) and image_url:
-                ocr_tasks.append((idx, image_url))
+    # 처리해야 할 항목 선별 (이미 값이 있는 경우, 같은 중복 그룹에서 처리하는 경우 스킵)
+    ocr_tasks = select_group_tasks(df_posts, 'product_name', 'thumbnail_url')
     
     logger.info(f"OCR 처리할 데이터 건수: {len(ocr_tasks)}")
     
@@ -111,7 +340,8 @@ def main():
                 idx, product_name = future.result()
                 if product_name:
                     df_posts.loc[idx, 'product_name'] = product_name
-    
+
+    fill_from_group(df_posts, 'product_name')
     logger.info("OCR 처리 완료")
     
     # 2. 이미지 임베딩 (병렬 처리)
@@ -119,13 +349,8 @@ def main():
         logger.info("이미지 임베딩 처리 시작...")
         df_posts['semantic_emb'] = None
     
-    # 처리해야 할 항목 선별
-    embedding_tasks = []
-    for idx, row in df_posts.iterrows():
-        if pd.isna(df_posts.loc[idx, 'semantic_emb']):  # 이미 값이 있는 경우 스킵
-            image_url = row['thumbnail_url']
-            if not pd.isna(image_url) and image_url:
-                embedding_tasks.append((idx, image_url))
+    # 처리해야 할 항목 선별 (이미 값이 있는 경우, 같은 중복 그룹에서 처리하는 경우 스킵)
+    embedding_tasks = select_group_tasks(df_posts, 'semantic_emb', 'thumbnail_url')
     
     logger.info(f"임베딩 처리할 데이터 건수: {len(embedding_tasks)}")
     
@@ -150,8 +375,22 @@ def main():
     if embedding_tasks:
         success_rate = (embedding_success / len(embedding_tasks)) * 100
         logger.info(f"임베딩 처리 완료: 성공 {embedding_success}/{len(embedding_tasks)} ({success_rate:.1f}%)")
-    
-    # 3. 데이터 정리 및 후처리
+    fill_from_group(df_posts, 'semantic_emb')
+
+    # 3. 캡션 NLP 주석 (명사, 핵심 구, 카테고리, 제품 후보)
+    if caption_col:
+        logger.info("캡션 NLP 주석 처리 시작...")
+        try:
+            df_posts = annotate_posts(df_posts, caption_col)
+        except Exception as e:
+            logger.error(f"NLP 주석 처리 실패: {e}")
+    else:
+        logger.warning("캡션 컬럼이 없어 NLP 주석 처리를 건너뜁니다.")
+
+    # 캡션 해시태그 추출 (post_hashtags 테이블)
+    df_hashtags = extract_post_hashtags(df_posts, caption_col) if caption_col else None
+
+    # 4. 데이터 정리 및 후처리
     # 결측치가 많은 경우 경고 출력
     null_counts = df_posts.isnull().sum()
     for col, count in null_counts.items():
@@ -159,7 +398,7 @@ def main():
             pct = (count / len(df_posts)) * 100
             logger.warning(f"'{col}' 컬럼에 결측치 {count}개 ({pct:.1f}%) 존재")
     
-    # 4. SQLite DB에 저장
+    # 5. SQLite DB에 저장
     logger.info("SQLite 데이터베이스에 데이터 저장 중...")
     try:
         # 데이터베이스 연결
@@ -169,6 +408,12 @@ def main():
         # 테이블 작성
         df_influencers.to_sql('influencers', con, if_exists='replace', index=False)
         df_posts.to_sql('posts', con, if_exists='replace', index=False)
+        if df_hashtags is not None:
+            df_hashtags.to_sql('post_hashtags', con, if_exists='replace', index=False)
+            con.execute("CREATE INDEX IF NOT EXISTS idx_post_hashtags_hashtag ON post_hashtags (hashtag)")
+            con.execute("CREATE INDEX IF NOT EXISTS idx_post_hashtags_post_pk ON post_hashtags (post_pk)")
+        if 'dup_group_id' in df_posts.columns:
+            con.execute("CREATE INDEX IF NOT EXISTS idx_posts_dup_group_id ON posts (dup_group_id)")
         
         logger.info(f"데이터베이스 저장 완료: {db_path}")
         
@@ -178,20 +423,15 @@ def main():
         logger.error(f"데이터베이스 저장 실패: {e}")
         return
     
-    # 백업
+    # 백업 (바뀌지 않은 행은 이전 스냅샷과 공유하는 중복 제거 스냅샷)
     try:
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        backup_dir = os.path.join(data_dir, "backup")
-        os.makedirs(backup_dir, exist_ok=True)
-        
-        # CSV 백업
-        influencers_backup = os.path.join(backup_dir, f"influencers_{timestamp}.csv")
-        posts_backup = os.path.join(backup_dir, f"posts_{timestamp}.csv")
-        
-        df_influencers.to_csv(influencers_backup, index=False, encoding='utf-8-sig')
-        df_posts.to_csv(posts_backup, index=False, encoding='utf-8-sig')
-        
-        logger.info(f"데이터 백업 완료: {backup_dir}")
+        backup_store = BackupStore(os.path.join(data_dir, BACKUP_DIR_NAME))
+        post_key = 'post_pk' if 'post_pk' in df_posts.columns else 'id'
+        snapshot_id = backup_store.create_snapshot({
+            'influencers': (df_influencers, 'username'),
+            'posts': (df_posts, post_key),
+        }, label='etl')
+        logger.info(f"데이터 백업 완료: {snapshot_id}")
     except Exception as e:
         logger.warning(f"데이터 백업 실패: {e}")
     
@@ -0,0 +1,346 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+팔로워 시계열 모듈 - 크롤링마다 팔로워/팔로잉/게시물 수를 추가 전용으로 기록
+
+influencers 테이블은 재수집할 때마다 follower_count/media_count를 덮어쓰므로 성장 이력이 남지 않습니다.
+이 모듈은 크롤링 결과가 저장될 때마다 (pk, 수집 시각, 팔로워, 팔로잉, 게시물 수)를
+추가 전용 파일(data/follower_series/series.fsr)에 블록 단위로 덧붙입니다.
+
+블록 형식 (리틀 엔디언):
+    헤더: 매직(4바이트) + 행 수(uint32) + 본문 길이(uint32) + 본문 CRC32(uint32)
+    본문: (pk, 시각) 순으로 정렬한 5개 컬럼을 컬럼 순서대로 이어 붙인 varint 스트림
+          각 컬럼은 이전 행과의 차이(delta)를 zigzag 변환한 값 (첫 행은 0과의 차이)
+
+같은 pk의 연속 관측은 차이가 작아 1~3바이트로 저장됩니다. compact는 모든 블록을 하나로 합쳐
+pk별 관측을 이웃하게 만들므로 차이가 더 작아집니다. 중단으로 잘린 마지막 블록은 다음 기록 전에 잘라냅니다.
+
+읽기/성장률 계산은 numpy 배열 연산으로 처리합니다 (사용자별 반복 없음).
+"""
+
+import os
+import zlib
+import struct
+import logging
+import threading
+from typing import Dict, Iterator, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+# --- 상수 정의 ---
+FOLLOWER_SERIES_DIR_NAME = "follower_series"
+SERIES_FILE_NAME = "series.fsr"
+BLOCK_MAGIC = b"FSR1"
+BLOCK_HEADER = struct.Struct("<4sIII")
+SERIES_COLUMNS = ("pk", "ts", "followers", "following", "media_count")
+GROWTH_WINDOWS = (7, 30)  # 미리 계산하는 성장률 기간(일)
+# 기준 관측이 기간의 이 배수보다 오래되면 성장률을 NaN으로 둠 (관측이 드문 경우 7일 성장률이 30일 변화를 담지 않도록)
+GROWTH_MAX_SPAN_RATIO = 2.0
+SECONDS_PER_DAY = 86400
+
+
+def growth_column(days: int) -> str:
+    """기간별 팔로워 성장률 컬럼명"""
+    return f"follower_growth_{days}d"
+
+
+def _zigzag_encode(values: np.ndarray) -> np.ndarray:
+    """부호 있는 정수를 작은 부호 없는 정수로 변환 (0, -1, 1, -2 -> 0, 1, 2, 3)"""
+    values = values.astype(np.int64)
+    return ((values << 1) ^ (values >> 63)).view(np.uint64)
+
+
+def _zigzag_decode(values: np.ndarray) -> np.ndarray:
+    values = values.astype(np.uint64)
+    return ((values >> np.uint64(1)).view(np.int64) ^ -(values & np.uint64(1)).view(np.int64))
+
+
+def encode_varints(values: np.ndarray) -> bytes:
+    """부호 없는 정수 배열을 LEB128 varint 바이트열로 인코딩 (벡터 연산)"""
+    values = np.asarray(values, dtype=np.uint64)
+    if len(values) == 0:
+        return b""
+    # 값마다 필요한 바이트 수 (7비트 단위, 최소 1바이트)
+    bit_length = np.zeros(len(values), dtype=np.int64)
+    remaining = values.copy()
+    while remaining.any():
+        nonzero = remaining > 0
+        bit_length += nonzero
+        remaining >>= np.uint64(1)
+    byte_count = np.maximum(1, (bit_length + 6) // 7)
+
+    max_bytes = int(byte_count.max())
+    shifts = (np.arange(max_bytes, dtype=np.uint64) * np.uint64(7))[None, :]
+    groups = ((values[:, None] >> shifts) & np.uint64(0x7F)).astype(np.uint8)
+    position = np.arange(max_bytes)[None, :]
+    groups[position < (byte_count[:, None] - 1)] |= 0x80
+    return groups[position < byte_count[:, None]].tobytes()
+
+
+def decode_varints(data: bytes, count: int) -> np.ndarray:
+    """varint 바이트열에서 부호 없는 정수 count개 디코딩 (벡터 연산)"""
+    raw = np.frombuffer(data, dtype=np.uint8)
+    ends = np.flatnonzero(raw < 0x80)
+    if len(ends) != count:
+        raise ValueError(f"varint 개수 불일치: {len(ends)} != {count}")
+    if count == 0:
+        return np.zeros(0, dtype=np.uint64)
+    starts = np.concatenate(([0], ends[:-1] + 1))
+    # 바이트마다 속한 값 안에서의 위치 -> 7비트씩 자리 이동
+    position = np.arange(len(raw)) - np.repeat(starts, ends - starts + 1)
+    parts = (raw & 0x7F).astype(np.uint64) << (position.astype(np.uint64) * np.uint64(7))
+    return np.bitwise_or.reduceat(parts, starts)
+
+
+def _sort_order(pks: np.ndarray, ts: np.ndarray) -> np.ndarray:
+    """(pk, 시각) 순 정렬 인덱스"""
+    return np.lexsort((ts, pks))
+
+
+def encode_block(columns: Dict[str, np.ndarray]) -> bytes:
+    """(pk, 시각) 순으로 정렬된 컬럼을 블록(헤더 + delta/zigzag varint 본문)으로 인코딩"""
+    count = len(columns["pk"])
+    deltas = [
+        _zigzag_encode(np.diff(columns[name].astype(np.int64), prepend=np.int64(0)))
+        for name in SERIES_COLUMNS
+    ]
+    payload = encode_varints(np.concatenate(deltas)) if count else b""
+    return BLOCK_HEADER.pack(BLOCK_MAGIC, count, len(payload), zlib.crc32(payload)) + payload
+
+
+def decode_block(payload: bytes, count: int) -> Dict[str, np.ndarray]:
+    """블록 본문을 컬럼 배열로 디코딩 (delta 누적합으로 원래 값 복원)"""
+    values = _zigzag_decode(decode_varints(payload, count * len(SERIES_COLUMNS)))
+    return {
+        name: np.cumsum(values[i * count:(i + 1) * count])
+        for i, name in enumerate(SERIES_COLUMNS)
+    }
+
+
+class FollowerSeries:
+    """추가 전용 팔로워 시계열 저장소"""
+
+    def __init__(self, series_dir: str):
+        """
+        초기화
+
+        Args:
+            series_dir: 시계열 파일 디렉토리 (보통 data/follower_series)
+        """
+        self.series_dir = series_dir
+        self.path = os.path.join(series_dir, SERIES_FILE_NAME)
+        self._lock = threading.Lock()
+        self._checked_tail = False
+
+    def _iter_blocks(self) -> Iterator[Tuple[int, int, Optional[bytes]]]:
+        """
+        블록 순회: (블록 시작 위치, 행 수, 본문) - 잘렸거나 손상된 블록에서 멈춤
+
+        손상된 블록이면 본문 대신 None을 반환하고 순회를 끝냅니다.
+        """
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, 'rb') as f:
+            offset = 0
+            while True:
+                header = f.read(BLOCK_HEADER.size)
+                if not header:
+                    return
+                if len(header) < BLOCK_HEADER.size:
+                    yield offset, 0, None
+                    return
+                magic, count, length, crc = BLOCK_HEADER.unpack(header)
+                payload = f.read(length)
+                if magic != BLOCK_MAGIC or len(payload) < length or zlib.crc32(payload) != crc:
+                    yield offset, 0, None
+                    return
+                yield offset, count, payload
+                offset += BLOCK_HEADER.size + length
+
+    def _truncate_torn_tail(self) -> None:
+        """중단으로 잘린 마지막 블록 제거 (뒤에 덧붙인 블록이 읽히도록)"""
+        for offset, _, payload in self._iter_blocks():
+            if payload is None:
+                logging.warning(f"팔로워 시계열의 손상된 마지막 블록 제거: {self.path} (위치 {offset})")
+                with open(self.path, 'r+b') as f:
+                    f.truncate(offset)
+                return
+
+    def append(self, pks, timestamps, followers, following, media_counts) -> int:
+        """
+        관측값을 새 블록으로 덧붙임
+
+        Args:
+            pks: 인플루언서 pk 배열 (0인 행은 정보가 없는 계정이라 제외)
+            timestamps: 수집 시각 (datetime64 또는 Unix 초)
+            followers, following, media_counts: 팔로워/팔로잉/게시물 수
+
+        Returns:
+            기록한 행 수
+        """
+        ts = np.asarray(timestamps)
+        if np.issubdtype(ts.dtype, np.datetime64):
+            ts = ts.astype("datetime64[s]").astype(np.int64)
+        columns = {
+            "pk": np.asarray(pks, dtype=np.int64),
+            "ts": ts.astype(np.int64),
+            "followers": np.asarray(followers, dtype=np.int64),
+            "following": np.asarray(following, dtype=np.int64),
+            "media_count": np.asarray(media_counts, dtype=np.int64),
+        }
+        valid = columns["pk"] > 0
+        order = _sort_order(columns["pk"][valid], columns["ts"][valid])
+        columns = {name: values[valid][order] for name, values in columns.items()}
+        if len(order) == 0:
+            return 0
+
+        block = encode_block(columns)
+        with self._lock:
+            os.makedirs(self.series_dir, exist_ok=True)
+            if not self._checked_tail:
+                self._truncate_torn_tail()
+                self._checked_tail = True
+            with open(self.path, 'ab') as f:
+                f.write(block)
+                f.flush()
+                os.fsync(f.fileno())
+        return len(order)
+
+    def append_influencers(self, df: pd.DataFrame, crawled_at_column: str = "crawled_at") -> int:
+        """influencers 테이블 형식 DataFrame(수집 시각 포함)의 관측값을 덧붙임"""
+        if df is None or df.empty or 'pk' not in df.columns:
+            return 0
+        if crawled_at_column in df.columns:
+            timestamps = pd.to_datetime(df[crawled_at_column]).to_numpy(dtype="datetime64[s]")
+        else:
+            timestamps = np.full(len(df), np.datetime64("now", "s"))
+
+        def counts(column):
+            return pd.to_numeric(df[column], errors='coerce').fillna(0).to_numpy(dtype=np.int64)
+
+        return self.append(
+            counts('pk'), timestamps,
+            counts('follower_count'), counts('following_count'), counts('media_count')
+        )
+
+    def read(self) -> Dict[str, np.ndarray]:
+        """
+        전체 관측값을 (pk, 시각) 순으로 정렬된 컬럼 배열로 읽기
+
+        같은 (pk, 시각) 관측이 여러 번 기록되었으면 마지막 것만 남깁니다.
+        """
+        blocks = [decode_block(payload, count) for _, count, payload in self._iter_blocks() if payload]
+        if not blocks:
+            return {name: np.zeros(0, dtype=np.int64) for name in SERIES_COLUMNS}
+        columns = {name: np.concatenate([block[name] for block in blocks]) for name in SERIES_COLUMNS}
+
+        # 기록 순서를 유지한 정렬 후 같은 (pk, 시각)의 마지막 관측만 유지
+        order = _sort_order(columns["pk"], columns["ts"])
+        columns = {name: values[order] for name, values in columns.items()}
+        pk, ts = columns["pk"], columns["ts"]
+        last = np.ones(len(pk), dtype=bool)
+        last[:-1] = (pk[1:] != pk[:-1]) | (ts[1:] != ts[:-1])
+        return {name: values[last] for name, values in columns.items()}
+
+    def read_frame(self) -> pd.DataFrame:
+        """전체 관측값 DataFrame (ts는 datetime)"""
+        df = pd.DataFrame(self.read())
+        df["ts"] = pd.to_datetime(df["ts"], unit="s")
+        return df
+
+    def growth(self, window_days: int, as_of=None, max_span_ratio: float = GROWTH_MAX_SPAN_RATIO) -> pd.DataFrame:
+        """
+        pk별 기간 팔로워 성장률 (벡터 연산)
+
+        as_of 이전의 최신 관측과, 그보다 window_days일 전 시점 이전의 최신 관측(없으면 가장 오래된 관측)을
+        비교합니다. 따라서 실제 비교 기간(days 컬럼)은 window_days와 다를 수 있습니다.
+
+        - 기간 시작 전 관측이 없으면 기간보다 짧은 변화입니다 (가장 오래된 관측부터).
+        - 관측이 드물면 기준 관측이 기간 시작보다 훨씬 오래될 수 있습니다 (예: 10일, 40일에만 수집하면
+          7일 기준 관측도 10일 관측). 비교 기간이 window_days * max_span_ratio를 넘으면 성장률은 NaN입니다.
+        - 관측이 하나뿐인 pk의 성장률도 NaN입니다.
+
+        Args:
+            window_days: 기간(일)
+            as_of: 기준 시각 (기본값: 전체 관측의 최신 시각까지)
+            max_span_ratio: 허용하는 최대 비교 기간 (window_days의 배수, 0 이하이면 제한 없음)
+
+        Returns:
+            DataFrame[pk, followers, base_followers, follower_delta, follower_growth, days]
+        """
+        columns = self.read()
+        if as_of is not None:
+            cutoff = int(pd.Timestamp(as_of).timestamp())
+            keep = columns["ts"] <= cutoff
+            columns = {name: values[keep] for name, values in columns.items()}
+        pk, ts, followers = columns["pk"], columns["ts"], columns["followers"]
+        if len(pk) == 0:
+            return pd.DataFrame(columns=["pk", "followers", "base_followers", "follower_delta", "follower_growth", "days"])
+
+        # pk 그룹 경계 (정렬되어 있으므로 값이 바뀌는 위치)
+        group_start = np.flatnonzero(np.concatenate(([True], pk[1:] != pk[:-1])))
+        group_end = np.concatenate((group_start[1:], [len(pk)])) - 1
+        group_id = np.repeat(np.arange(len(group_start)), np.diff(np.concatenate((group_start, [len(pk)]))))
+
+        # (그룹, 시각)을 하나의 정렬된 키로 합쳐 그룹별 기준 시점을 searchsorted로 한 번에 찾음
+        ts_min = int(ts.min())
+        span = int(ts.max()) - ts_min + window_days * SECONDS_PER_DAY + 1
+        key = group_id * span + (ts - ts_min)
+        target = group_id[group_end] * span + (ts[group_end] - ts_min - window_days * SECONDS_PER_DAY)
+        base = np.searchsorted(key, target, side="right") - 1
+        base = np.maximum(base, group_start)
+
+        latest = followers[group_end].astype(np.float64)
+        base_followers = followers[base].astype(np.float64)
+        delta = latest - base_followers
+        span = ts[group_end] - ts[base]
+        observed = base < group_end
+        if max_span_ratio > 0:
+            observed &= span <= window_days * SECONDS_PER_DAY * max_span_ratio
+        growth = np.where(observed, delta / np.maximum(base_followers, 1.0), np.nan)
+        return pd.DataFrame({
+            "pk": pk[group_end],
+            "followers": followers[group_end],
+            "base_followers": followers[base],
+            "follower_delta": np.where(observed, delta, np.nan),
+            "follower_growth": growth,
+            "days": span / SECONDS_PER_DAY,
+        })
+
+    def growth_features(self, windows: Sequence[int] = GROWTH_WINDOWS, as_of=None) -> pd.DataFrame:
+        """검색 랭킹용 pk별 성장률 피처 (follower_growth_7d, follower_growth_30d 등)"""
+        features = None
+        for days in windows:
+            growth = self.growth(days, as_of)[["pk", "follower_growth"]].rename(
+                columns={"follower_growth": growth_column(days)}
+            )
+            features = growth if features is None else features.merge(growth, on="pk", how="outer")
+        return features if features is not None else pd.DataFrame(columns=["pk"])
+
+    def compact(self) -> int:
+        """
+        모든 블록을 (pk, 시각) 순 단일 블록으로 다시 기록 (임시 파일 -> rename)
+
+        같은 pk의 관측이 이웃하므로 delta가 작아져 파일이 줄어듭니다.
+
+        Returns:
+            남은 행 수
+        """
+        with self._lock:
+            if not os.path.exists(self.path):
+                return 0
+            columns = self.read()
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(encode_block(columns))
+                f.flush()
+                os.fsync(f.fileno())
+            before = os.path.getsize(self.path)
+            os.replace(tmp_path, self.path)
+            self._checked_tail = True
+            logging.info(
+                f"팔로워 시계열 압축: {len(columns['pk'])}행, {before:,}바이트 -> {os.path.getsize(self.path):,}바이트"
+            )
+            return len(columns["pk"])
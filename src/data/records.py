@@ -0,0 +1,113 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+크롤링 레코드 모듈 - 인플루언서/게시물의 테이블 컬럼만 담는 경량 레코드
+
+instagrapi 모델을 `.dict()`로 전부 직렬화하면 쓰지 않는 수십 개 필드까지 딕셔너리로 만들고
+메모리에 남깁니다. 레코드는 테이블 컬럼만 가진 NamedTuple로, 모델 속성에서 바로 채우며
+Arrow 배치로도 컬럼 단위로 바로 변환됩니다.
+"""
+
+from datetime import datetime
+from typing import Any, NamedTuple, Optional, Sequence, Union
+
+import pyarrow as pa
+
+from .columnar import CRAWLED_AT_COLUMN, TABLES
+
+
+def _url(value: Any) -> str:
+    """URL(HttpUrl 등)을 문자열로 변환 (없으면 빈 문자열)"""
+    return str(value) if value else ''
+
+
+class InfluencerRecord(NamedTuple):
+    """influencers 테이블 한 행 (컬럼 순서는 CREATE TABLE 정의와 동일)"""
+    username: str
+    pk: int = 0
+    full_name: str = ''
+    follower_count: int = 0
+    following_count: int = 0
+    media_count: int = 0
+    biography: str = ''
+    category: str = ''
+    external_url: str = ''
+    is_private: bool = False
+    is_verified: bool = False
+
+    @classmethod
+    def from_user(cls, user: Any, category: Optional[str] = None, username: Optional[str] = None) -> "InfluencerRecord":
+        """instagrapi User 모델 속성에서 레코드 생성 (모델 전체를 직렬화하지 않음)"""
+        return cls(
+            username=username or user.username,
+            pk=int(user.pk or 0),
+            full_name=user.full_name or '',
+            follower_count=user.follower_count or 0,
+            following_count=user.following_count or 0,
+            media_count=user.media_count or 0,
+            biography=user.biography or '',
+            category=category or '',
+            external_url=_url(user.external_url),
+            is_private=bool(user.is_private),
+            is_verified=bool(user.is_verified),
+        )
+
+    @classmethod
+    def private_account(cls, username: str) -> "InfluencerRecord":
+        """정보를 볼 수 없는 비공개 계정 레코드"""
+        return cls(username=username, is_private=True)
+
+
+class PostRecord(NamedTuple):
+    """posts 테이블 한 행 (컬럼 순서는 CREATE TABLE 정의와 동일)"""
+    id: str
+    user_pk: int = 0
+    username: str = ''
+    caption: str = ''
+    like_count: int = 0
+    comment_count: int = 0
+    taken_at: Optional[datetime] = None
+    media_type: int = 0
+    product_type: str = ''
+    image_url: str = ''
+    video_url: str = ''
+
+    @classmethod
+    def from_media(cls, media: Any, user_pk: int, username: str) -> "PostRecord":
+        """instagrapi Media 모델 속성에서 레코드 생성 (모델 전체를 직렬화하지 않음)"""
+        return cls(
+            id=str(media.id),
+            user_pk=int(user_pk or 0),
+            username=username,
+            caption=getattr(media, 'caption_text', None) or '',
+            like_count=media.like_count or 0,
+            comment_count=media.comment_count or 0,
+            taken_at=media.taken_at,
+            media_type=media.media_type or 0,
+            product_type=getattr(media, 'product_type', None) or '',
+            image_url=_url(getattr(media, 'thumbnail_url', None)),
+            video_url=_url(getattr(media, 'video_url', None)),
+        )
+
+
+Record = Union[InfluencerRecord, PostRecord]
+
+
+def records_to_arrow(records: Sequence[Record], table: str, crawled_at: Optional[datetime] = None) -> pa.RecordBatch:
+    """
+    레코드 목록을 테이블 스키마의 Arrow 배치로 변환 (DataFrame을 거치지 않고 컬럼 단위로 생성)
+
+    Args:
+        records: 같은 테이블의 레코드 목록
+        table: 'influencers' 또는 'posts'
+        crawled_at: 수집 시각 (기본값: 현재 시각)
+    """
+    schema = TABLES[table][0]
+    columns = list(zip(*records)) if records else [()] * (len(schema) - 1)
+    arrays = [
+        pa.array(values, type=field.type)
+        for field, values in zip(schema, columns)
+    ]
+    arrays.append(pa.array([crawled_at or datetime.now()] * len(records), type=schema.field(CRAWLED_AT_COLUMN).type))
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
@@ -24,6 +24,11 @@ from typing import List, Dict, Set, Tuple, Any, Optional
 
 # 모듈화된 코드 임포트
 from .db import DatabaseManager
+from .segment_store import SegmentStore
+from .checkpoint import STATUS_FAILED
+from .db_writer import DBWriter
+from .records import InfluencerRecord, PostRecord
+from .columnar import INFLUENCER_COLUMNS, POST_COLUMNS
 from .api import InstagramClient, ProxyManager, fetch_instagram_data, send_notification
 from .config import Config
 from .utils import (
@@ -33,10 +38,13 @@ from .utils import (
 )
 
 # 전역 변수
-influencers_info = {}
-all_post_details = []
+# 수집 결과는 쓰기 스레드로 바로 넘기고 메모리에는 개수만 유지
+collected_influencers = 0
+collected_posts = 0
 data_dir = "data"
 db_manager = None
+segment_store = None
+db_writer = None
 config = None
 
 # 설정 파라미터 (나중에 YAML로 분리 가능)
@@ -44,6 +52,7 @@ SAVE_INTERVAL = 10
 PROXY_SWITCH_THRESHOLD = 3
 RATE_LIMIT_COOLDOWN = 60
 MAX_PROXY_FAILURES = 5
+SIGNAL_FLUSH_TIMEOUT = 30  # 신호 처리 시 쓰기 스레드 기록을 기다리는 최대 시간(초)
 PROXIES = []  # 프록시 목록 (비어있으면 직접 연결)
 NUM_POSTS_TO_FETCH = 10  # 사용자별 게시물 수집 개수
 TARGET_USERNAMES = []  # 수집 대상 사용자명 목록
@@ -121,8 +130,8 @@ def init_database():
 def save_influencer_to_db(conn, influencer):
     """인플루언서 정보를 데이터베이스에 저장"""
     try:
-        conn.execute("""
-            INSERT OR REPLACE INTO influencers 
+        conn.execute(f"""
+            INSERT OR REPLACE INTO influencers ({", ".join(INFLUENCER_COLUMNS)})
             VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
         """, (
             influencer.get('username', ''),
@@ -146,8 +155,8 @@ def save_influencer_to_db(conn, influencer):
 def save_post_to_db(conn, post):
     """게시물 정보를 데이터베이스에 저장"""
     try:
-        conn.execute("""
-            INSERT OR IGNORE INTO posts 
+        conn.execute(f"""
+            INSERT OR IGNORE INTO posts ({", ".join(POST_COLUMNS)})
             VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
         """, (
             post.get('id', ''),
@@ -220,12 +229,14 @@ def save_data_to_csv(influencers, posts, is_temp=False, conn=None):
 # 시그널 핸들러 함수
 def save_current_data_handler(signum=None, frame=None):
     """시그널을 받으면 현재까지 수집된 데이터를 저장"""
-    global influencers_info, all_post_details, data_dir, db_manager
+    global collected_influencers, collected_posts, data_dir, db_writer
     
-    logging.info(f"신호 수신: 현재까지 수집된 데이터 저장 중... ({len(influencers_info)}명 인플루언서, {len(all_post_details)}개 게시물)")
+    logging.info(f"신호 수신: 현재까지 수집된 데이터 저장 중... ({collected_influencers}명 인플루언서, {collected_posts}개 게시물)")
     
-    if db_manager:
-        db_manager.save_data_to_csv(influencers_info, all_post_details, is_temp=True)
+    # 쓰기 스레드 큐에 남은 레코드를 세그먼트 + DB에 기록할 때까지 대기
+    # (DB가 멈춰도 신호 처리가 끝나도록 제한 시간까지만 대기)
+    if db_writer and not db_writer.flush(timeout=SIGNAL_FLUSH_TIMEOUT):
+        logging.warning(f"쓰기 스레드 기록이 {SIGNAL_FLUSH_TIMEOUT}초 안에 끝나지 않았습니다. 남은 레코드는 체크포인트에 없으므로 다음 실행에서 다시 수집됩니다.")
     
     # 진행 상황 저장
     if 'start_time' in globals():
@@ -233,8 +244,8 @@ def save_current_data_handler(signum=None, frame=None):
             data_dir,
             TARGET_USERNAMES if 'TARGET_USERNAMES' in globals() else [],
             processed_users if 'processed_users' in globals() else set(),
-            len(influencers_info),
-            len(all_post_details),
+            collected_influencers,
+            collected_posts,
             globals().get('start_time', time.time())
         )
     
@@ -243,12 +254,18 @@ def save_current_data_handler(signum=None, frame=None):
 # 종료 시 데이터 저장 함수 (atexit에 등록)
 def save_and_exit():
     """프로그램 종료 시 데이터 저장"""
-    global influencers_info, all_post_details, data_dir, db_manager
+    global collected_influencers, collected_posts, data_dir, segment_store, db_writer
     
     logging.info("프로그램 종료 - 데이터 저장 중...")
     
-    if db_manager:
-        db_manager.save_data_to_csv(influencers_info, all_post_details, is_temp=False)
+    # 남은 레코드를 기록하고 쓰기 스레드 종료 후 세그먼트를 최종 결과로 압축
+    if db_writer:
+        db_writer.close()
+    if segment_store:
+        try:
+            segment_store.compact()
+        except Exception as e:
+            logging.error(f"세그먼트 압축 실패 (세그먼트는 남겨 두고 다음 실행에서 DB에 다시 반영): {str(e)}")
     
     logging.info("종료 시 데이터 저장 완료")
     
@@ -257,12 +274,12 @@ def save_and_exit():
     if webhook_url:
         send_notification(
             "스크래핑 작업이 종료되었습니다.", 
-            f"인플루언서 {len(influencers_info)}명, 게시물 {len(all_post_details)}개 수집 완료", 
+            f"인플루언서 {collected_influencers}명, 게시물 {collected_posts}개 수집 완료", 
             webhook_url
         )
 
 # 개선된 인스타그램 데이터 수집 함수
-def fetch_instagram_data_thread(username: str, proxy_manager: ProxyManager, user_agents: List[str]) -> Tuple[Optional[Dict], List[Dict]]:
+def fetch_instagram_data_thread(username: str, proxy_manager: ProxyManager, user_agents: List[str]) -> Tuple[Optional[InfluencerRecord], List[PostRecord]]:
     """스레드별 인스타그램 데이터 수집 함수"""
     # 스레드별 클라이언트 생성
     client = InstagramClient(proxy_manager, user_agents)
@@ -284,7 +301,7 @@ def fetch_instagram_data_thread(username: str, proxy_manager: ProxyManager, user
 # 메인 함수
 def main():
     """메인 스크래퍼 함수"""
-    global influencers_info, all_post_details, data_dir, db_manager, config
+    global collected_influencers, collected_posts, data_dir, db_manager, segment_store, db_writer, config
     global TARGET_USERNAMES, processed_users, start_time
     
     # 명령행 인수 파싱
@@ -315,8 +332,9 @@ def main():
     config.load_proxies_from_env()
     proxy_manager = ProxyManager(config.proxies, config.max_proxy_failures)
     
-    # 데이터베이스 초기화
+    # 데이터베이스 및 증분 저장소 초기화
     db_manager = DatabaseManager(data_dir)
+    segment_store = SegmentStore(db_manager, data_dir=data_dir)
     
     # 체크포인트 로드 (재수집 모드가 아닐 경우만)
     processed_users = set()
@@ -330,14 +348,16 @@ def main():
     TARGET_USERNAMES = db_manager.load_target_usernames(args.users)
     logging.info(f"타겟 사용자명 로드 완료: {len(TARGET_USERNAMES)}명")
     
-    # 임시 데이터 로드 (이전 실행이 중단된 경우)
-    temp_influencers, temp_posts = db_manager.load_temp_data()
-    if temp_influencers:
-        influencers_info.update(temp_influencers)
-        logging.info(f"임시 인플루언서 데이터 {len(temp_influencers)}건 로드됨")
-    if temp_posts:
-        all_post_details.extend(temp_posts)
-        logging.info(f"임시 게시물 데이터 {len(temp_posts)}건 로드됨")
+    # 이전 실행이 중단되어 남은 세그먼트를 DB에 반영하고, 기록된 사용자는 재수집하지 않음
+    recovered_users = segment_store.replay()
+    if recovered_users and not args.rescrape:
+        processed_users |= recovered_users
+        for username in recovered_users:
+            db_manager.record_checkpoint(username)
+        logging.info(f"세그먼트에서 복구한 사용자 {len(recovered_users)}명 제외")
+    
+    # 단일 쓰기 스레드 (이후 세그먼트/DB 기록과 완료 체크포인트 추가는 쓰기 스레드만 수행)
+    db_writer = DBWriter(segment_store, checkpoint=db_manager.checkpoint, batch_size=config.save_interval)
     
     # 대상 사용자 처리 
     if TARGET_USERNAMES:
@@ -383,33 +403,31 @@ def main():
             
             # 결과 수집
             for future in as_completed(future_to_username):
-                username = future_to_username[future]
+                # 완료된 Future는 사전에서 제거 (결과를 쥔 채 남아 있지 않도록)
+                username = future_to_username.pop(future)
                 try:
                     user_details, user_posts = future.result()
                     
                     # 성공적으로 가져온 경우에만 추가
                     if user_details:
-                        influencers_info[username] = user_details
-                        all_post_details.extend(user_posts)
+                        collected_influencers += 1
+                        collected_posts += len(user_posts)
                         
-                        # 데이터베이스에 즉시 저장
-                        db_manager.save_influencer(user_details)
-                        for post in user_posts:
-                            db_manager.save_post(post)
+                        # 저장은 쓰기 스레드에 넘김 (기록이 끝나면 쓰기 스레드가 체크포인트 저널에 추가)
+                        db_writer.submit(username, user_details, user_posts)
                         
-                        # 체크포인트 업데이트
                         processed_users.add(username)
                         processed_users_count += 1
                         
                         logging.info(f"'{username}' 정보 수집 완료. 게시물 {len(user_posts)}개 추가. 총 {processed_users_count}/{len(usernames_to_fetch)}명 수집 완료.")
                     else:
                         errors_count += 1
+                        db_manager.record_checkpoint(username, STATUS_FAILED)
                         logging.warning(f"'{username}' 정보 수집 실패.")
                         
                     # 주기적 저장 및 진행 상황 보고
                     if processed_users_count % config.save_interval == 0:
-                        db_manager.save_checkpoint(processed_users)
-                        db_manager.save_data_to_csv(influencers_info, all_post_details, is_temp=True)
+                        db_manager.save_checkpoint()
                         
                         # 진행 상황 보고
                         mem_usage = memory_usage()
@@ -422,26 +440,24 @@ def main():
                         )
                         
                         logging.info(f"중간 저장 완료 ({processed_users_count}명)\n{progress_report}")
-                        
-                        # 메모리 관리
-                        if mem_usage > 500:  # 500MB 이상인 경우
-                            logging.info("메모리 정리 중...")
-                            import gc
-                            gc.collect()
                 except Exception as e:
                     logging.error(f"'{username}' 처리 중 오류: {str(e)}")
                     errors_count += 1
         
         # 해시태그로 부터 사용자 수집 - 생략 (기존 코드와 동일)
         
-        # 최종 결과 저장
-        db_manager.save_checkpoint(processed_users, force_save=True)
-        db_manager.save_data_to_csv(influencers_info, all_post_details, is_temp=False)
+        # 최종 결과 저장 (남은 레코드 기록 후 쓰기 스레드 종료)
+        db_writer.close()
+        try:
+            segment_store.compact()
+        except Exception as e:
+            logging.error(f"세그먼트 압축 실패 (세그먼트는 남겨 두고 다음 실행에서 DB에 다시 반영): {str(e)}")
+        db_manager.save_checkpoint(force_save=True)
         
         # 완료 메시지
         end_time = time.time()
         duration_hours = (end_time - start_time) / 3600
-        logging.info(f"수집 완료: 인플루언서 {len(influencers_info)}명, 게시물 {len(all_post_details)}개")
+        logging.info(f"수집 완료: 인플루언서 {collected_influencers}명, 게시물 {collected_posts}개")
         logging.info(f"총 소요 시간: {duration_hours:.2f}시간")
         
         # 임시 파일 정리
@@ -0,0 +1,276 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+증분 저장 모듈 - 추가 전용 세그먼트 파일 + DB 델타 upsert
+
+중간 저장 때마다 누적 데이터 전체를 CSV로 다시 쓰고 DB에 재삽입하면 크롤링이 길어질수록
+총 I/O가 제곱으로 늘어납니다. 이 모듈은 마지막 flush 이후 새로 수집한 레코드만
+세그먼트 파일(Arrow IPC)로 추가하고 같은 델타만 DB에 upsert합니다.
+이전 형식(JSONL) 세그먼트도 그대로 읽습니다.
+
+- flush: 대기 중인 레코드를 새 세그먼트 파일로 원자적으로 기록(임시 파일 -> rename)한 뒤 DB upsert
+- compact: 크롤링 완료 시 세그먼트를 묶음 단위로 읽어 최종 결과(Parquet 데이터셋 또는 CSV)를 만들고 세그먼트 삭제,
+  이어서 DB 테이블의 백업 스냅샷 생성
+- 인플루언서 세그먼트를 기록할 때 팔로워/게시물 수를 팔로워 시계열(follower_series)에도 덧붙임
+- replay: 이전 실행이 중단되어 남은 세그먼트를 DB에 다시 upsert (upsert라 여러 번 실행해도 안전)
+"""
+
+import os
+import json
+import glob
+import logging
+import threading
+from typing import Iterator, List, Optional, Set, Tuple
+
+import pandas as pd
+import pyarrow as pa
+
+from .db import DatabaseManager
+from .follower_series import FollowerSeries, FOLLOWER_SERIES_DIR_NAME
+from .records import InfluencerRecord, PostRecord, records_to_arrow
+
+# --- 상수 정의 ---
+SEGMENT_DIR_NAME = "segments"
+SEGMENT_TABLES = ("influencers", "posts")
+SEGMENT_SUFFIX = ".arrow"
+LEGACY_SEGMENT_SUFFIX = ".jsonl"
+COMPACT_CHUNK_ROWS = 200000  # 복구/압축 시 한 번에 읽는 최대 레코드 수
+
+
+class SegmentStore:
+    """크롤링 결과 증분 저장소 (추가 전용 세그먼트 + DB 델타 upsert)"""
+
+    def __init__(self, db_manager: DatabaseManager, data_dir: str = "data", segment_dir: Optional[str] = None):
+        """
+        초기화
+
+        Args:
+            db_manager: 델타를 upsert할 데이터베이스 매니저
+            data_dir: 데이터 디렉토리
+            segment_dir: 세그먼트 파일 디렉토리 (기본값: data_dir/segments)
+        """
+        self.db_manager = db_manager
+        self.data_dir = data_dir
+        self.segment_dir = segment_dir or os.path.join(data_dir, SEGMENT_DIR_NAME)
+        os.makedirs(self.segment_dir, exist_ok=True)
+        # 재수집 때마다 덮어쓰는 팔로워 수의 이력 (성장률 피처 계산용)
+        self.follower_series = FollowerSeries(os.path.join(data_dir, FOLLOWER_SERIES_DIR_NAME))
+
+        # 마지막 flush 이후 수집한 레코드 (시그널 핸들러/하트비트 스레드에서도 flush하므로 잠금 사용)
+        self._lock = threading.Lock()
+        self._pending_influencers: List[InfluencerRecord] = []
+        self._pending_posts: List[PostRecord] = []
+        self._next_seq = self._last_seq() + 1
+
+        # 통계
+        self.flushed_influencers = 0
+        self.flushed_posts = 0
+        # DB에 실제로 기록된(새로 추가되었거나 내용이 바뀐) 행 수
+        self.changed_influencers = 0
+        self.changed_posts = 0
+        # flush 중 DB upsert가 실패한 세그먼트가 있는지 (compact에서 삭제 전에 다시 upsert)
+        self._db_behind = False
+
+    def _segment_files(self, table: str) -> List[str]:
+        """테이블의 세그먼트 파일 목록 (기록 순서, 이전 형식 포함)"""
+        return sorted(
+            glob.glob(os.path.join(self.segment_dir, f"{table}-*{SEGMENT_SUFFIX}"))
+            + glob.glob(os.path.join(self.segment_dir, f"{table}-*{LEGACY_SEGMENT_SUFFIX}"))
+        )
+
+    @staticmethod
+    def _segment_seq(table: str, path: str) -> int:
+        """세그먼트 파일명의 순번"""
+        return int(os.path.splitext(os.path.basename(path))[0][len(table) + 1:])
+
+    def _last_seq(self) -> int:
+        """기존 세그먼트의 마지막 순번 (없으면 0)"""
+        return max(self._segment_seqs(), default=0)
+
+    def add(self, influencer: Optional[InfluencerRecord], posts: List[PostRecord]) -> None:
+        """사용자 한 명의 수집 결과를 대기열에 추가"""
+        with self._lock:
+            if influencer:
+                self._pending_influencers.append(influencer)
+            self._pending_posts.extend(posts)
+
+    def pending_count(self) -> int:
+        """flush 대기 중인 레코드 수"""
+        with self._lock:
+            return len(self._pending_influencers) + len(self._pending_posts)
+
+    def _write_segment(self, table: str, seq: int, batch: pa.RecordBatch) -> str:
+        """Arrow 배치를 세그먼트 파일로 기록 (임시 파일에 쓰고 fsync 후 rename하여 부분 기록 방지)"""
+        path = os.path.join(self.segment_dir, f"{table}-{seq:06d}{SEGMENT_SUFFIX}")
+        tmp_path = path + ".tmp"
+        with open(tmp_path, 'wb') as f:
+            with pa.ipc.new_file(f, batch.schema) as writer:
+                writer.write_batch(batch)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+        return path
+
+    def flush(self) -> int:
+        """
+        대기 중인 레코드를 새 세그먼트로 기록하고 DB에 upsert
+
+        Returns:
+            기록한 레코드 수
+        """
+        with self._lock:
+            influencers, self._pending_influencers = self._pending_influencers, []
+            posts, self._pending_posts = self._pending_posts, []
+            if not influencers and not posts:
+                return 0
+            seq = self._next_seq
+            self._next_seq += 1
+
+            influencers_batch = records_to_arrow(influencers, "influencers")
+            posts_batch = records_to_arrow(posts, "posts")
+            if influencers:
+                self._write_segment("influencers", seq, influencers_batch)
+            if posts:
+                self._write_segment("posts", seq, posts_batch)
+
+            influencers_df = influencers_batch.to_pandas()
+            try:
+                self.follower_series.append_influencers(influencers_df)
+            except Exception as e:
+                logging.warning(f"팔로워 시계열 기록 실패 (세그먼트 {seq:06d}): {str(e)}")
+
+            # 세그먼트가 기록된 뒤 DB upsert (여기서 중단되어도 replay로 복구). 바뀐 행만 기록됨
+            # 실패하면 예외를 그대로 올려 호출 측(DBWriter)이 해당 사용자를 체크포인트에 남기지 않게 함
+            try:
+                changed_influencers = self.db_manager.save_influencers_bulk(influencers_df, raise_errors=True)
+                changed_posts = self.db_manager.save_posts_bulk(posts_batch.to_pandas(), raise_errors=True)
+            except Exception:
+                self._db_behind = True
+                raise
+
+            self.flushed_influencers += len(influencers)
+            self.flushed_posts += len(posts)
+            self.changed_influencers += len(changed_influencers)
+            self.changed_posts += len(changed_posts)
+            logging.info(
+                f"증분 저장: 세그먼트 {seq:06d} (인플루언서 {len(influencers)}건 중 변경 {len(changed_influencers)}건, "
+                f"게시물 {len(posts)}건 중 변경 {len(changed_posts)}건), "
+                f"누적 인플루언서 {self.flushed_influencers}건, 게시물 {self.flushed_posts}건"
+            )
+            return len(influencers) + len(posts)
+
+    def _segment_seqs(self) -> List[int]:
+        """세그먼트 순번 목록 (기록 순서)"""
+        return sorted({
+            self._segment_seq(table, path)
+            for table in SEGMENT_TABLES for path in self._segment_files(table)
+        })
+
+    def _read_segment(self, table: str, seq: int) -> Optional[pd.DataFrame]:
+        """세그먼트 파일 하나 읽기 (해당 테이블 세그먼트가 없으면 None)"""
+        path = os.path.join(self.segment_dir, f"{table}-{seq:06d}{SEGMENT_SUFFIX}")
+        if os.path.exists(path):
+            with pa.memory_map(path) as source:
+                return pa.ipc.open_file(source).read_all().to_pandas()
+
+        legacy_path = os.path.join(self.segment_dir, f"{table}-{seq:06d}{LEGACY_SEGMENT_SUFFIX}")
+        if os.path.exists(legacy_path):
+            with open(legacy_path, 'r', encoding='utf-8') as f:
+                return pd.DataFrame([json.loads(line) for line in f if line.strip()])
+        return None
+
+    def iter_segment_chunks(self, max_rows: int = COMPACT_CHUNK_ROWS) -> Iterator[Tuple[pd.DataFrame, pd.DataFrame]]:
+        """
+        세그먼트를 기록 순서대로 최대 max_rows건씩 묶어 (인플루언서, 게시물) DataFrame으로 읽기
+
+        전체 세그먼트를 한 번에 읽지 않으므로 크롤링 규모와 관계없이 메모리 사용량이 일정합니다.
+        묶음 안에서 인플루언서는 username별, 게시물은 id별 마지막 레코드(최신 정보)를 유지합니다
+        (DB upsert 동작과 동일). 묶음 사이의 중복은 DB upsert와 Parquet 읽기 시 중복 제거로 처리됩니다.
+        """
+        influencers: List[pd.DataFrame] = []
+        posts: List[pd.DataFrame] = []
+        rows = 0
+        seqs = self._segment_seqs()
+        for i, seq in enumerate(seqs):
+            for table, frames in (("influencers", influencers), ("posts", posts)):
+                df = self._read_segment(table, seq)
+                if df is not None and not df.empty:
+                    frames.append(df)
+                    rows += len(df)
+            if rows < max_rows and i < len(seqs) - 1:
+                continue
+
+            influencers_df = pd.concat(influencers, ignore_index=True) if influencers else pd.DataFrame()
+            posts_df = pd.concat(posts, ignore_index=True) if posts else pd.DataFrame()
+            influencers, posts, rows = [], [], 0
+            if 'username' in influencers_df.columns:
+                influencers_df = influencers_df.drop_duplicates(subset=['username'], keep='last')
+            if 'id' in posts_df.columns:
+                posts_df = posts_df.drop_duplicates(subset=['id'], keep='last')
+            yield influencers_df.reset_index(drop=True), posts_df.reset_index(drop=True)
+
+    def replay(self) -> Set[str]:
+        """
+        이전 실행에서 남은 세그먼트를 DB에 다시 upsert (충돌 복구)
+
+        Returns:
+            세그먼트에 결과가 있는 사용자명 집합 (체크포인트에 반영하여 재수집 방지)
+        """
+        with self._lock:
+            usernames: Set[str] = set()
+            total_influencers = total_posts = 0
+            for influencers_df, posts_df in self.iter_segment_chunks():
+                # 실패하면 예외 발생 (DB에 없는 사용자를 처리 완료로 돌려주지 않도록)
+                self.db_manager.save_influencers_bulk(influencers_df, raise_errors=True)
+                self.db_manager.save_posts_bulk(posts_df, raise_errors=True)
+                if 'username' in influencers_df.columns:
+                    usernames.update(influencers_df['username'].dropna())
+                total_influencers += len(influencers_df)
+                total_posts += len(posts_df)
+
+            if total_influencers or total_posts:
+                logging.info(
+                    f"남은 세그먼트 복구: 인플루언서 {total_influencers}건, 게시물 {total_posts}건을 DB에 반영"
+                )
+            return usernames
+
+    def compact(self) -> tuple[int, int]:
+        """
+        대기 중인 레코드를 flush한 뒤 세그먼트를 묶음 단위로 최종 결과에 저장하고 세그먼트 삭제
+
+        이번 실행에서 DB upsert가 실패한 적이 있으면 삭제 전에 세그먼트를 DB에 다시 upsert하고,
+        그래도 실패하면 예외를 발생시키고 세그먼트를 남깁니다 (다음 실행의 replay에서 복구).
+
+        Returns:
+            (인플루언서 수, 게시물 수)
+        """
+        self.flush()
+        with self._lock:
+            total_influencers = total_posts = 0
+            for i, (influencers_df, posts_df) in enumerate(self.iter_segment_chunks()):
+                if self._db_behind:
+                    self.db_manager.save_influencers_bulk(influencers_df, raise_errors=True)
+                    self.db_manager.save_posts_bulk(posts_df, raise_errors=True)
+                # 첫 묶음은 기존 결과를 대체하고 이후 묶음은 이어서 추가
+                self.db_manager.export(influencers_df, posts_df, append=i > 0)
+                total_influencers += len(influencers_df)
+                total_posts += len(posts_df)
+            if not total_influencers and not total_posts:
+                return 0, 0
+
+            if self._db_behind:
+                logging.info("DB upsert가 실패했던 세그먼트를 다시 반영했습니다.")
+                self._db_behind = False
+
+            for table in SEGMENT_TABLES:
+                for path in self._segment_files(table):
+                    os.remove(path)
+            # 크롤링 결과가 반영된 DB 테이블을 백업 스냅샷으로 보관 (변경된 행만 새로 저장)
+            self.db_manager.backup_snapshot()
+            try:
+                self.follower_series.compact()
+            except Exception as e:
+                logging.warning(f"팔로워 시계열 압축 실패: {str(e)}")
+            logging.info(f"세그먼트 압축 완료: 인플루언서 {total_influencers}건, 게시물 {total_posts}건")
+            return total_influencers, total_posts
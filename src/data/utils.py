@@ -13,6 +13,8 @@ from datetime import datetime
 from typing import Set, Dict, List, Any, Optional, Callable, Tuple
 from logging.handlers import RotatingFileHandler
 
+from core.category_matcher import CategoryMatcher, merge_rules, registry as category_registry
+
 def setup_logging(log_dir="logs", level=logging.INFO):
     """로깅 설정"""
     # 로그 디렉토리 생성
@@ -163,6 +165,7 @@ def parse_cli_args():
     parser.add_argument('--mode', default='crawl', choices=['scan', 'crawl'], 
                         help='스크래퍼 모드 (scan: 태그 스캔, crawl: 세부 정보 크롤링)')
     parser.add_argument('--tags', help='스캔할 해시태그 (쉼표로 구분)')
+    parser.add_argument('--tags-file', help='스캔할 해시태그 파일 (한 줄에 하나, 예: scripts/suggest_hashtags.py 결과)')
     parser.add_argument('--limit', type=int, default=5000, help='수집할 최대 사용자 수')
     parser.add_argument('--parallel', type=int, default=5, help='병렬 처리 스레드 수')
     parser.add_argument('--dry-run', action='store_true', help='테스트 모드 (소량만 수집)')
@@ -253,44 +256,59 @@ def with_retry(max_retries=3, base_delay=5):
         return wrapper
     return decorator
 
-@functools.lru_cache(maxsize=10000)
+# 프로필 카테고리 규칙 (앞에 있을수록 우선, 렌즈 관련 키워드가 가장 우선)
+PROFILE_CATEGORY_RULES = [
+    ("렌즈", ['렌즈', '콘택트', '컬러렌즈', '소프트렌즈', 'lens', 'contact', 'color lens', 'lenses']),
+    ("뷰티", ['뷰티', '화장품', '메이크업', 'beauty', 'makeup', 'cosmetic']),
+    ("패션", ['패션', '모델', '스타일', 'fashion', 'model', 'style']),
+    ("의류", ['의류', '쇼핑몰', '옷', 'clothing', 'apparel']),
+    ("여행", ['여행', '트립', 'travel', 'trip', 'journey']),
+    ("푸드", ['맛집', '음식', '레스토랑', 'food', 'restaurant']),
+    ("피트니스", ['피트니스', '운동', '헬스', 'fitness', 'workout', 'gym']),
+]
+PROFILE_MATCHER = "profile"
+
+def _build_profile_matcher(config: dict) -> CategoryMatcher:
+    """프로필 카테고리 규칙 + config.yaml(target_hashtags는 렌즈, category_keywords는 카테고리별 추가)"""
+    overrides = {"렌즈": config.get("target_hashtags") or []}
+    rules = merge_rules(merge_rules(PROFILE_CATEGORY_RULES, overrides), config.get("category_keywords"))
+    return CategoryMatcher(rules)
+
+category_registry.register(PROFILE_MATCHER, _build_profile_matcher)
+
 def parse_category(biography: str) -> str:
-    """사용자 프로필에서 카테고리 분석"""
+    """사용자 프로필에서 카테고리 분석 (키워드 오토마톤으로 한 번에 매칭)"""
     # 비어있으면 빈 문자열 반환
     if not biography:
         return ""
-    
-    # 프로필에서 렌즈 관련 텍스트 찾기
-    lens_keywords = [
-        '렌즈', '콘택트', '컬러렌즈', '소프트렌즈', 
-        'lens', 'contact', 'color lens', 'lenses'
-    ]
-    
-    for keyword in lens_keywords:
-        if keyword.lower() in biography.lower():
-            return "렌즈"
-    
-    # 기타 가능한 카테고리
-    categories = {
-        "뷰티": ['뷰티', '화장품', '메이크업', 'beauty', 'makeup', 'cosmetic'],
-        "패션": ['패션', '모델', '스타일', 'fashion', 'model', 'style'],
-        "의류": ['의류', '쇼핑몰', '옷', 'clothing', 'apparel'],
-        "여행": ['여행', '트립', 'travel', 'trip', 'journey'],
-        "푸드": ['맛집', '음식', '레스토랑', 'food', 'restaurant'],
-        "피트니스": ['피트니스', '운동', '헬스', 'fitness', 'workout', 'gym']
-    }
-    
-    for category, keywords in categories.items():
-        for keyword in keywords:
-            if keyword.lower() in biography.lower():
-                return category
-    
+
+    category = category_registry.get(PROFILE_MATCHER).match(biography)
+    if category:
+        return category
+
     # 이메일 또는 URL이 있으면 비즈니스 계정으로 간주
     if re.search(r'[\w\.-]+@[\w\.-]+', biography) or 'http' in biography:
         return "비즈니스"
-    
+
     return "기타"
 
+def categorize_series(biographies):
+    """
+    프로필 컬럼 전체의 카테고리 분석 (parse_category의 pandas 벡터화 버전)
+
+    Args:
+        biographies: 프로필 텍스트 Series
+
+    Returns:
+        같은 인덱스의 카테고리 Series
+    """
+    texts = biographies.fillna("").astype(str)
+    categories = category_registry.get(PROFILE_MATCHER).categorize_series(texts)
+    # 키워드 적중이 없는 행에만 비즈니스/기타 규칙 적용
+    business = texts.str.contains(r'[\w\.-]+@[\w\.-]+', regex=True) | texts.str.contains('http', regex=False)
+    fallback = business.map({True: "비즈니스", False: "기타"}).where(texts != "", "")
+    return categories.fillna(fallback)
+
 def load_config(config_path="config.yaml"):
     """YAML 설정 파일에서 설정 로드"""
     import yaml
@@ -8,6 +8,8 @@ st.sidebar.header("검색 필터")
 query = st.sidebar.text_input("검색 키워드", "렌즈")
 min_sim = st.sidebar.slider("유사도 임계값", min_value=0.0, max_value=1.0, value=0.25, step=0.05)
 min_follow = st.sidebar.number_input("팔로워 최소", min_value=0, max_value=1_000_000, value=30000, step=5000)
+sort_labels = {"score": "관련도순", "recent": "최신순", "likes": "좋아요순", "followers": "팔로워순"}
+sort_key = st.sidebar.selectbox("정렬", list(sort_labels), format_func=sort_labels.get)
 
 # 추가 필터 (옵션 - 데이터에 해당 컬럼이 있을 경우 활성화)
 # gender = st.sidebar.radio("성별", ["all", "male", "female"], index=0)
@@ -22,16 +24,35 @@ st.write(f"검색 파라미터: 키워드='{query}', 유사도≥{min_sim}, 팔
 # API 서버 주소 설정
 api_url = "http://localhost:5000/search"
 
+# 검색 결과와 함께 받아 표시할 패싯 필드 및 표시 이름
+FACET_LABELS = {
+    "category": "카테고리",
+    "follower_bucket": "팔로워 구간",
+    "is_verified": "인증 계정",
+}
+
 # --- 검색 버튼 로직 ---
 if search_btn: # '검색' 버튼이 클릭되면 아래 로직 실행
     try:
         # API 서버 주소를 로컬호스트로 가정
         # TODO: API 서버 주소를 환경 변수 또는 설정 파일에서 읽어오도록 변경 (하드코딩 지양)
         api_url = "http://localhost:5000/search"
-        # API 서버에 GET 요청 보내기 (파라미터로 검색어 전달)
-        res = requests.get(api_url, params={"q": query})
+        # API 서버에 GET 요청 보내기 (파라미터로 검색어와 패싯 필드 전달)
+        res = requests.get(api_url, params={"q": query, "sort": sort_key, "facets": ",".join(FACET_LABELS)})
         res.raise_for_status() # 요청 실패 시 (4xx, 5xx 상태 코드) 오류 발생
-        data = res.json() # 응답 본문을 JSON 객체로 파싱
+        body = res.json() # 응답 본문을 JSON 객체로 파싱
+        # facets 요청 시 {"results": [...], "facets": {...}} 형태로 응답
+        data = body.get("results", []) if isinstance(body, dict) else body
+        facets = body.get("facets", {}) if isinstance(body, dict) else {}
+
+        # --- 패싯 카운트 표시 ---
+        if facets:
+            facet_cols = st.columns(len(FACET_LABELS))
+            for col, (field, label) in zip(facet_cols, FACET_LABELS.items()):
+                with col:
+                    st.caption(label)
+                    for value, count in facets.get(field, {}).items():
+                        st.write(f"{value}: {count:,}")
 
         # --- 결과 처리 및 표시 ---
         if data: # API로부터 결과 데이터가 있을 경우
@@ -0,0 +1,163 @@
+import os
+import glob
+from datetime import datetime, timedelta
+
+import pandas as pd
+import pytest
+
+from src.data import backup_store
+from src.data.backup_store import BackupStore
+
+
+def make_posts(n, start=0):
+    """테스트용 게시물 테이블 (id 순)"""
+    ids = range(start, start + n)
+    return pd.DataFrame({
+        "id": [f"post-{i:05d}" for i in ids],
+        "like_count": [i * 3 for i in ids],
+        "caption": [f"캡션 {i}" for i in ids],
+    })
+
+
+def restored_equal(store, expected, **kwargs):
+    restored = store.restore("posts", **kwargs)
+    pd.testing.assert_frame_equal(restored, expected.sort_values("id", kind="stable").reset_index(drop=True))
+
+
+class FakeClock:
+    """backup_store.datetime.now()를 원하는 시각으로 고정"""
+
+    def __init__(self, monkeypatch, start):
+        self.now = start
+        clock = self
+
+        class FakeDatetime(datetime):
+            @classmethod
+            def now(cls, tz=None):
+                return clock.now
+
+        monkeypatch.setattr(backup_store, "datetime", FakeDatetime)
+
+    def advance(self, **kwargs):
+        self.now += timedelta(**kwargs)
+
+
+@pytest.fixture
+def store(tmp_path):
+    return BackupStore(str(tmp_path / "backup"), retention=0)
+
+
+def test_restore_older_snapshot_after_modification(store):
+    """스냅샷 이후 테이블이 바뀌어도 이전 스냅샷은 그 시점 그대로 복원됨"""
+    original = make_posts(500)
+    first = store.create_snapshot({"posts": (original, "id")}, label="crawl")
+
+    modified = original.copy()
+    modified.loc[10, "like_count"] = 999999
+    modified = pd.concat([modified.drop(index=[20, 21]), make_posts(5, start=1000)], ignore_index=True)
+    second = store.create_snapshot({"posts": (modified, "id")}, label="crawl")
+
+    restored_equal(store, original, snapshot_id=first)
+    restored_equal(store, modified, snapshot_id=second)
+    # 최신 스냅샷이 기본값
+    restored_equal(store, modified)
+
+    # 바뀌지 않은 행은 다시 저장하지 않음 (수정 1행 + 추가 5행만 새 행)
+    manifest = store.resolve(second)
+    assert manifest["tables"]["posts"]["new_rows"] == 6
+
+
+def test_restore_from_streamed_chunks(store):
+    """기본 키 순으로 나눠 받은 DataFrame 묶음도 한 테이블로 저장/복원"""
+    posts = make_posts(3000)
+    snapshot_id = store.create_snapshot(
+        {"posts": ((posts.iloc[i:i + 700] for i in range(0, len(posts), 700)), "id")}
+    )
+    restored_equal(store, posts, snapshot_id=snapshot_id)
+
+
+def test_prune_keeps_retained_snapshots_restorable(tmp_path):
+    """보존 개수를 넘는 스냅샷을 지우고 정리해도 남은 스냅샷은 복원 가능"""
+    store = BackupStore(str(tmp_path / "backup"), retention=2)
+    versions = []
+    snapshot_ids = []
+    posts = make_posts(2000)
+    for round_ in range(5):
+        # 매번 대부분의 행을 바꿔 이전 세그먼트에 죽은 행이 많이 생기도록 함
+        posts = posts.assign(like_count=posts["like_count"] + round_ + 1)
+        posts.loc[:49, "like_count"] = 0
+        versions.append(posts.copy())
+        snapshot_ids.append(store.create_snapshot({"posts": (posts, "id")}, label="crawl"))
+
+    remaining = [m["id"] for m in store.list_snapshots("crawl")]
+    assert remaining == snapshot_ids[-2:]
+    with pytest.raises(FileNotFoundError):
+        store.resolve(snapshot_ids[0])
+
+    for snapshot_id, expected in zip(snapshot_ids[-2:], versions[-2:]):
+        restored_equal(store, expected, snapshot_id=snapshot_id)
+
+    # 정리를 다시 실행해도 (새 인스턴스에서 인덱스를 다시 읽어도) 결과가 같음
+    store.collect_garbage()
+    reopened = BackupStore(str(tmp_path / "backup"), retention=2)
+    for snapshot_id, expected in zip(snapshot_ids[-2:], versions[-2:]):
+        restored_equal(reopened, expected, snapshot_id=snapshot_id)
+
+    # 남은 스냅샷이 참조하지 않는 행은 세그먼트에서 제거됨
+    index_rows = sum(len(pd.read_parquet(path)) for path in glob.glob(os.path.join(store.row_dir, "index-*.parquet")))
+    assert index_rows <= 2 * 2000
+
+
+def test_prune_is_per_label(tmp_path):
+    """보존 개수는 레이블별로 적용"""
+    store = BackupStore(str(tmp_path / "backup"), retention=1)
+    store.create_snapshot({"posts": (make_posts(10), "id")}, label="etl")
+    store.create_snapshot({"posts": (make_posts(20), "id")}, label="crawl")
+    latest_crawl = store.create_snapshot({"posts": (make_posts(30), "id")}, label="crawl")
+
+    assert len(store.list_snapshots("etl")) == 1
+    assert [m["id"] for m in store.list_snapshots("crawl")] == [latest_crawl]
+    restored_equal(store, make_posts(10), label="etl")
+
+
+def test_duplicate_rows(store):
+    """완전히 같은 행은 한 번만 저장하고 복원 시 개수를 유지"""
+    posts = make_posts(100)
+    duplicated = pd.concat([posts, posts.iloc[[3, 3, 50]]], ignore_index=True)
+    first = store.create_snapshot({"posts": (duplicated, "id")})
+    assert store.resolve(first)["tables"]["posts"]["new_rows"] == 100
+
+    restored = store.restore("posts", snapshot_id=first)
+    assert len(restored) == 103
+    assert (restored["id"] == "post-00003").sum() == 3
+    restored_equal(store, duplicated, snapshot_id=first)
+
+    # 다른 테이블/스냅샷에 같은 행이 있어도 다시 저장하지 않음
+    second = store.create_snapshot({"posts": (posts, "id"), "copy": (posts, "id")})
+    tables = store.resolve(second)["tables"]
+    assert tables["posts"]["new_rows"] == 0 and tables["copy"]["new_rows"] == 0
+    pd.testing.assert_frame_equal(store.restore("copy", snapshot_id=second), posts)
+
+
+def test_as_of_resolution(store, monkeypatch):
+    """as_of 이전의 가장 최근 스냅샷을 레이블별로 찾음"""
+    clock = FakeClock(monkeypatch, datetime(2025, 5, 8, 9, 0, 0))
+    first = store.create_snapshot({"posts": (make_posts(10), "id")}, label="crawl")
+    clock.advance(hours=1)
+    etl = store.create_snapshot({"posts": (make_posts(15), "id")}, label="etl")
+    clock.advance(hours=1)
+    second = store.create_snapshot({"posts": (make_posts(20), "id")}, label="crawl")
+
+    assert store.resolve(as_of="2025-05-08T09:30:00")["id"] == first
+    assert store.resolve(as_of="2025-05-08T10:30:00")["id"] == etl
+    assert store.resolve(as_of="2025-05-08T10:30:00", label="crawl")["id"] == first
+    # datetime 인자 (모듈의 datetime을 가짜 시계로 바꿨으므로 그 클래스로 생성)
+    assert store.resolve(as_of=backup_store.datetime(2025, 5, 8, 11, 0, 0), label="crawl")["id"] == second
+    # 생성 시각과 정확히 같으면 포함
+    assert store.resolve(as_of="2025-05-08T09:00:00")["id"] == first
+
+    restored_equal(store, make_posts(10), as_of="2025-05-08T10:59:59", label="crawl")
+    with pytest.raises(FileNotFoundError):
+        store.resolve(as_of="2025-05-08T08:59:59")
+    with pytest.raises(FileNotFoundError):
+        store.resolve(snapshot_id="crawl-missing")
@@ -0,0 +1,88 @@
+import pytest
+
+from src.data.checkpoint import CheckpointJournal, STATUS_DONE, STATUS_FAILED
+
+
+@pytest.fixture
+def journal_path(tmp_path):
+    return str(tmp_path / "crawler_checkpoint.journal")
+
+
+def read_lines(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return f.read().splitlines()
+
+
+def test_torn_last_line_is_skipped(journal_path):
+    journal = CheckpointJournal(journal_path)
+    journal.record("alice")
+    journal.record("bob")
+    journal.close()
+
+    # 기록 중 중단되어 마지막 줄이 잘린 경우
+    with open(journal_path, "a", encoding="utf-8") as f:
+        f.write("carol\tdo")
+
+    reopened = CheckpointJournal(journal_path)
+    assert reopened.load() == {"alice", "bob"}
+
+    # 이어서 기록하면 잘린 줄 다음 줄에 쓰이므로 새 기록은 읽힘
+    reopened.record("dave")
+    reopened.close()
+    assert CheckpointJournal(journal_path).load() == {"alice", "bob", "dave"}
+
+
+def test_last_status_wins(journal_path):
+    journal = CheckpointJournal(journal_path)
+    journal.record("alice", STATUS_DONE)
+    journal.record("bob", STATUS_DONE)
+    journal.record("alice", STATUS_FAILED)
+    journal.close()
+    assert CheckpointJournal(journal_path).load_statuses() == {"alice": STATUS_FAILED, "bob": STATUS_DONE}
+    assert CheckpointJournal(journal_path).load() == {"bob"}
+
+    journal = CheckpointJournal(journal_path)
+    journal.record("alice", STATUS_DONE)
+    journal.close()
+    reopened = CheckpointJournal(journal_path)
+    assert reopened.load_statuses() == {"alice": STATUS_DONE, "bob": STATUS_DONE}
+    # 처음 기록된 순서 유지
+    assert reopened.usernames() == ["alice", "bob"]
+
+
+def test_compact_keeps_one_line_per_user(journal_path):
+    journal = CheckpointJournal(journal_path)
+    for status in (STATUS_DONE, STATUS_FAILED, STATUS_DONE):
+        for username in ("alice", "bob", "carol"):
+            journal.record(username, status)
+    journal.record("bob", STATUS_FAILED)
+    before = journal.load_statuses()
+    assert len(read_lines(journal_path)) == 10
+
+    assert journal.compact() == 3
+    lines = read_lines(journal_path)
+    assert [line.split("\t")[:2] for line in lines] == [
+        ["alice", STATUS_DONE], ["bob", STATUS_FAILED], ["carol", STATUS_DONE]
+    ]
+
+    # 압축 후에도 이어서 기록 가능
+    journal.record("dave")
+    journal.close()
+    reopened = CheckpointJournal(journal_path)
+    assert reopened.load_statuses() == {**before, "dave": STATUS_DONE}
+    assert len(read_lines(journal_path)) == 4
+
+
+def test_legacy_csv_import(tmp_path, journal_path):
+    legacy_path = tmp_path / "crawler_checkpoint.csv"
+    legacy_path.write_text("timestamp,username\n2025-05-01,alice\n2025-05-01,\n2025-05-02,bob\n", encoding="utf-8")
+
+    journal = CheckpointJournal(journal_path, legacy_csv_path=str(legacy_path))
+    assert journal.load() == {"alice", "bob"}
+    assert len(read_lines(journal_path)) == 2
+
+    # 저널이 생긴 뒤에는 CSV를 다시 가져오지 않음
+    journal.record("alice", STATUS_FAILED)
+    journal.close()
+    legacy_path.write_text("username\ncarol\n", encoding="utf-8")
+    assert CheckpointJournal(journal_path, legacy_csv_path=str(legacy_path)).load() == {"bob"}
@@ -0,0 +1,95 @@
+import pandas as pd
+import pytest
+
+from src.data.columnar import POST_DEFAULTS, content_hashes, normalize_records
+from src.data.db import DatabaseManager
+
+
+def make_influencers(n):
+    """테스트용 인플루언서 테이블"""
+    return pd.DataFrame({
+        "username": [f"user{i}" for i in range(n)],
+        "pk": list(range(1, n + 1)),
+        "full_name": [f"이름 {i}" for i in range(n)],
+        "follower_count": [1000 * (i + 1) for i in range(n)],
+        "biography": [f"소개 {i}" for i in range(n)],
+    })
+
+
+def make_posts(taken_at):
+    """taken_at 값마다 게시물 한 개"""
+    return pd.DataFrame({
+        "id": [f"post{i}" for i in range(len(taken_at))],
+        "user_pk": [1] * len(taken_at),
+        "username": ["user0"] * len(taken_at),
+        "caption": [f"캡션 {i}" for i in range(len(taken_at))],
+        "taken_at": taken_at,
+    })
+
+
+@pytest.fixture
+def db(tmp_path):
+    manager = DatabaseManager(data_dir=str(tmp_path), export_formats=("parquet",))
+    yield manager
+    manager.close()
+
+
+def stored_hashes(db, table, key):
+    return dict(db.conn.execute(f"SELECT {key}, content_hash FROM {table}").fetchall())
+
+
+def test_resave_same_frame_writes_nothing(db):
+    influencers = make_influencers(5)
+    first = db.save_influencers_bulk(influencers)
+    assert sorted(first["change_type"]) == ["insert"] * 5
+
+    second = db.save_influencers_bulk(influencers.copy())
+    assert second.empty
+    assert db.conn.execute("SELECT COUNT(*) FROM influencers").fetchone()[0] == 5
+
+
+def test_one_changed_field_is_one_update(db):
+    influencers = make_influencers(5)
+    db.save_influencers_bulk(influencers)
+    before = stored_hashes(db, "influencers", "username")
+
+    changed = influencers.copy()
+    changed.loc[2, "follower_count"] += 1
+    changes = db.save_influencers_bulk(changed)
+    assert changes["username"].tolist() == ["user2"]
+    assert changes["change_type"].tolist() == ["update"]
+
+    after = stored_hashes(db, "influencers", "username")
+    assert after["user2"] != before["user2"]
+    assert {k: v for k, v in after.items() if k != "user2"} == {k: v for k, v in before.items() if k != "user2"}
+    assert db.conn.execute(
+        "SELECT follower_count FROM influencers WHERE username = 'user2'"
+    ).fetchone()[0] == 3001
+
+
+def test_legacy_row_without_hash_is_refreshed(db):
+    """행 단위 save_influencer로 저장된 (해시가 NULL인) 행은 같은 내용이어도 한 번 다시 기록됨"""
+    influencers = make_influencers(2)
+    assert db.save_influencer(influencers.iloc[0].to_dict())
+    assert stored_hashes(db, "influencers", "username") == {"user0": None}
+
+    changes = db.save_influencers_bulk(influencers).set_index("username")["change_type"]
+    assert changes.to_dict() == {"user0": "update", "user1": "insert"}
+    assert None not in stored_hashes(db, "influencers", "username").values()
+
+    assert db.save_influencers_bulk(influencers).empty
+
+
+def test_missing_taken_at_stays_null_and_hash_is_stable(db):
+    posts = make_posts(["2025-05-01T10:00:00Z", None, "날짜 아님"])
+    assert len(db.save_posts_bulk(posts)) == 3
+
+    taken_at = dict(db.conn.execute("SELECT id, taken_at FROM posts").fetchall())
+    assert taken_at["post0"] is not None
+    assert taken_at["post1"] is None and taken_at["post2"] is None
+
+    expected = content_hashes(normalize_records(posts, POST_DEFAULTS))
+    assert stored_hashes(db, "posts", "id") == dict(zip(posts["id"], expected.tolist()))
+    # 나중에 다시 저장해도 (현재 시각으로 채우지 않으므로) 해시가 같아 기록하지 않음
+    assert db.save_posts_bulk(posts.copy()).empty
+    assert stored_hashes(db, "posts", "id") == dict(zip(posts["id"], expected.tolist()))
@@ -0,0 +1,85 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from core.facets import FACET_FIELDS, FacetIndex, follower_bucket_labels, to_bool_labels
+from core.sort_index import SORT_KEYS, SortIndex
+
+# 8의 배수가 아닌 행 수 포함 (비트맵 마지막 바이트의 채움 비트), 정렬 순서 훑기 단위(1024)보다 큰 경우 포함
+ROW_COUNTS = [1, 7, 8, 13, 1000, 2503]
+
+
+def make_data(n_posts, seed):
+    """작성자 정보가 없는 게시물, 결측 속성, 동점 값이 섞인 게시물/인플루언서 테이블"""
+    rng = np.random.default_rng(seed)
+    n_users = max(1, n_posts // 5)
+    infl_df = pd.DataFrame({
+        "pk": np.arange(1, n_users + 1),
+        "category": rng.choice(np.array(["뷰티", "패션", "푸드", "", None], dtype=object), n_users),
+        "follower_count": rng.choice([np.nan, 10, 999, 1_000, 50_000, 100_000, 2_000_000], n_users),
+        "is_verified": rng.choice(np.array([True, False, "1", "false", None], dtype=object), n_users),
+    })
+    taken_at = pd.Series(pd.Timestamp("2025-05-01") + pd.to_timedelta(rng.integers(0, 30, n_posts), unit="D"))
+    taken_at[rng.random(n_posts) < 0.1] = pd.NaT
+    posts_df = pd.DataFrame({
+        # 일부 게시물은 인플루언서 테이블에 없는 작성자
+        "user_pk": rng.integers(1, n_users + 3, n_posts),
+        "like_count": rng.choice([np.nan, 0, 1, 5, 5, 20], n_posts),
+        "taken_at": taken_at,
+    })
+    return posts_df, infl_df
+
+
+def per_post_labels(posts_df, infl_df):
+    """게시물별 패싯 라벨 (groupby 기준값)"""
+    joined = posts_df.merge(infl_df.drop_duplicates(subset=["pk"]), left_on="user_pk", right_on="pk", how="left")
+    return pd.DataFrame({
+        "category": joined["category"].replace("", None),
+        "follower_bucket": follower_bucket_labels(joined["follower_count"]),
+        "is_verified": to_bool_labels(joined["is_verified"]),
+    })
+
+
+@pytest.mark.parametrize("n_posts", ROW_COUNTS)
+def test_facet_counts_match_groupby(n_posts):
+    posts_df, infl_df = make_data(n_posts, seed=n_posts)
+    index = FacetIndex.build(posts_df, infl_df)
+    labels = per_post_labels(posts_df, infl_df)
+    rng = np.random.default_rng(0)
+
+    masks = [np.ones(n_posts, dtype=bool), np.zeros(n_posts, dtype=bool)]
+    masks += [rng.random(n_posts) < p for p in (0.05, 0.5, 0.95)]
+    for mask in masks:
+        counts = index.counts(index.candidate_bitmap(mask), FACET_FIELDS)
+        for field in FACET_FIELDS:
+            expected = labels[mask].groupby(field).size()
+            assert counts[field] == expected.to_dict()
+            # 개수 내림차순
+            assert list(counts[field].values()) == sorted(counts[field].values(), reverse=True)
+
+
+def sorted_reference(posts_df, infl_df, sort_key):
+    """sort_values(내림차순, 결측치는 뒤, 동점은 행 순서)로 계산한 행 위치 순서"""
+    followers = infl_df.drop_duplicates(subset=["pk"]).set_index("pk")["follower_count"]
+    keys = {
+        "recent": posts_df["taken_at"],
+        "likes": posts_df["like_count"],
+        "followers": pd.Series(followers.reindex(posts_df["user_pk"].to_numpy()).to_numpy()),
+    }
+    frame = pd.DataFrame({"key": keys[sort_key].to_numpy()})
+    return frame.sort_values("key", ascending=False, kind="stable", na_position="last").index.to_numpy()
+
+
+@pytest.mark.parametrize("n_posts", ROW_COUNTS)
+def test_sort_index_top_matches_sort_values(n_posts):
+    posts_df, infl_df = make_data(n_posts, seed=n_posts + 1)
+    index = SortIndex.build(posts_df, infl_df)
+    rng = np.random.default_rng(1)
+
+    for sort_key in SORT_KEYS:
+        assert index.supports(sort_key)
+        reference = sorted_reference(posts_df, infl_df, sort_key)
+        for mask in (np.ones(n_posts, dtype=bool), rng.random(n_posts) < 0.3, rng.random(n_posts) < 0.01):
+            for limit in (1, 10, n_posts + 5):
+                expected = reference[mask[reference]][:limit]
+                np.testing.assert_array_equal(index.top(sort_key, mask, limit), expected)
@@ -0,0 +1,195 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data.follower_series import (
+    BLOCK_HEADER, SERIES_COLUMNS, FollowerSeries, decode_block, decode_varints, encode_block,
+    encode_varints, growth_column, _zigzag_decode, _zigzag_encode
+)
+
+INT64_MAX = 2**63 - 1
+INT64_MIN = -2**63
+DAY = np.timedelta64(1, "D")
+T0 = np.datetime64("2025-05-01T00:00:00")
+
+
+@pytest.fixture
+def series(tmp_path):
+    return FollowerSeries(str(tmp_path / "follower_series"))
+
+
+def observe(series, day, followers, pks=(1,)):
+    """pks 계정이 day일에 followers명이었다고 기록"""
+    n = len(pks)
+    series.append(list(pks), [T0 + day * DAY] * n, [followers] * n, [10] * n, [5] * n)
+
+
+# --- 코덱 ---
+
+def test_varint_round_trip_at_limits():
+    values = np.array([0, 1, 127, 128, 16383, 16384, INT64_MAX, 2**64 - 1], dtype=np.uint64)
+    encoded = encode_varints(values)
+    np.testing.assert_array_equal(decode_varints(encoded, len(values)), values)
+    # 0은 1바이트, 2**64-1은 10바이트
+    assert encode_varints(np.array([0], dtype=np.uint64)) == b"\x00"
+    assert len(encode_varints(np.array([2**64 - 1], dtype=np.uint64))) == 10
+    assert encode_varints(np.array([], dtype=np.uint64)) == b""
+
+    with pytest.raises(ValueError):
+        decode_varints(encoded, len(values) + 1)
+
+
+def test_zigzag_round_trip_with_negative_deltas():
+    values = np.array([0, -1, 1, -2, 2, -1000, INT64_MAX, INT64_MIN], dtype=np.int64)
+    encoded = _zigzag_encode(values)
+    np.testing.assert_array_equal(encoded[:5], np.array([0, 1, 2, 3, 4], dtype=np.uint64))
+    np.testing.assert_array_equal(_zigzag_decode(encoded), values)
+
+
+def test_block_round_trip_with_extreme_values():
+    """차이(delta)가 int64 범위를 넘는 값도 그대로 복원 (2의 보수 순환)"""
+    columns = {
+        "pk": np.array([1, 1, 2, INT64_MAX], dtype=np.int64),
+        "ts": np.array([0, 86400, 0, 1], dtype=np.int64),
+        "followers": np.array([INT64_MAX, 0, INT64_MIN, 5], dtype=np.int64),
+        "following": np.array([0, 0, 0, 0], dtype=np.int64),
+        "media_count": np.array([100, 90, 110, 1], dtype=np.int64),
+    }
+    block = encode_block(columns)
+    magic, count, length, _ = BLOCK_HEADER.unpack(block[:BLOCK_HEADER.size])
+    assert count == 4 and length == len(block) - BLOCK_HEADER.size
+    decoded = decode_block(block[BLOCK_HEADER.size:], count)
+    for name in SERIES_COLUMNS:
+        np.testing.assert_array_equal(decoded[name], columns[name])
+
+
+# --- 기록/복구 ---
+
+def test_append_and_read_sorted(series):
+    observe(series, 1, 100, pks=(3, 1, 2))
+    observe(series, 0, 90, pks=(2,))
+    series.append([0], [T0], [1], [1], [1])  # pk 0(정보 없는 계정)은 제외
+
+    data = series.read()
+    np.testing.assert_array_equal(data["pk"], [1, 2, 2, 3])
+    np.testing.assert_array_equal(data["followers"], [100, 90, 100, 100])
+    assert list(series.read_frame().columns) == list(SERIES_COLUMNS)
+
+
+def test_same_observation_keeps_last(series):
+    observe(series, 1, 100)
+    observe(series, 1, 120)
+    assert series.read()["followers"].tolist() == [120]
+
+
+@pytest.mark.parametrize("corrupt", ["torn_header", "torn_payload", "bad_crc"])
+def test_recovers_from_damaged_tail_block(series, corrupt):
+    observe(series, 0, 100)
+    observe(series, 1, 110)
+    good_size = os.path.getsize(series.path)
+    observe(series, 2, 120)
+
+    with open(series.path, "r+b") as f:
+        if corrupt == "torn_header":
+            f.truncate(good_size + BLOCK_HEADER.size - 2)
+        elif corrupt == "torn_payload":
+            f.truncate(os.path.getsize(series.path) - 1)
+        else:
+            f.seek(-1, os.SEEK_END)
+            last = f.read(1)
+            f.seek(-1, os.SEEK_END)
+            f.write(bytes([last[0] ^ 0xFF]))
+
+    # 손상된 블록 앞까지만 읽힘
+    assert series.read()["followers"].tolist() == [100, 110]
+
+    # 새 인스턴스가 덧붙이기 전에 손상된 블록을 잘라내므로 새 블록이 읽힘
+    reopened = FollowerSeries(series.series_dir)
+    observe(reopened, 3, 130)
+    assert reopened.read()["followers"].tolist() == [100, 110, 130]
+    assert os.path.getsize(reopened.path) > good_size
+
+
+def test_compact_preserves_observations(series):
+    for day in range(10):
+        observe(series, day, 1000 + day * 7, pks=(5, 9, 7))
+    before = series.read()
+    blocks_size = os.path.getsize(series.path)
+
+    assert series.compact() == 30
+    after = series.read()
+    for name in SERIES_COLUMNS:
+        np.testing.assert_array_equal(after[name], before[name])
+    assert os.path.getsize(series.path) < blocks_size
+
+
+# --- 성장률 ---
+
+def test_growth_single_observation_is_nan(series):
+    observe(series, 0, 100)
+    growth = series.growth(7)
+    assert len(growth) == 1
+    assert np.isnan(growth.loc[0, "follower_growth"])
+    assert np.isnan(growth.loc[0, "follower_delta"])
+    assert growth.loc[0, "days"] == 0
+
+
+def test_growth_uses_latest_observation_before_window_start(series):
+    for day, followers in [(0, 100), (20, 110), (23, 120), (30, 150)]:
+        observe(series, day, followers)
+
+    week = series.growth(7).iloc[0]
+    assert week["base_followers"] == 120 and week["days"] == 7
+    assert week["follower_growth"] == pytest.approx(150 / 120 - 1)
+
+    month = series.growth(30).iloc[0]
+    assert month["base_followers"] == 100 and month["days"] == 30
+    assert month["follower_growth"] == pytest.approx(0.5)
+
+
+def test_growth_with_sparse_observations(series):
+    """관측이 드물면 기준 관측이 기간보다 훨씬 오래되므로 짧은 기간 성장률은 NaN"""
+    observe(series, 10, 100)
+    observe(series, 40, 130)
+
+    month = series.growth(30).iloc[0]
+    assert month["days"] == 30 and month["follower_growth"] == pytest.approx(0.3)
+
+    week = series.growth(7).iloc[0]
+    assert week["days"] == 30
+    assert np.isnan(week["follower_growth"])
+    # 제한을 끄면 30일 변화가 그대로 나옴
+    assert series.growth(7, max_span_ratio=0).iloc[0]["follower_growth"] == pytest.approx(0.3)
+
+    # 기간 시작 전 관측이 없으면 가장 오래된 관측부터의 (기간보다 짧은) 변화
+    observe(series, 0, 50, pks=(2,))
+    observe(series, 3, 60, pks=(2,))
+    short = series.growth(30).set_index("pk").loc[2]
+    assert short["days"] == 3 and short["follower_growth"] == pytest.approx(0.2)
+
+
+def test_growth_as_of(series):
+    for day, followers in [(0, 100), (7, 110), (14, 200)]:
+        observe(series, day, followers)
+    observe(series, 14, 500, pks=(2,))
+
+    growth = series.growth(7, as_of=pd.Timestamp(T0 + 7 * DAY))
+    assert growth["pk"].tolist() == [1]  # pk 2는 as_of 이후에만 관측됨
+    assert growth.iloc[0]["followers"] == 110
+    assert growth.iloc[0]["follower_growth"] == pytest.approx(0.1)
+
+    assert series.growth(7, as_of=T0 - DAY).empty
+
+
+def test_growth_features(series):
+    for day, followers in [(0, 100), (23, 120), (30, 150)]:
+        observe(series, day, followers, pks=(1, 2))
+    observe(series, 30, 10, pks=(3,))
+
+    features = series.growth_features((7, 30)).set_index("pk")
+    assert list(features.columns) == [growth_column(7), growth_column(30)]
+    assert features.loc[1, "follower_growth_30d"] == pytest.approx(0.5)
+    assert features.loc[2, "follower_growth_7d"] == pytest.approx(0.25)
+    assert np.isnan(features.loc[3, "follower_growth_30d"])
@@ -0,0 +1,34 @@
+import pytest
+
+from core.nlp import parse, parse_follower_range, parse_query
+
+# 팔로워 범위 해석 케이스: (입력, (최소, 최대, 나머지 텍스트))
+RANGE_CASES = [
+    ("뷰티 팔로워 1만명 이상", (10_000, None, "뷰티")),
+    ("1만~5만 렌즈", (10_000, 50_000, "렌즈")),
+    ("1~5만 패션", (10_000, 50_000, "패션")),
+    ("10만 이상", (100_000, None, "")),
+    ("팔로워 5000 이하 운동", (None, 5_000, "운동")),
+    ("아이폰 15 사전예약 정보 (IT)", (None, None, "아이폰 15 사전예약 정보 (IT)")),  # 단위 없는 숫자는 범위 아님
+    ("팔로워 1,000명 이상", (1_000, None, "")),
+    ("1.5만~3만 뷰티", (15_000, 30_000, "뷰티")),
+    # 잘못된 숫자는 오류 없이 범위 필터를 건너뜀
+    ("팔로워 1.2.3 이상", (None, None, "팔로워 1.2.3 이상")),
+    ("1,2,3만 이상 패션", (None, None, "1,2,3만 이상 패션")),
+    ("1..5만 이상", (None, None, "1..5만 이상")),
+]
+
+
+@pytest.mark.parametrize("text, expected", RANGE_CASES)
+def test_parse_follower_range(text, expected):
+    assert parse_follower_range(text) == expected
+
+
+@pytest.mark.parametrize("text, expected", RANGE_CASES)
+def test_parse_query_parses_text_without_range(text, expected):
+    """범위 표현을 제거한 나머지 텍스트로 카테고리/제품을 해석 (Okt 필요)"""
+    pytest.importorskip("konlpy")
+    min_followers, max_followers, rest = expected
+    assert parse_query(text) == {
+        **parse(rest), "text": rest, "min_followers": min_followers, "max_followers": max_followers
+    }
@@ -0,0 +1,93 @@
+import glob
+import os
+from datetime import datetime
+
+import pytest
+
+from src.data.db import DatabaseManager
+from src.data.db_writer import DBWriter
+from src.data.records import InfluencerRecord, PostRecord
+from src.data.segment_store import SegmentStore
+
+
+def user_records(username, pk, n_posts=2):
+    """사용자 한 명의 수집 결과 (인플루언서 + 게시물 n_posts개)"""
+    influencer = InfluencerRecord(username=username, pk=pk, follower_count=1000 * pk)
+    posts = [
+        PostRecord(id=f"{username}-{i}", user_pk=pk, username=username, caption=f"캡션 {i}",
+                   taken_at=datetime(2025, 5, 1, 12, i))
+        for i in range(n_posts)
+    ]
+    return influencer, posts
+
+
+@pytest.fixture
+def db(tmp_path):
+    manager = DatabaseManager(data_dir=str(tmp_path), export_formats=("parquet",))
+    yield manager
+    manager.close()
+
+
+@pytest.fixture
+def store(db, tmp_path):
+    return SegmentStore(db, data_dir=str(tmp_path))
+
+
+def fail_db_upserts(patch, db):
+    """세그먼트는 기록되지만 DB upsert는 실패하도록 (디스크 가득 참 등)"""
+    def failing_bulk_insert(table, df, key):
+        raise OSError("disk I/O error")
+    patch.setattr(db, "_bulk_insert", failing_bulk_insert)
+
+
+def row_count(db, table):
+    return db.conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+
+def segment_files(store):
+    return glob.glob(os.path.join(store.segment_dir, "*"))
+
+
+def test_failed_upsert_is_not_checkpointed_and_replay_restores(db, store, tmp_path, monkeypatch):
+    writer = DBWriter(store, db.checkpoint, batch_size=1)
+    with monkeypatch.context() as patch:
+        fail_db_upserts(patch, db)
+        writer.submit("alice", *user_records("alice", 1))
+        assert writer.flush(timeout=5)
+
+    assert writer.write_errors == 1 and writer.written_users == 0
+    assert "alice" not in db.checkpoint.load()
+    assert row_count(db, "influencers") == 0 and row_count(db, "posts") == 0
+    assert segment_files(store)
+
+    # 쓰기 스레드는 계속 동작하므로 DB가 복구되면 다음 사용자는 기록됨
+    writer.submit("bob", *user_records("bob", 2))
+    assert writer.close(timeout=5)
+    assert db.checkpoint.load() == {"bob"}
+
+    # 다음 실행: 남은 세그먼트를 replay하면 실패했던 사용자의 행도 DB에 반영됨
+    restarted = SegmentStore(db, data_dir=str(tmp_path))
+    assert restarted.replay() == {"alice", "bob"}
+    assert row_count(db, "influencers") == 2 and row_count(db, "posts") == 4
+
+
+def test_compact_reupserts_failed_segments_before_deleting(db, store, monkeypatch):
+    store.add(*user_records("alice", 1))
+    with monkeypatch.context() as patch:
+        fail_db_upserts(patch, db)
+        with pytest.raises(OSError):
+            store.flush()
+        assert store._db_behind
+
+        # DB가 계속 실패하면 compact도 실패하고 세그먼트를 남김
+        store.add(*user_records("bob", 2))
+        with pytest.raises(OSError):
+            store.compact()
+        assert len(segment_files(store)) == 4
+
+    assert row_count(db, "influencers") == 0
+    assert store.compact() == (2, 4)
+    assert not store._db_behind
+    assert segment_files(store) == []
+    assert row_count(db, "influencers") == 2 and row_count(db, "posts") == 4
+    assert sorted(r[0] for r in db.conn.execute("SELECT username FROM influencers").fetchall()) == ["alice", "bob"]
@@ -3,12 +3,15 @@ ETL 결과 검증 스크립트
 
 이 스크립트는 ETL 처리 후 SQLite DB에 저장된 데이터를 검사하여
 필수 컬럼 존재 여부, 결측치 개수, 데이터 품질 등을 확인합니다.
+테이블 전체를 읽지 않고 컬럼 목록과 결측치는 SQL로, 샘플은 필요한 컬럼만 조회합니다.
+크롤링 결과 Parquet 데이터셋이 있으면 파일 메타데이터로 파티션별 행 수를 확인합니다.
 
 또한 API 구성과 환경 변수 설정을 확인하여 API 호출이 가능한지 검증합니다.
 """
 
 import sqlite3
 import pandas as pd
+import pyarrow.dataset as ds
 import os
 import sys
 import json
@@ -16,7 +19,10 @@ from datetime import datetime
 
 # 프로젝트 루트 디렉토리를 Python 경로에 추가
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '.')))
+# core 패키지를 검색 API와 같은 이름으로 임포트하기 위해 src 디렉토리도 추가
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), 'src')))
 from src.api.utils.config import log_config_status
+from src.data.columnar import crawl_dataset_exists, PARTITION_COLUMN
 
 # 결과 기록을 위한 함수
 def log_result(message, level="INFO"):
@@ -76,9 +82,16 @@ def validate_columns(df, required_columns, table_name):
         log_result(f"{table_name} 테이블 필수 컬럼 검증 성공: {', '.join(required_columns)}")
         return True
 
-# 결측치 분석 함수
-def analyze_null_values(df, table_name):
-    null_counts = df[df.columns].isnull().sum()
+# 테이블 컬럼 목록 (데이터를 읽지 않고 스키마만 조회)
+def table_columns(con, table_name):
+    return [row[1] for row in con.execute(f"PRAGMA table_info({table_name})").fetchall()]
+
+# 결측치 분석 함수 (컬럼별 NULL 개수를 SQL로 집계)
+def analyze_null_values(con, table_name, columns):
+    count_exprs = ", ".join('COUNT("%s")' % col for col in columns)
+    counts = con.execute(f"SELECT COUNT(*), {count_exprs} FROM {table_name}").fetchone()
+    total = counts[0]
+    null_counts = pd.Series([total - count for count in counts[1:]], index=columns)
     
     # 결측치가 있는 컬럼만 필터링
     null_columns = null_counts[null_counts > 0]
@@ -86,13 +99,32 @@ def analyze_null_values(df, table_name):
     if len(null_columns) > 0:
         log_result(f"{table_name} 테이블 결측치 분석:", "WARNING")
         for col, count in null_columns.items():
-            percentage = (count / len(df)) * 100
+            percentage = (count / total) * 100
             log_result(f"  - {col}: {count}개 ({percentage:.2f}%)", "WARNING")
     else:
         log_result(f"{table_name} 테이블에 결측치가 없습니다!")
     
     return null_counts
 
+# 크롤링 결과 Parquet 데이터셋 검증 (파일 메타데이터만 읽음)
+def verify_crawl_datasets(data_dir):
+    log_result("\n==== 크롤링 결과 데이터셋 검증 ====")
+    for table_name in ('influencers', 'posts'):
+        if not crawl_dataset_exists(table_name, data_dir):
+            log_result(f"{table_name}: Parquet 데이터셋 없음 (CSV 사용)")
+            continue
+        
+        dataset = ds.dataset(os.path.join(data_dir, table_name), format="parquet", partitioning="hive")
+        partition_rows = {}
+        for fragment in dataset.get_fragments():
+            partition = os.path.basename(os.path.dirname(fragment.path)).replace(f"{PARTITION_COLUMN}=", "")
+            partition_rows[partition] = partition_rows.get(partition, 0) + fragment.count_rows()
+        
+        log_result(f"{table_name}: 파티션 {len(partition_rows)}개, 총 {sum(partition_rows.values())}행 (중복 수집 포함)")
+        log_result(f"  스키마: {', '.join(f'{field.name}({field.type})' for field in dataset.schema)}")
+        for partition, rows in sorted(partition_rows.items()):
+            log_result(f"  - {PARTITION_COLUMN}={partition}: {rows}행")
+
 # 메인 함수
 def main():
     # API 환경 설정 검증
@@ -120,43 +152,44 @@ def main():
         
         # posts 테이블 검증
         log_result("\n==== posts 테이블 검증 ====")
-        posts_df = pd.read_sql("SELECT * FROM posts", con)
+        post_columns = table_columns(con, 'posts')
+        total_records = con.execute("SELECT COUNT(*) FROM posts").fetchone()[0]
         
         # 테이블 정보 출력
-        log_result(f"총 레코드 수: {len(posts_df)}")
-        log_result(f"컬럼 목록: {', '.join(posts_df.columns)}")
+        log_result(f"총 레코드 수: {total_records}")
+        log_result(f"컬럼 목록: {', '.join(post_columns)}")
         
         # 필수 컬럼 검증
         required_columns = ['product_name', 'translated_caption', 'semantic_emb']
-        column_valid = validate_columns(posts_df, required_columns, 'posts')
+        column_valid = validate_columns(pd.DataFrame(columns=post_columns), required_columns, 'posts')
         
         if not column_valid:
             log_result("필수 컬럼 검증 실패", "ERROR")
         else:
             # 결측치 분석
             log_result("\n--- 결측치 분석 ---")
-            null_counts = analyze_null_values(posts_df, 'posts')
+            null_counts = analyze_null_values(con, 'posts', post_columns)
             
             # API 처리 컬럼 분석
             log_result("\n--- API 처리 성공률 ---")
-            total_records = len(posts_df)
-            
             for col in required_columns:
-                if col in posts_df.columns:
+                if col in post_columns:
                     filled_count = total_records - null_counts.get(col, 0)
                     success_rate = (filled_count / total_records) * 100
                     log_result(f"{col}: {filled_count}/{total_records} ({success_rate:.2f}%)")
             
             # 샘플 데이터 출력
             log_result("\n--- 샘플 데이터 (5건) ---")
-            sample_data = posts_df.head(5)
+            sample_columns = [col for col in ('product_name', 'translated_caption', 'caption_text') if col in post_columns]
+            select_list = ", ".join('"%s"' % col for col in sample_columns)
+            sample_data = pd.read_sql(f"SELECT {select_list} FROM posts LIMIT 5", con)
             
             # DataFrame 출력을 더 읽기 쉽게 설정
             pd.set_option('display.max_columns', None)
             pd.set_option('display.width', 1000)
             pd.set_option('display.max_colwidth', 30)
             
-            print(sample_data[['product_name', 'translated_caption', 'caption_text']].to_string())
+            print(sample_data.to_string())
             
             # 검증 결과 요약
             log_result("\n=== 검증 결과 요약 ===")
@@ -167,8 +200,11 @@ def main():
     
         # influencers 테이블 검증
         log_result("\n==== influencers 테이블 검증 ====")
-        influencers_df = pd.read_sql("SELECT * FROM influencers", con)
-        log_result(f"총 인플루언서 수: {len(influencers_df)}")
+        influencer_count = con.execute("SELECT COUNT(*) FROM influencers").fetchone()[0]
+        log_result(f"총 인플루언서 수: {influencer_count}")
+        
+        # 크롤링 결과 Parquet 데이터셋 검증
+        verify_crawl_datasets(data_dir)
         
         # 결과 파일로 저장
         verification_time = datetime.now().strftime("%Y%m%d_%H%M%S")